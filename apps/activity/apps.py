@@ -5,3 +5,6 @@ class ActivityConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.activity"
     verbose_name = "Activity Log"
+
+    def ready(self):
+        from . import capture  # noqa: F401
@@ -0,0 +1,184 @@
+"""
+Tiered storage for the activity log.
+
+Entries older than ACTIVITY_ARCHIVE_AFTER_DAYS are moved out of the
+activity_log table by `python manage.py archive_activity` into
+gzip-compressed JSONL segments, one directory per production:
+
+    ACTIVITY_ARCHIVE_ROOT/production_<id>/index.json
+    ACTIVITY_ARCHIVE_ROOT/production_<id>/<first entry time>-<first id>.jsonl.gz
+
+Each segment holds up to ACTIVITY_ARCHIVE_SEGMENT_SIZE entries in
+(created_at, id) order. index.json lists the segments with their first
+and last keys and entity type counts, plus the watermark: the key of the
+newest archived entry. Rows are deleted only after their segment and the
+index are on disk, and a rerun first deletes rows at or below the
+watermark, so an interrupted run never loses or duplicates entries.
+
+The activity feed reads segments on demand once the table is exhausted.
+"""
+
+import gzip
+import json
+import os
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+
+from .models import ActivityLog
+
+
+ARCHIVE_FIELDS = (
+    'id', 'production_id', 'user_id', 'action_type', 'entity_type', 'entity_id',
+    'description', 'metadata', 'ip_address', 'user_agent', 'created_at',
+)
+
+
+def production_dir(production_id):
+    return Path(settings.ACTIVITY_ARCHIVE_ROOT) / f"production_{production_id}"
+
+
+def _key(row):
+    return [row['created_at'].isoformat(), row['id']]
+
+
+def parse_key(key):
+    """[iso timestamp, id] from an index or cursor -> (datetime, id)."""
+    return parse_datetime(key[0]), key[1]
+
+
+def before(key):
+    """Filter for entries strictly older than a (created_at, id) key."""
+    created_at, entry_id = key
+    return Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=entry_id)
+
+
+def at_or_before(key):
+    created_at, entry_id = key
+    return Q(created_at__lt=created_at) | Q(created_at=created_at, id__lte=entry_id)
+
+
+def load_index(production_id):
+    path = production_dir(production_id) / 'index.json'
+    if not path.exists():
+        return {'production_id': production_id, 'watermark': None, 'segments': []}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_atomic(path, write):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            write(out)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _save_index(production_id, index):
+    data = json.dumps(index, indent=1).encode()
+    _write_atomic(production_dir(production_id) / 'index.json', lambda out: out.write(data))
+
+
+def _write_segment(production_id, rows):
+    first = rows[0]
+    name = f"{first['created_at']:%Y%m%dT%H%M%S}-{first['id']}.jsonl.gz"
+
+    def write(out):
+        with gzip.GzipFile(fileobj=out, mode='wb') as gz:
+            for row in rows:
+                gz.write(json.dumps(row, cls=DjangoJSONEncoder).encode())
+                gz.write(b'\n')
+
+    _write_atomic(production_dir(production_id) / name, write)
+    return {
+        'file': name,
+        'count': len(rows),
+        'first': _key(rows[0]),
+        'last': _key(rows[-1]),
+        'entity_types': dict(Counter(row['entity_type'] for row in rows)),
+    }
+
+
+def archive_production(production_id, cutoff, segment_size=None):
+    """
+    Move a production's entries older than `cutoff` into segments.
+
+    Returns the number of entries archived by this call.
+    """
+    segment_size = segment_size or settings.ACTIVITY_ARCHIVE_SEGMENT_SIZE
+    entries = ActivityLog.objects.filter(production_id=production_id)
+    index = load_index(production_id)
+
+    # Rows archived by an interrupted run.
+    if index['watermark']:
+        entries.filter(at_or_before(parse_key(index['watermark']))).delete()
+
+    rows = entries.filter(created_at__lt=cutoff).order_by('created_at', 'id').values(
+        *ARCHIVE_FIELDS, username=F('user__username')
+    ).iterator(chunk_size=2000)
+
+    archived = 0
+    segment = []
+    for row in rows:
+        segment.append(row)
+        if len(segment) >= segment_size:
+            archived += _archive_segment(production_id, index, entries, segment)
+            segment = []
+    if segment:
+        archived += _archive_segment(production_id, index, entries, segment)
+    return archived
+
+
+def _archive_segment(production_id, index, entries, rows):
+    info = _write_segment(production_id, rows)
+    index['segments'].append(info)
+    index['watermark'] = info['last']
+    _save_index(production_id, index)
+    entries.filter(at_or_before(parse_key(info['last']))).delete()
+    return len(rows)
+
+
+def _read_segment(production_id, name):
+    with gzip.open(production_dir(production_id) / name, 'rt') as f:
+        for line in f:
+            row = json.loads(line)
+            row['created_at'] = parse_datetime(row['created_at'])
+            yield row
+
+
+def read_archived(production_id, cursor=None, entity_type=None, entity_id=None, limit=50):
+    """
+    Archived entries of a production, newest first, older than `cursor`.
+
+    Segments entirely at or after the cursor, or without the requested
+    entity type, are skipped using the index alone.
+    """
+    results = []
+    for info in reversed(load_index(production_id)['segments']):
+        if cursor is not None and parse_key(info['first']) >= cursor:
+            continue
+        if entity_type is not None and entity_type not in info['entity_types']:
+            continue
+        rows = list(_read_segment(production_id, info['file']))
+        for row in reversed(rows):
+            if cursor is not None and (row['created_at'], row['id']) >= cursor:
+                continue
+            if entity_type is not None and row['entity_type'] != entity_type:
+                continue
+            if entity_id is not None and row['entity_id'] != entity_id:
+                continue
+            results.append(row)
+            if len(results) >= limit:
+                return results
+    return results
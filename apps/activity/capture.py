@@ -0,0 +1,350 @@
+"""
+Automatic activity capture for the main production models.
+
+Saves and deletes of the models in TRACKED_MODELS are recorded while an
+activity context is open. ActivityCaptureMiddleware opens one per
+request, and `with activity_context(user):` does the same for scripts
+and commands. The events are written as ActivityLog entries when the
+context closes:
+
+* Updates store a field-level diff in metadata['changes']. The old
+  values come from the row the instance was loaded from
+  (TrackChangesMixin), so diffing costs no query.
+* A queryset delete becomes one entry. Rows removed by cascade are
+  counted in the entry of the object the delete started from, in
+  metadata['cascade'].
+* More than ACTIVITY_BULK_THRESHOLD events with the same action, model
+  and production in one context are summarized into one entry.
+* A queryset update() or bulk_create() becomes one summary entry per
+  production, from the signals TrackChangesQuerySet sends. Updates count
+  their rows with one grouped query before the UPDATE; updates that only
+  set bookkeeping fields (IGNORED_FIELDS) are not recorded.
+
+Events are only kept once their transaction commits. Nothing is recorded
+outside an activity context or without an authenticated user.
+"""
+
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Model, QuerySet
+from django.db.models.fields.files import FieldFile
+from django.db.models.signals import post_save, pre_delete
+
+from apps.core.signals import post_bulk_create, post_update, pre_update
+from apps.core.utils import log_activity
+
+
+# Model label -> (entity type, label attribute, path to the production)
+TRACKED_MODELS = {
+    'productions.Production': ('production', 'title', ()),
+    'scenes.Scene': ('scene', 'scene_number', ('production',)),
+    'shots.Shot': ('shot', 'shot_number', ('scene', 'production')),
+    'shots.Take': ('take', 'take_number', ('shot', 'scene', 'production')),
+    'call_sheets.CallSheet': ('call_sheet', 'shoot_date', ('production',)),
+    'call_sheets.CastMember': ('cast_member', 'name', ('production',)),
+    'continuity.ContinuityNote': ('continuity', 'category', ('scene', 'production')),
+    'props.Prop': ('prop', 'name', ('production',)),
+}
+
+# Bookkeeping fields left out of diffs.
+IGNORED_FIELDS = {'created_at', 'updated_at', 'data_version'}
+
+VERBS = {'create': 'Created', 'update': 'Updated', 'delete': 'Deleted'}
+
+MAX_IDS = 100
+MAX_VALUE_LENGTH = 200
+
+_current = ContextVar('activity_capture', default=None)
+
+
+class Capture:
+    """Events recorded in one activity context."""
+
+    def __init__(self, user=None, request=None):
+        self.user = user
+        self.request = request
+        self.events = []
+        self.cascades = defaultdict(Counter)
+        self._production_ids = {}
+        self._operations = {}
+        self.updates = {}  # operation -> (fields, [(production id, rows)]) of a pending update()
+
+    def production_id(self, instance, path):
+        """
+        Production of an instance, following `path` through foreign keys.
+
+        Related objects that are already loaded are used as they are.
+        Otherwise the rest of the path is resolved with one values query,
+        remembered for the rest of the context.
+        """
+        if not path:
+            return instance.pk
+        obj = instance
+        for i, name in enumerate(path[:-1]):
+            field = obj._meta.get_field(name)
+            if field.is_cached(obj):
+                obj = getattr(obj, name)
+                if obj is None:
+                    return None
+                continue
+            value = getattr(obj, field.attname)
+            if value is None:
+                return None
+            key = (field.related_model, value)
+            if key not in self._production_ids:
+                self._production_ids[key] = field.related_model.objects.filter(
+                    pk=value
+                ).values_list('__'.join(path[i + 1:]), flat=True).first()
+            return self._production_ids[key]
+        return getattr(obj, f"{path[-1]}_id")
+
+    def operation(self, queryset):
+        """Key for one queryset delete, unique within the context."""
+        self._operations[id(queryset)] = queryset
+        return id(queryset)
+
+    def add(self, event):
+        transaction.on_commit(lambda: self.events.append(event))
+
+    def add_cascade(self, origin_key, entity_type):
+        transaction.on_commit(lambda: self.cascades[origin_key].update([entity_type]))
+
+    def user_for_log(self):
+        user = self.user
+        if user is None and self.request is not None:
+            user = getattr(self.request, 'user', None)
+        return user if user is not None and user.is_authenticated else None
+
+    def flush(self):
+        """Write the recorded events as ActivityLog entries."""
+        user = self.user_for_log()
+        events, self.events = self.events, []
+        cascades, self.cascades = self.cascades, defaultdict(Counter)
+        if user is None or not events:
+            return
+
+        groups = defaultdict(list)
+        for event in events:
+            groups[(event['action'], event['entity_type'], event['production_id'], event['operation'])].append(event)
+
+        for (action, entity_type, _, operation), group in groups.items():
+            cascade = Counter()
+            for event in group:
+                cascade.update(cascades.get(event['origin'], {}))
+            bulk = any('count' in event for event in group)
+            if bulk or len(group) > 1 and (operation is not None or len(group) > settings.ACTIVITY_BULK_THRESHOLD):
+                _log_summary(user, self.request, action, entity_type, group, cascade)
+            else:
+                for event in group:
+                    _log_event(user, self.request, event, cascades.get(event['origin']))
+
+
+@contextmanager
+def activity_context(user=None, request=None):
+    """Capture changes made inside the block, attributed to `user` (or the request's user)."""
+    capture = Capture(user=user, request=request)
+    token = _current.set(capture)
+    try:
+        yield capture
+    finally:
+        _current.reset(token)
+        capture.flush()
+
+
+def _json_value(value):
+    if isinstance(value, FieldFile):
+        value = value.name or None
+    if isinstance(value, str) and len(value) > MAX_VALUE_LENGTH:
+        value = value[:MAX_VALUE_LENGTH] + '…'
+    return value
+
+
+def diff(instance, update_fields=None):
+    """
+    {field: [old, new]} between the loaded row and the instance, or None
+    if the instance was not loaded from the database.
+    """
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded is None:
+        return None
+    changes = {}
+    for field in instance._meta.concrete_fields:
+        if field.name in IGNORED_FIELDS or field.attname not in loaded:
+            continue
+        if update_fields is not None and field.name not in update_fields and field.attname not in update_fields:
+            continue
+        old = _json_value(loaded[field.attname])
+        new = _json_value(getattr(instance, field.attname))
+        if old != new:
+            changes[field.name] = [old, new]
+    return changes
+
+
+def _entity_label(instance, attr):
+    if attr == 'category' and hasattr(instance, 'get_category_display'):
+        return instance.get_category_display()
+    return str(getattr(instance, attr))
+
+
+def _entity_name(entity_type, count=1):
+    from .models import ActivityLog
+
+    name = str(dict(ActivityLog.ENTITY_CHOICES)[entity_type]).lower()
+    return name if count == 1 else f"{name}s"
+
+
+def _log_event(user, request, event, cascade=None):
+    metadata = {'label': event['label']}
+    if event['changes']:
+        metadata['changes'] = event['changes']
+    if cascade:
+        metadata['cascade'] = dict(cascade)
+    description = f"{VERBS[event['action']]} {_entity_name(event['entity_type'])} '{event['label']}'"
+    if event['changes']:
+        description += f" ({', '.join(event['changes'])})"
+    log_activity(
+        user, event['action'], event['entity_type'], event['entity_id'], description,
+        production=event['production'], metadata=metadata, request=request,
+    )
+
+
+def _log_summary(user, request, action, entity_type, group, cascade):
+    fields = sorted({name for event in group for name in (event['changes'] or {})})
+    count = sum(event.get('count', 1) for event in group)
+    metadata = {
+        'bulk': True,
+        'count': count,
+        'ids': [event['entity_id'] for event in group if event['entity_id'] is not None][:MAX_IDS],
+    }
+    if fields:
+        metadata['changed_fields'] = fields
+    if cascade:
+        metadata['cascade'] = dict(cascade)
+    description = f"{VERBS[action]} {count} {_entity_name(entity_type, count)}"
+    if fields:
+        description += f" ({', '.join(fields)})"
+    log_activity(
+        user, action, entity_type, None, description,
+        production=group[0]['production'], metadata=metadata, request=request,
+    )
+
+
+def _event(capture, instance, action, changes=None, operation=None, origin=None):
+    from apps.productions.models import Production
+
+    entity_type, label_attr, path = TRACKED_MODELS[instance._meta.label]
+    production_id = capture.production_id(instance, path)
+    production = None
+    # A deleted production can't be referenced by its own log entry.
+    if production_id is not None and not (action == 'delete' and not path):
+        production = Production(pk=production_id)
+    return {
+        'action': action,
+        'entity_type': entity_type,
+        'entity_id': instance.pk,
+        'label': _entity_label(instance, label_attr),
+        'production_id': production_id,
+        'production': production,
+        'changes': changes,
+        'operation': operation,
+        'origin': origin,
+    }
+
+
+def record_save(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    capture = _current.get()
+    if capture is None or raw:
+        return
+    if created:
+        capture.add(_event(capture, instance, 'create'))
+    else:
+        changes = diff(instance, update_fields)
+        if changes == {}:
+            return
+        capture.add(_event(capture, instance, 'update', changes=changes))
+
+
+def record_delete(sender, instance, origin=None, **kwargs):
+    capture = _current.get()
+    if capture is None:
+        return
+    entity_type = TRACKED_MODELS[sender._meta.label][0]
+
+    if isinstance(origin, Model) and origin is not instance:
+        capture.add_cascade((origin._meta.label, origin.pk), entity_type)
+        return
+    if isinstance(origin, QuerySet):
+        operation = capture.operation(origin)
+        if origin.model is not sender:
+            capture.add_cascade(operation, entity_type)
+            return
+        capture.add(_event(capture, instance, 'delete', operation=operation, origin=operation))
+        return
+    capture.add(_event(capture, instance, 'delete', origin=(sender._meta.label, instance.pk)))
+
+
+def count_update(sender, queryset, fields, **kwargs):
+    """Count the rows a queryset update() is about to change, per production."""
+    capture = _current.get()
+    if capture is None or sender._meta.label not in TRACKED_MODELS:
+        return
+    fields = [name for name in fields if name not in IGNORED_FIELDS]
+    if not fields:
+        return
+    path = TRACKED_MODELS[sender._meta.label][2]
+    lookup = '__'.join(path) if path else 'pk'
+    counts = queryset.order_by().values_list(lookup).annotate(rows=Count('pk'))
+    capture.updates[capture.operation(queryset)] = (fields, list(counts))
+
+
+def record_update(sender, queryset, rows, **kwargs):
+    capture = _current.get()
+    if capture is None:
+        return
+    operation = id(queryset)
+    pending = capture.updates.pop(operation, None)
+    if pending is None or not rows:
+        return
+    fields, counts = pending
+    for production_id, count in counts:
+        capture.add(_bulk_event(sender, 'update', production_id, count, operation, fields))
+
+
+def record_bulk_create(sender, queryset, objs, **kwargs):
+    capture = _current.get()
+    if capture is None or sender._meta.label not in TRACKED_MODELS:
+        return
+    # One create event per object under the same operation, so flush()
+    # summarizes them like a queryset delete.
+    operation = capture.operation(queryset)
+    for obj in objs:
+        capture.add(_event(capture, obj, 'create', operation=operation))
+
+
+def _bulk_event(model, action, production_id, count, operation, fields):
+    from apps.productions.models import Production
+
+    return {
+        'action': action,
+        'entity_type': TRACKED_MODELS[model._meta.label][0],
+        'entity_id': None,
+        'label': None,
+        'production_id': production_id,
+        'production': Production(pk=production_id) if production_id is not None else None,
+        'changes': dict.fromkeys(fields),
+        'operation': operation,
+        'origin': None,
+        'count': count,
+    }
+
+
+for label in TRACKED_MODELS:
+    post_save.connect(record_save, sender=label, dispatch_uid=f'activity-save-{label}')
+    pre_delete.connect(record_delete, sender=label, dispatch_uid=f'activity-delete-{label}')
+pre_update.connect(count_update, dispatch_uid='activity-pre-update')
+post_update.connect(record_update, dispatch_uid='activity-update')
+post_bulk_create.connect(record_bulk_create, dispatch_uid='activity-bulk-create')
@@ -0,0 +1,45 @@
+"""
+Move old activity log entries into compressed archive segments.
+
+Run daily or weekly, e.g. from cron:
+    python manage.py archive_activity --days 90
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.activity.archive import archive_production
+from apps.activity.models import ActivityLog
+
+
+class Command(BaseCommand):
+    help = 'Archive activity log entries older than N days into gzip JSONL segments.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.ACTIVITY_ARCHIVE_AFTER_DAYS,
+            help='Archive entries older than this many days'
+        )
+        parser.add_argument('--production', type=int, default=None, help='Only this production')
+        parser.add_argument(
+            '--segment-size', type=int, default=settings.ACTIVITY_ARCHIVE_SEGMENT_SIZE,
+            help='Entries per segment file'
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        # Entries without a production (deleted productions) stay in the table.
+        entries = ActivityLog.objects.filter(created_at__lt=cutoff, production__isnull=False)
+        if options['production'] is not None:
+            entries = entries.filter(production_id=options['production'])
+
+        total = 0
+        for production_id in entries.values_list('production_id', flat=True).distinct().order_by():
+            archived = archive_production(production_id, cutoff, options['segment_size'])
+            if archived:
+                self.stdout.write(f"Production {production_id}: archived {archived} entries")
+            total += archived
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} activity entries older than {cutoff:%Y-%m-%d}"))
@@ -0,0 +1,33 @@
+"""
+Recompute hourly and daily activity rollups from the activity log.
+
+The activity writer keeps rollups current, so this is only needed after
+entries were inserted some other way, e.g. a bulk import:
+    python manage.py rebuild_activity_rollups --days 7
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.activity.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild activity rollups for the last N days from the activity_log table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help='Rebuild buckets from this many days ago')
+        parser.add_argument('--production', type=int, default=None, help='Only this production')
+
+    def handle(self, *args, **options):
+        if options['days'] > settings.ACTIVITY_ARCHIVE_AFTER_DAYS:
+            # Older entries may be archived, and their rollups would be lost.
+            raise CommandError(
+                f"--days can be at most {settings.ACTIVITY_ARCHIVE_AFTER_DAYS} (ACTIVITY_ARCHIVE_AFTER_DAYS)"
+            )
+        since = timezone.now() - timedelta(days=options['days'])
+        rows = rebuild_rollups(since, options['production'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} activity rollup rows since {since:%Y-%m-%d}"))
@@ -0,0 +1,16 @@
+"""
+Activity log middleware.
+"""
+
+from .capture import activity_context
+
+
+class ActivityCaptureMiddleware:
+    """Record changes made while handling a request in the activity log."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with activity_context(request=request):
+            return self.get_response(request)
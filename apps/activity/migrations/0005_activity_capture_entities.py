@@ -0,0 +1,42 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:34
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("activity", "0004_activity_created_at_event_time"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="activitylog",
+            name="entity_type",
+            field=models.CharField(
+                choices=[
+                    ("production", "Production"),
+                    ("scene", "Scene"),
+                    ("shot", "Shot"),
+                    ("call_sheet", "Call Sheet"),
+                    ("continuity", "Continuity Note"),
+                    ("cast_member", "Cast Member"),
+                    ("equipment", "Equipment"),
+                    ("take", "Take"),
+                    ("prop", "Prop"),
+                ],
+                db_index=True,
+                max_length=50,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="activitylog",
+            name="metadata",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                encoder=django.core.serializers.json.DjangoJSONEncoder,
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("activity", "0005_activity_capture_entities"),
+        ("productions", "0005_returns_digest"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="activitylog",
+            name="activity_lo_entity__2a2d99_idx",
+        ),
+        migrations.AddIndex(
+            model_name="activitylog",
+            index=models.Index(
+                fields=["production", "-created_at", "-id"], name="activity_feed_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="activitylog",
+            index=models.Index(
+                fields=["entity_type", "entity_id", "-created_at", "-id"],
+                name="activity_entity_feed_idx",
+            ),
+        ),
+    ]
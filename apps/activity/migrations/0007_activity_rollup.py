@@ -0,0 +1,74 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("activity", "0006_activity_feed_indexes"),
+        ("productions", "0005_returns_digest"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ActivityRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "resolution",
+                    models.CharField(
+                        choices=[("hour", "Hourly"), ("day", "Daily")], max_length=10
+                    ),
+                ),
+                ("bucket", models.DateTimeField()),
+                ("action_type", models.CharField(max_length=50)),
+                ("entity_type", models.CharField(max_length=50)),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "production",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="activity_rollups",
+                        to="productions.production",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="activity_rollups",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "activity_rollup",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="activityrollup",
+            constraint=models.UniqueConstraint(
+                fields=(
+                    "resolution",
+                    "production",
+                    "bucket",
+                    "user",
+                    "action_type",
+                    "entity_type",
+                ),
+                name="unique_activity_rollup",
+            ),
+        ),
+    ]
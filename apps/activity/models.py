@@ -5,6 +5,8 @@ Track all user actions and changes in productions.
 
 from django.db import models
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
 from apps.productions.models import Production
 
 
@@ -29,6 +31,8 @@ class ActivityLog(models.Model):
         ('continuity', 'Continuity Note'),
         ('cast_member', 'Cast Member'),
         ('equipment', 'Equipment'),
+        ('take', 'Take'),
+        ('prop', 'Prop'),
     ]
 
     production = models.ForeignKey(
@@ -47,10 +51,11 @@ class ActivityLog(models.Model):
     entity_type = models.CharField(max_length=50, choices=ENTITY_CHOICES, db_index=True)
     entity_id = models.IntegerField(null=True, blank=True)
     description = models.TextField()
-    metadata = models.JSONField(default=dict, blank=True)
+    metadata = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
-    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Set when the event happens, not when the buffered writer inserts it.
+    created_at = models.DateTimeField(default=timezone.now, editable=False, db_index=True)
 
     class Meta:
         db_table = 'activity_log'
@@ -58,8 +63,51 @@ class ActivityLog(models.Model):
         indexes = [
             models.Index(fields=['-created_at']),
             models.Index(fields=['user', 'action_type']),
-            models.Index(fields=['entity_type', 'entity_id']),
+            # Keyset paging of the activity feed, see ActivityViewSet.
+            models.Index(fields=['production', '-created_at', '-id'], name='activity_feed_idx'),
+            models.Index(fields=['entity_type', 'entity_id', '-created_at', '-id'], name='activity_entity_feed_idx'),
         ]
 
     def __str__(self):
-        return f"{self.user.username} {self.action_type} {self.entity_type} at {self.created_at}"
\ No newline at end of file
+        return f"{self.user.username} {self.action_type} {self.entity_type} at {self.created_at}"
+
+class ActivityRollup(models.Model):
+    """
+    Activity counts per time bucket, production, user, action and entity type.
+
+    Kept current by the activity writer as entries are inserted (see
+    apps/activity/rollups.py), and rebuilt by rebuild_activity_rollups.
+    """
+
+    RESOLUTION_CHOICES = [
+        ('hour', 'Hourly'),
+        ('day', 'Daily'),
+    ]
+
+    resolution = models.CharField(max_length=10, choices=RESOLUTION_CHOICES)
+    bucket = models.DateTimeField()
+    production = models.ForeignKey(
+        Production,
+        on_delete=models.CASCADE,
+        related_name='activity_rollups'
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='activity_rollups'
+    )
+    action_type = models.CharField(max_length=50)
+    entity_type = models.CharField(max_length=50)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'activity_rollup'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['resolution', 'production', 'bucket', 'user', 'action_type', 'entity_type'],
+                name='unique_activity_rollup',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.count} {self.action_type} {self.entity_type} in {self.resolution} of {self.bucket}"
@@ -0,0 +1,175 @@
+"""
+Hourly and daily activity counts for charts.
+
+Every ActivityLog entry with a production adds one to its hour and its
+day in ActivityRollup, keyed by production, user, action type and entity
+type. The activity writer does this in the same transaction that inserts
+the entries, with one UPDATE ... SET count = count + n per key in the
+batch (an INSERT when the key is new). Charts then read a few hundred
+rollup rows instead of grouping the raw log, and keep working after old
+entries are archived.
+
+`python manage.py rebuild_activity_rollups` recomputes a range from the
+table, e.g. after a bulk import.
+"""
+
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDay, TruncHour, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import ActivityLog, ActivityRollup
+
+
+KEY_FIELDS = ('resolution', 'bucket', 'production_id', 'user_id', 'action_type', 'entity_type')
+
+# Longest range charted at each resolution, finest first. Weeks and
+# months are summed from daily rollups.
+AUTO_RESOLUTIONS = [
+    ('hour', timedelta(days=3)),
+    ('day', timedelta(days=120)),
+    ('week', timedelta(days=730)),
+    ('month', None),
+]
+TRUNCATE = {'hour': TruncHour, 'day': TruncDay, 'week': TruncWeek, 'month': TruncMonth}
+
+GROUP_FIELDS = {
+    'action_type': 'action_type',
+    'entity_type': 'entity_type',
+    'user': 'user__username',
+    'production': 'production__title',
+}
+
+
+def hour_start(moment):
+    return timezone.localtime(moment).replace(minute=0, second=0, microsecond=0)
+
+
+def day_start(moment):
+    return timezone.make_aware(datetime.combine(timezone.localtime(moment).date(), time.min))
+
+
+def record_rollups(entries):
+    """Add saved ActivityLog entries to their hourly and daily buckets."""
+    counts = Counter()
+    for entry in entries:
+        if entry.production_id is None:
+            continue
+        for resolution, bucket in (('hour', hour_start(entry.created_at)), ('day', day_start(entry.created_at))):
+            counts[(resolution, bucket, entry.production_id, entry.user_id, entry.action_type, entry.entity_type)] += 1
+
+    for key, n in counts.items():
+        fields = dict(zip(KEY_FIELDS, key))
+        if ActivityRollup.objects.filter(**fields).update(count=F('count') + n):
+            continue
+        try:
+            with transaction.atomic():
+                ActivityRollup.objects.create(**fields, count=n)
+        except IntegrityError:
+            # Another writer created the row first.
+            ActivityRollup.objects.filter(**fields).update(count=F('count') + n)
+
+
+def rebuild_rollups(since, production_id=None):
+    """Recompute the rollups of buckets starting at or after `since` from the table."""
+    since = day_start(since)
+    entries = ActivityLog.objects.filter(created_at__gte=since, production__isnull=False)
+    rollups = ActivityRollup.objects.filter(bucket__gte=since)
+    if production_id is not None:
+        entries = entries.filter(production_id=production_id)
+        rollups = rollups.filter(production_id=production_id)
+
+    rows = []
+    for resolution, trunc in (('hour', TruncHour), ('day', TruncDay)):
+        grouped = entries.annotate(bucket=trunc('created_at')).values(
+            'bucket', 'production_id', 'user_id', 'action_type', 'entity_type'
+        ).annotate(n=Count('id')).order_by()
+        rows += [
+            ActivityRollup(resolution=resolution, count=row.pop('n'), **row)
+            for row in grouped
+        ]
+
+    with transaction.atomic():
+        rollups.delete()
+        ActivityRollup.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def pick_resolution(start, end):
+    span = end - start
+    for resolution, longest in AUTO_RESOLUTIONS:
+        if longest is None or span <= longest:
+            return resolution
+
+
+def bucket_starts(start, end, resolution):
+    """Start of every bucket between start and end, for zero-filling."""
+    if resolution == 'hour':
+        current, step = hour_start(start), timedelta(hours=1)
+    else:
+        current, step = day_start(start), timedelta(days=1)
+        if resolution == 'week':
+            current -= timedelta(days=current.weekday())
+            step = timedelta(weeks=1)
+        elif resolution == 'month':
+            current = current.replace(day=1)
+
+    starts = []
+    while current < end:
+        starts.append(current)
+        if resolution == 'month':
+            current = timezone.make_aware(
+                datetime(current.year + current.month // 12, current.month % 12 + 1, 1)
+            )
+        else:
+            current += step
+    return starts
+
+
+def activity_timeseries(productions, start, end, resolution='auto', group_by='action_type'):
+    """
+    Activity counts per bucket between start and end, one series per group.
+
+    `productions` is a queryset or list of production ids. With 'auto',
+    the finest resolution that keeps the chart readable is used.
+    """
+    if resolution == 'auto':
+        resolution = pick_resolution(start, end)
+    source = 'hour' if resolution == 'hour' else 'day'
+    group_field = GROUP_FIELDS[group_by]
+
+    rows = ActivityRollup.objects.filter(
+        resolution=source,
+        production_id__in=productions,
+        bucket__gte=start,
+        bucket__lt=end,
+    )
+    if resolution in ('week', 'month'):
+        rows = rows.annotate(period=TRUNCATE[resolution]('bucket'))
+    else:
+        rows = rows.annotate(period=F('bucket'))
+    rows = rows.values('period', key=F(group_field)).annotate(total=Sum('count')).order_by()
+
+    starts = bucket_starts(start, end, resolution)
+    positions = {moment: i for i, moment in enumerate(starts)}
+    series = {}
+    for row in rows:
+        counts = series.setdefault(row['key'], [0] * len(starts))
+        position = positions.get(timezone.localtime(row['period']))
+        if position is not None:
+            counts[position] += row['total']
+
+    return {
+        'resolution': resolution,
+        'group_by': group_by,
+        'start': start,
+        'end': end,
+        'buckets': starts,
+        'series': sorted(
+            ({'key': key, 'counts': counts, 'total': sum(counts)} for key, counts in series.items()),
+            key=lambda s: (-s['total'], str(s['key'])),
+        ),
+    }
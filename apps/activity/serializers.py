@@ -0,0 +1,25 @@
+"""
+Activity log serializers for ClapLog API.
+"""
+
+from rest_framework import serializers
+
+
+class ActivityLogSerializer(serializers.Serializer):
+    """
+    Feed entry, from a values() row of the table or an archived row.
+
+    Both carry the same keys, so live and archived entries look alike.
+    """
+
+    id = serializers.IntegerField()
+    production = serializers.IntegerField(source='production_id', allow_null=True)
+    user = serializers.IntegerField(source='user_id')
+    username = serializers.CharField(allow_null=True)
+    action_type = serializers.CharField()
+    entity_type = serializers.CharField()
+    entity_id = serializers.IntegerField(allow_null=True)
+    description = serializers.CharField()
+    metadata = serializers.JSONField()
+    created_at = serializers.DateTimeField()
+    archived = serializers.BooleanField(default=False)
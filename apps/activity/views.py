@@ -1,3 +1,161 @@
-from django.shortcuts import render
+"""
+Activity log API views.
+"""
 
-# Create your views here.
+import base64
+import binascii
+import json
+
+from datetime import timedelta
+
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from apps.core.permissions import IsAdminUser
+from apps.core.utils import parse_moment, user_production_ids
+from apps.productions.models import Production
+from . import writer
+from .archive import ARCHIVE_FIELDS, before, read_archived
+from .models import ActivityLog
+from .rollups import GROUP_FIELDS, TRUNCATE, activity_timeseries
+from .serializers import ActivityLogSerializer
+
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def encode_cursor(row):
+    raw = json.dumps([row['created_at'].isoformat(), row['id']]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(value):
+    """(created_at, id) of the last entry on the previous page."""
+    try:
+        created_at, entry_id = json.loads(base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)))
+        created_at = parse_datetime(created_at)
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError(value)
+    if created_at is None or not isinstance(entry_id, int):
+        raise ValueError(value)
+    return created_at, entry_id
+
+
+class ActivityViewSet(viewsets.ViewSet):
+    """
+    ViewSet for the activity log.
+
+    list: newest first feed of one production, optionally for one entity.
+
+        GET /api/activity/?production=1[&entity_type=scene&entity_id=5]
+            [&cursor=...][&limit=50][&archived=1]
+
+    Pages are keyset paginated on (created_at, id): pass next_cursor back
+    as cursor to get the next page. With archived=1, paging continues
+    into archived entries once the table has no more.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def list(self, request):
+        params = request.query_params
+        try:
+            production_id = int(params['production'])
+            entity_id = int(params['entity_id']) if params.get('entity_id') else None
+            limit = min(max(int(params.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+            cursor = decode_cursor(params['cursor']) if params.get('cursor') else None
+        except KeyError:
+            return Response({'error': 'production is required'}, status=status.HTTP_400_BAD_REQUEST)
+        except ValueError:
+            return Response(
+                {'error': 'production, entity_id and limit must be integers, and cursor a value from next_cursor'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        entity_type = params.get('entity_type') or None
+        include_archived = params.get('archived') in ('1', 'true')
+
+        if not Production.objects.filter(id=production_id, id__in=user_production_ids(request.user)).exists():
+            return Response({'error': 'Production not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        entries = ActivityLog.objects.filter(production_id=production_id)
+        if entity_type:
+            entries = entries.filter(entity_type=entity_type)
+        if entity_id is not None:
+            entries = entries.filter(entity_id=entity_id)
+        if cursor is not None:
+            entries = entries.filter(before(cursor))
+        rows = list(
+            entries.order_by('-created_at', '-id').values(
+                *ARCHIVE_FIELDS, username=F('user__username')
+            )[:limit + 1]
+        )
+
+        if include_archived and len(rows) <= limit:
+            last = (rows[-1]['created_at'], rows[-1]['id']) if rows else cursor
+            archived = read_archived(
+                production_id, last, entity_type, entity_id, limit=limit + 1 - len(rows)
+            )
+            rows += [{**row, 'archived': True} for row in archived]
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return Response({
+            'results': ActivityLogSerializer(rows, many=True).data,
+            'next_cursor': encode_cursor(rows[-1]) if has_more else None,
+        })
+
+    @action(detail=False, methods=['get'])
+    def timeseries(self, request):
+        """
+        Activity counts over time from the hourly/daily rollups.
+
+            GET /api/activity/timeseries/?start=2026-03-01&end=2026-03-31
+                [&production=1][&group_by=action_type|entity_type|user|production]
+                [&resolution=auto|hour|day|week|month]
+
+        Without production, covers every production the user is on. The
+        range defaults to the last 30 days. 'auto' picks hours for up to
+        3 days, days up to 120, then weeks and months.
+        """
+        params = request.query_params
+        group_by = params.get('group_by', 'action_type')
+        resolution = params.get('resolution', 'auto')
+        if group_by not in GROUP_FIELDS:
+            return Response(
+                {'error': f"group_by must be one of {', '.join(GROUP_FIELDS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if resolution != 'auto' and resolution not in TRUNCATE:
+            return Response(
+                {'error': f"resolution must be auto or one of {', '.join(TRUNCATE)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            end = parse_moment(params['end'], end_of_day=True) if params.get('end') else timezone.now()
+            start = parse_moment(params['start']) if params.get('start') else end - timedelta(days=30)
+            production_id = int(params['production']) if params.get('production') else None
+        except ValueError:
+            return Response(
+                {'error': 'start and end must be ISO dates or datetimes, and production an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if start >= end:
+            return Response({'error': 'start must be before end'}, status=status.HTTP_400_BAD_REQUEST)
+
+        productions = user_production_ids(request.user)
+        if production_id is not None:
+            if not Production.objects.filter(id=production_id, id__in=productions).exists():
+                return Response({'error': 'Production not found'}, status=status.HTTP_404_NOT_FOUND)
+            productions = [production_id]
+
+        return Response(activity_timeseries(productions, start, end, resolution, group_by))
+
+    @action(detail=False, methods=['get'], url_path='writer-stats', permission_classes=[IsAuthenticated, IsAdminUser])
+    def writer_stats(self, request):
+        """Queue depth, write/drop counters and flush latency of this process's activity writer."""
+        return Response(writer.stats())
@@ -0,0 +1,206 @@
+"""
+Buffered writer for ActivityLog entries.
+
+log_activity() puts entries on an in-process queue instead of doing an
+INSERT per call. A background thread writes them with bulk_create when
+ACTIVITY_LOG_BATCH_SIZE entries are waiting or every
+ACTIVITY_LOG_FLUSH_INTERVAL seconds, whichever comes first. Anything
+still queued is written at interpreter shutdown. Once
+ACTIVITY_LOG_MAX_QUEUE entries are waiting, new entries are written
+synchronously by the caller so nothing is lost under a burst.
+
+Each batch is counted into the hourly and daily ActivityRollup rows in
+the same transaction. Entries whose batch fails are retried one by one,
+and only the ones that still fail are dropped. Counters and flush latency are available from
+stats() and /api/activity/writer-stats/.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+logger = logging.getLogger(__name__)
+
+
+def save_entries(entries):
+    """Insert entries and count them in the activity rollups, atomically."""
+    from .models import ActivityLog
+    from .rollups import record_rollups
+
+    with transaction.atomic():
+        ActivityLog.objects.bulk_create(entries)
+        record_rollups(entries)
+
+
+class ActivityWriter:
+    """Queue of unsaved ActivityLog instances, flushed by a daemon thread."""
+
+    def __init__(self, batch_size, flush_interval, max_queue):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+        self._pid = None
+        self._counters = {
+            'enqueued': 0,
+            'written': 0,
+            'written_sync': 0,
+            'dropped': 0,
+            'flushes': 0,
+            'failed_flushes': 0,
+        }
+        self._flush_ms_total = 0.0
+        self._flush_ms_last = None
+        self._flush_ms_max = 0.0
+        self._lag_ms_max = 0.0
+
+    def submit(self, entry):
+        """Queue an entry, or write it now if the queue is full."""
+        with self._lock:
+            self._ensure_thread()
+            if not self._stopping and len(self._queue) < self.max_queue:
+                self._queue.append((time.monotonic(), entry))
+                self._counters['enqueued'] += 1
+                if len(self._queue) >= self.batch_size:
+                    self._wakeup.set()
+                return
+
+        written = self._write([entry])
+        with self._lock:
+            self._counters['written_sync'] += written
+
+    def flush(self):
+        """Write everything queued so far. Returns the number of entries written."""
+        total = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                if not batch:
+                    return total
+
+                started = time.monotonic()
+                written = self._write([entry for _, entry in batch])
+                finished = time.monotonic()
+                elapsed_ms = (finished - started) * 1000
+                with self._lock:
+                    self._counters['flushes'] += 1
+                    self._counters['written'] += written
+                    self._flush_ms_total += elapsed_ms
+                    self._flush_ms_last = elapsed_ms
+                    self._flush_ms_max = max(self._flush_ms_max, elapsed_ms)
+                    self._lag_ms_max = max(self._lag_ms_max, (finished - batch[0][0]) * 1000)
+                total += written
+
+    def stats(self):
+        with self._lock:
+            flushes = self._counters['flushes']
+            return {
+                **self._counters,
+                'queued': len(self._queue),
+                'batch_size': self.batch_size,
+                'flush_interval': self.flush_interval,
+                'max_queue': self.max_queue,
+                'last_flush_ms': round(self._flush_ms_last, 2) if self._flush_ms_last is not None else None,
+                'avg_flush_ms': round(self._flush_ms_total / flushes, 2) if flushes else None,
+                'max_flush_ms': round(self._flush_ms_max, 2),
+                'max_lag_ms': round(self._lag_ms_max, 2),
+            }
+
+    def shutdown(self):
+        """Stop the flush thread and write whatever is left."""
+        with self._lock:
+            self._stopping = True
+            thread = self._thread
+        self._wakeup.set()
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def _ensure_thread(self):
+        # A forked worker inherits the queue but not the thread.
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._queue.clear()
+            self._thread = None
+        if self._thread is None and not self._stopping:
+            self._thread = threading.Thread(target=self._run, name='activity-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        try:
+            while not self._stopping:
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+                close_old_connections()
+                self.flush()
+        finally:
+            connection.close()
+
+    def _write(self, entries):
+        """bulk_create the entries, falling back to one INSERT each if that fails."""
+        try:
+            save_entries(entries)
+            return len(entries)
+        except Exception as e:
+            logger.warning(f"Activity log batch of {len(entries)} failed, retrying one by one: {str(e)}")
+            with self._lock:
+                self._counters['failed_flushes'] += 1
+
+        written = 0
+        for entry in entries:
+            entry.pk = None
+            try:
+                save_entries([entry])
+                written += 1
+            except Exception as e:
+                logger.error(f"Dropped activity log entry '{entry.description}': {str(e)}")
+                with self._lock:
+                    self._counters['dropped'] += 1
+        return written
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = ActivityWriter(
+                    batch_size=settings.ACTIVITY_LOG_BATCH_SIZE,
+                    flush_interval=settings.ACTIVITY_LOG_FLUSH_INTERVAL,
+                    max_queue=settings.ACTIVITY_LOG_MAX_QUEUE,
+                )
+                atexit.register(_writer.shutdown)
+    return _writer
+
+
+def write_activity(entry):
+    """Record an unsaved ActivityLog, buffered unless ACTIVITY_LOG_BUFFERED is off."""
+    if not settings.ACTIVITY_LOG_BUFFERED:
+        save_entries([entry])
+        return
+    get_writer().submit(entry)
+
+
+def flush():
+    """Write all queued entries now, e.g. before reading the log in a script."""
+    return get_writer().flush() if _writer is not None else 0
+
+
+def stats():
+    return get_writer().stats()
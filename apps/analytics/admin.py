@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ProductionStatistics, DailyProgress
+from .models import ProductionStatistics, DailyProgress, WrapForecast
 
 
 @admin.register(ProductionStatistics)
@@ -12,4 +12,11 @@ class ProductionStatisticsAdmin(admin.ModelAdmin):
 class DailyProgressAdmin(admin.ModelAdmin):
     list_display = ['production', 'date', 'scenes_completed', 'shots_completed', 'pages_shot']
     list_filter = ['date', 'production']
-    date_hierarchy = 'date'
\ No newline at end of file
+    date_hierarchy = 'date'
+
+
+@admin.register(WrapForecast)
+class WrapForecastAdmin(admin.ModelAdmin):
+    list_display = ['production', 'date', 'created_at']
+    list_filter = ['date']
+    readonly_fields = ['created_at']
@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class AnalyticsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.analytics'
-    verbose_name = 'Analytics'
\ No newline at end of file
+    verbose_name = 'Analytics'
+
+    def ready(self):
+        from . import signals  # noqa: F401
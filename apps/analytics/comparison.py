@@ -0,0 +1,197 @@
+"""
+Comparative analytics across productions.
+
+For every production a user can access: pages per shoot day, takes per
+shot, the take quality_rating distribution, the scene completion curve
+by shoot day and, per scene type (INT/EXT and time of day), how the
+actual duration compared with the estimate.
+
+Each measure comes from one GROUP BY query over all the productions,
+so the number of queries does not grow with the number of productions.
+The rows are then combined in Python. Results are cached per user and
+invalidated when any of the productions' data_version changes.
+"""
+
+import hashlib
+import statistics
+
+from django.core.cache import cache
+from django.db.models import Avg, Count, F, FloatField, Q, Sum
+from django.db.models.functions import Abs, Cast
+
+from apps.core.utils import user_production_ids
+from apps.productions.models import Production
+from .models import DailyProgress
+
+
+CACHE_TIMEOUT = 60 * 60
+QUALITY_RATINGS = (1, 2, 3, 4, 5)
+
+
+def _ratio(numerator, denominator, digits=2):
+    return round(float(numerator) / float(denominator), digits) if denominator else None
+
+
+def _spread(values):
+    """Min, quartiles and max of the values that are known."""
+    values = sorted(value for value in values if value is not None)
+    if not values:
+        return None
+    if len(values) == 1:
+        q1 = median = q3 = values[0]
+    else:
+        q1, median, q3 = statistics.quantiles(values, n=4, method='inclusive')
+    return {
+        'productions': len(values),
+        'min': values[0],
+        'p25': round(q1, 2),
+        'median': round(median, 2),
+        'p75': round(q3, 2),
+        'max': values[-1],
+    }
+
+
+def _accuracy(row):
+    return {
+        'scenes': row['scenes'],
+        'estimated_minutes': row['estimated'],
+        'actual_minutes': row['actual'],
+        'actual_to_estimate': _ratio(row['actual'], row['estimated']),
+        'mean_abs_pct_error': round(row['abs_pct_error'] * 100, 1) if row['abs_pct_error'] is not None else None,
+    }
+
+
+def _scene_type(row):
+    return f"{row['interior_exterior']} {row['day_night']}"
+
+
+def compute_comparison(production_ids):
+    from apps.scenes.models import Scene
+    from apps.shots.models import Take
+
+    productions = {
+        production['id']: {
+            **production,
+            'shoot_days': 0,
+            'pages_shot': 0.0,
+            'pages_per_shoot_day': None,
+            'shots_with_takes': 0,
+            'takes': 0,
+            'takes_per_shot': None,
+            'quality': {'ratings': {str(rating): 0 for rating in QUALITY_RATINGS}, 'unrated': 0, 'average': None},
+            'completion': {'scenes': 0, 'completed_scenes': 0, 'percent': None, 'curve': []},
+            'estimate_accuracy': {},
+        }
+        for production in Production.objects.filter(id__in=production_ids).order_by('title').values(
+            'id', 'title', 'status'
+        )
+    }
+
+    shooting = DailyProgress.objects.filter(production_id__in=production_ids).values(
+        'production_id'
+    ).annotate(
+        days=Count('id', filter=Q(pages_shot__gt=0) | Q(shots_completed__gt=0)),
+        pages=Sum('pages_shot'),
+    ).order_by()
+    for row in shooting:
+        entry = productions[row['production_id']]
+        entry['shoot_days'] = row['days']
+        entry['pages_shot'] = float(row['pages'] or 0)
+        entry['pages_per_shoot_day'] = _ratio(entry['pages_shot'], row['days'])
+
+    takes = Take.objects.filter(shot__scene__production_id__in=production_ids).values(
+        production_id=F('shot__scene__production_id')
+    ).annotate(takes=Count('id'), shots=Count('shot_id', distinct=True)).order_by()
+    for row in takes:
+        entry = productions[row['production_id']]
+        entry['takes'] = row['takes']
+        entry['shots_with_takes'] = row['shots']
+        entry['takes_per_shot'] = _ratio(row['takes'], row['shots'])
+
+    ratings = Take.objects.filter(shot__scene__production_id__in=production_ids).values(
+        'quality_rating', production_id=F('shot__scene__production_id')
+    ).annotate(takes=Count('id')).order_by()
+    for row in ratings:
+        quality = productions[row['production_id']]['quality']
+        if row['quality_rating'] is None:
+            quality['unrated'] += row['takes']
+        else:
+            quality['ratings'][str(row['quality_rating'])] += row['takes']
+    for entry in productions.values():
+        quality = entry['quality']
+        rated = sum(quality['ratings'].values())
+        total = sum(int(rating) * count for rating, count in quality['ratings'].items())
+        quality['average'] = _ratio(total, rated)
+
+    scenes = Scene.objects.filter(production_id__in=production_ids).exclude(
+        status='cancelled'
+    ).values('production_id').annotate(
+        scenes=Count('id'), completed=Count('id', filter=Q(status='completed'))
+    ).order_by()
+    for row in scenes:
+        completion = productions[row['production_id']]['completion']
+        completion['scenes'] = row['scenes']
+        completion['completed_scenes'] = row['completed']
+        completion['percent'] = _ratio(row['completed'] * 100, row['scenes'], 1)
+
+    # Curve: percent of scenes completed after each shoot day.
+    days = DailyProgress.objects.filter(
+        production_id__in=production_ids, scenes_completed__gt=0
+    ).order_by('production_id', 'date').values_list('production_id', 'scenes_completed')
+    done = {}
+    for production_id, completed in days:
+        completion = productions[production_id]['completion']
+        done[production_id] = done.get(production_id, 0) + completed
+        percent = _ratio(done[production_id] * 100, completion['scenes'], 1)
+        completion['curve'].append([len(completion['curve']) + 1, percent])
+
+    timed = Scene.objects.filter(
+        production_id__in=production_ids,
+        estimated_duration__isnull=False,
+        actual_duration__isnull=False,
+    )
+    accuracy = dict(
+        scenes=Count('id'),
+        estimated=Sum('estimated_duration'),
+        actual=Sum('actual_duration'),
+        abs_pct_error=Avg(
+            Cast(Abs(F('actual_duration') - F('estimated_duration')), FloatField())
+            / F('estimated_duration')
+        ),
+    )
+    for row in timed.values('production_id', 'interior_exterior', 'day_night').annotate(**accuracy).order_by():
+        productions[row['production_id']]['estimate_accuracy'][_scene_type(row)] = _accuracy(row)
+    overall_accuracy = {
+        _scene_type(row): _accuracy(row)
+        for row in timed.values('interior_exterior', 'day_night').annotate(**accuracy).order_by(
+            'interior_exterior', 'day_night'
+        )
+    }
+
+    entries = list(productions.values())
+    return {
+        'productions': entries,
+        'benchmarks': {
+            'pages_per_shoot_day': _spread(entry['pages_per_shoot_day'] for entry in entries),
+            'takes_per_shot': _spread(entry['takes_per_shot'] for entry in entries),
+            'average_quality': _spread(entry['quality']['average'] for entry in entries),
+            'completion_percent': _spread(entry['completion']['percent'] for entry in entries),
+        },
+        'estimate_accuracy': overall_accuracy,
+    }
+
+
+def production_comparison(user):
+    """Comparison of every production the user created or works on, cached per user."""
+    versions = list(
+        Production.objects.filter(
+            id__in=user_production_ids(user)
+        ).order_by('id').values_list('id', 'data_version')
+    )
+    digest = hashlib.md5(repr(versions).encode()).hexdigest()
+    cache_key = f"comparison:{user.pk}:{digest}"
+    result = cache.get(cache_key)
+    if result is None:
+        result = compute_comparison([production_id for production_id, _ in versions])
+        cache.set(cache_key, result, CACHE_TIMEOUT)
+    return result
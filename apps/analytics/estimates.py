@@ -0,0 +1,207 @@
+"""
+Suggested scene durations learned from completed scenes.
+
+A linear model of actual_duration is fitted per production on its
+completed scenes. The features are script pages, INT/EXT and time of
+day, stunts, VFX, weather dependence and the number of shots. Fitting
+streams the scenes once and only keeps the running sums XᵀX and Xᵀy, so
+the cost is linear in the number of scenes and memory stays flat. The
+coefficients are then solved from the normal equations with a small
+ridge penalty, which keeps sparse categories from blowing up.
+
+Productions with too few completed scenes use a model fitted on all
+productions (the sums simply add up). Unshot scenes get the model's
+prediction in Scene.suggested_duration.
+
+    python manage.py suggest_scene_durations [--production ID]
+"""
+
+import math
+
+from django.conf import settings
+from django.db.models import Count
+
+from .progress import DONE_STATUSES
+
+
+FEATURES = [
+    'intercept', 'script_pages', 'exterior', 'interior_exterior',
+    'night', 'dawn', 'dusk', 'continuous',
+    'stunts_required', 'vfx_required', 'weather_dependent', 'shots',
+]
+FIELDS = [
+    'production_id', 'script_pages', 'interior_exterior', 'day_night',
+    'stunts_required', 'vfx_required', 'weather_dependent', 'shot_count',
+]
+RIDGE = 0.1
+CHUNK_SIZE = 2000
+
+
+def features(row):
+    """Feature vector of a row of FIELDS values."""
+    _, pages, int_ext, day_night, stunts, vfx, weather, shots = row
+    return [
+        1.0,
+        float(pages or 0),
+        float(int_ext == 'EXT'),
+        float(int_ext == 'INT/EXT'),
+        float(day_night == 'NIGHT'),
+        float(day_night == 'DAWN'),
+        float(day_night == 'DUSK'),
+        float(day_night == 'CONTINUOUS'),
+        float(stunts),
+        float(vfx),
+        float(weather),
+        float(shots),
+    ]
+
+
+class Sums:
+    """Running sums for least squares over a stream of scenes."""
+
+    def __init__(self):
+        size = len(FEATURES)
+        self.xtx = [[0.0] * size for _ in range(size)]
+        self.xty = [0.0] * size
+        self.yty = 0.0
+        self.n = 0
+        self.estimate_sse = 0.0  # squared error of the stored estimates
+        self.estimated = 0
+
+    def add(self, x, y, estimate=None):
+        for i, xi in enumerate(x):
+            if xi:
+                row = self.xtx[i]
+                for j, xj in enumerate(x):
+                    row[j] += xi * xj
+                self.xty[i] += xi * y
+        self.yty += y * y
+        self.n += 1
+        if estimate is not None:
+            self.estimate_sse += (y - estimate) ** 2
+            self.estimated += 1
+
+    def __iadd__(self, other):
+        for row, other_row in zip(self.xtx, other.xtx):
+            for j, value in enumerate(other_row):
+                row[j] += value
+        self.xty = [a + b for a, b in zip(self.xty, other.xty)]
+        self.yty += other.yty
+        self.n += other.n
+        self.estimate_sse += other.estimate_sse
+        self.estimated += other.estimated
+        return self
+
+
+def _solve(matrix, vector):
+    """Solve matrix · x = vector by Gaussian elimination with partial pivoting."""
+    size = len(vector)
+    rows = [list(matrix[i]) + [vector[i]] for i in range(size)]
+    for col in range(size):
+        pivot = max(range(col, size), key=lambda r: abs(rows[r][col]))
+        if abs(rows[pivot][col]) < 1e-12:
+            raise ValueError('singular system')
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(col + 1, size):
+            factor = rows[r][col] / rows[col][col]
+            if factor:
+                for c in range(col, size + 1):
+                    rows[r][c] -= factor * rows[col][c]
+    solution = [0.0] * size
+    for r in range(size - 1, -1, -1):
+        total = rows[r][size] - sum(rows[r][c] * solution[c] for c in range(r + 1, size))
+        solution[r] = total / rows[r][r]
+    return solution
+
+
+def fit(sums):
+    """
+    Coefficients and fit summary from the running sums, or None when
+    there are too few scenes.
+    """
+    if sums.n < settings.SCENE_ESTIMATE_MIN_SCENES:
+        return None
+    # Penalize everything but the intercept.
+    matrix = [
+        [value + (RIDGE if i == j and i else 0.0) for j, value in enumerate(row)]
+        for i, row in enumerate(sums.xtx)
+    ]
+    coefficients = _solve(matrix, sums.xty)
+    # Squared error of the fit, from the sums alone.
+    sse = (
+        sums.yty
+        - 2 * sum(b * v for b, v in zip(coefficients, sums.xty))
+        + sum(
+            coefficients[i] * coefficients[j] * sums.xtx[i][j]
+            for i in range(len(FEATURES)) for j in range(len(FEATURES))
+        )
+    )
+    return {
+        'scenes': sums.n,
+        'coefficients': dict(zip(FEATURES, coefficients)),
+        'rmse': round(math.sqrt(max(sse, 0.0) / sums.n), 1),
+        'estimate_rmse': (
+            round(math.sqrt(sums.estimate_sse / sums.estimated), 1) if sums.estimated else None
+        ),
+    }
+
+
+def predict(model, x):
+    coefficients = model['coefficients']
+    minutes = sum(coefficients[name] * value for name, value in zip(FEATURES, x))
+    return max(1, round(minutes))
+
+
+def train(production_ids=None):
+    """Running sums of completed scenes per production, and over all of them."""
+    from apps.scenes.models import Scene
+
+    scenes = Scene.objects.filter(
+        status__in=DONE_STATUSES['scenes.Scene'], actual_duration__isnull=False
+    )
+    per_production = {}
+    pooled = Sums()
+    rows = scenes.annotate(shot_count=Count('shots')).order_by().values_list(
+        *FIELDS, 'actual_duration', 'estimated_duration'
+    )
+    for row in rows.iterator(chunk_size=CHUNK_SIZE):
+        production_id, actual, estimate = row[0], row[-2], row[-1]
+        x = features(row[:-2])
+        if production_ids is None or production_id in production_ids:
+            per_production.setdefault(production_id, Sums()).add(x, actual, estimate)
+        pooled.add(x, actual, estimate)
+    return per_production, pooled
+
+
+def suggest_durations(production_ids):
+    """
+    Fit the models and store suggested durations on the productions'
+    unshot scenes. Returns {production_id: model summary or None}.
+    """
+    from apps.productions.signals import bump_data_version
+    from apps.scenes.models import Scene
+
+    per_production, pooled = train(set(production_ids))
+    pooled_model = fit(pooled)
+    if pooled_model is not None:
+        pooled_model['pooled'] = True
+
+    summaries = {}
+    for production_id in production_ids:
+        model = fit(per_production.get(production_id, Sums())) or pooled_model
+        summaries[production_id] = model
+
+        unshot = Scene.objects.filter(production_id=production_id).exclude(
+            status__in=DONE_STATUSES['scenes.Scene'] | {'cancelled'}
+        ).annotate(shot_count=Count('shots')).order_by()
+        changed = []
+        for row in unshot.values_list('id', 'suggested_duration', *FIELDS).iterator(chunk_size=CHUNK_SIZE):
+            scene_id, current = row[0], row[1]
+            suggested = predict(model, features(row[2:])) if model else None
+            if suggested != current:
+                changed.append(Scene(id=scene_id, suggested_duration=suggested))
+        if changed:
+            Scene.objects.bulk_update(changed, ['suggested_duration'], batch_size=CHUNK_SIZE)
+            # bulk_update() sends no post_save, and exports show suggested durations.
+            bump_data_version(production_id)
+    return summaries
@@ -0,0 +1,199 @@
+"""
+Wrap-date forecasting from shooting velocity.
+
+The pages and shots completed on each recent shooting day (weekday) are
+read from DailyProgress. Thousands of possible futures are simulated by
+resampling those days with replacement until the remaining script pages
+and shots are done. A day's pages and shots are drawn together, so a
+heavy day stays heavy in both. The spread of the simulated finishing
+days gives the P10/P50/P90 wrap dates and the chance of wrapping by the
+scheduled end date.
+
+Forecasts are stored per production and day in WrapForecast, not per
+data version: a day's edits (takes, checkouts, props) do not invalidate
+the forecast, so the dashboard reads the stored one all day. `python
+manage.py forecast_wrap_dates` computes them for every active production
+(e.g. nightly); a production it missed is forecast once, on its first
+request.
+"""
+
+import json
+import random
+from bisect import bisect_left
+from datetime import timedelta
+from itertools import accumulate
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from apps.core.utils import add_shooting_days, calculate_shooting_days
+from .models import DailyProgress, WrapForecast
+from .progress import DONE_STATUSES
+
+
+PERCENTILES = (10, 50, 90)
+BLOCK = 64  # days drawn at a time per simulation
+
+
+def _history(production_id, today):
+    """(pages, shots) per shooting day, from the first day with progress."""
+    rows = DailyProgress.objects.filter(
+        production_id=production_id, date__lte=today
+    ).values_list('date', 'pages_shot', 'shots_completed')
+    per_day = {
+        day: (max(float(pages), 0.0), max(shots, 0))
+        for day, pages, shots in rows
+        if pages > 0 or shots > 0
+    }
+    if not per_day:
+        return []
+
+    # Today counts only once something has been shot.
+    last = today if today in per_day else today - timedelta(days=1)
+    days = []
+    day = min(per_day)
+    while day <= last:
+        if day.weekday() < 5 or day in per_day:
+            days.append(per_day.get(day, (0.0, 0)))
+        day += timedelta(days=1)
+    return days[-settings.FORECAST_HISTORY_DAYS:]
+
+
+def _remaining(production_id):
+    from apps.scenes.models import Scene
+    from apps.shots.models import Shot
+
+    scene_done = DONE_STATUSES['scenes.Scene'] | {'cancelled'}
+    scenes = Scene.objects.filter(production_id=production_id).exclude(
+        status__in=scene_done
+    ).aggregate(scenes=Count('id'), pages=Sum('script_pages'))
+    shots = Shot.objects.filter(scene__production_id=production_id).exclude(
+        status__in=DONE_STATUSES['shots.Shot']
+    ).exclude(scene__status='cancelled').count()
+    return {
+        'scenes': scenes['scenes'],
+        'pages': float(scenes['pages'] or 0),
+        'shots': shots,
+    }
+
+
+def _first_reached(rng, picks_from, rates, target, limit):
+    """Shooting days until the resampled rates add up to target, or None."""
+    if target <= 0:
+        return 0
+    done, days = 0, 0
+    while days < limit:
+        block = min(BLOCK, limit - days)
+        totals = list(accumulate((rates[i] for i in rng.choices(picks_from, k=block)), initial=done))
+        if totals[-1] >= target:
+            return days + bisect_left(totals, target)
+        done, days = totals[-1], days + block
+    return None
+
+
+def simulate(history, remaining, simulations, limit, seed=0):
+    """
+    Sorted shooting days needed in each simulation; None where the work
+    is not finished within limit days. A metric with no recorded progress
+    is left out.
+    """
+    seeds = random.Random(seed)
+    picks_from = range(len(history))
+    metrics = [
+        ([day[i] for day in history], remaining[name])
+        for i, name in enumerate(('pages', 'shots'))
+    ]
+    metrics = [(rates, target) for rates, target in metrics if any(rates)]
+
+    results = []
+    for _ in range(simulations):
+        # Both metrics replay the same sequence of days in a simulation.
+        simulation_seed = seeds.getrandbits(64)
+        needed = 0
+        for rates, target in metrics:
+            days = _first_reached(random.Random(simulation_seed), picks_from, rates, target, limit)
+            if days is None:
+                needed = None
+                break
+            needed = max(needed, days)
+        results.append(needed)
+    return sorted(results, key=lambda days: (days is None, days or 0))
+
+
+def _percentile(results, percent):
+    return results[min(len(results) - 1, (len(results) * percent) // 100)]
+
+
+def build_wrap_forecast(production, today=None):
+    """Forecast a production's wrap date and store it for the day."""
+    today = today or timezone.localdate()
+    history = _history(production.id, today)
+    remaining = _remaining(production.id)
+    scheduled_days = (
+        calculate_shooting_days(today + timedelta(days=1), production.end_date)
+        if production.end_date else None
+    )
+
+    forecast = {
+        'production_id': production.id,
+        'as_of': today,
+        'history_days': len(history),
+        'velocity': {
+            'pages_per_day': round(sum(day[0] for day in history) / len(history), 2) if history else 0,
+            'shots_per_day': round(sum(day[1] for day in history) / len(history), 2) if history else 0,
+        },
+        'remaining': remaining,
+        'scheduled_end': production.end_date,
+        'scheduled_days_remaining': scheduled_days,
+        'wrap': None,
+        'on_schedule_probability': None,
+    }
+
+    if not remaining['scenes'] and not remaining['shots']:
+        forecast['status'] = 'complete'
+    elif not any(pages or shots for pages, shots in history):
+        forecast['status'] = 'insufficient_history'
+    else:
+        limit = settings.FORECAST_MAX_DAYS
+        results = simulate(
+            history, remaining, settings.FORECAST_SIMULATIONS, limit, seed=production.id
+        )
+        wrap = {}
+        for percent in PERCENTILES:
+            days = _percentile(results, percent)
+            wrap[f"p{percent}"] = {
+                'shooting_days': days,
+                'date': add_shooting_days(today, days) if days is not None else None,
+            }
+        forecast['status'] = 'forecast'
+        forecast['wrap'] = wrap
+        if scheduled_days is not None:
+            on_time = sum(1 for days in results if days is not None and days <= scheduled_days)
+            forecast['on_schedule_probability'] = round(on_time / len(results), 3)
+
+    # Round-trip through JSON so a fresh forecast looks exactly like a stored one.
+    forecast = json.loads(json.dumps(forecast, cls=DjangoJSONEncoder))
+    WrapForecast.objects.update_or_create(
+        production_id=production.id, date=today, defaults={'data': forecast}
+    )
+    return forecast
+
+
+def get_wrap_forecast(production):
+    """Today's stored forecast, computed only if there is none yet."""
+    today = timezone.localdate()
+    stored = WrapForecast.objects.filter(production_id=production.id, date=today).values_list(
+        'data', flat=True
+    ).first()
+    if stored is not None:
+        return stored
+
+    try:
+        with transaction.atomic():
+            return build_wrap_forecast(production, today)
+    except IntegrityError:
+        # Another request stored it at the same moment.
+        return WrapForecast.objects.get(production_id=production.id, date=today).data
@@ -0,0 +1,100 @@
+"""
+Rebuild DailyProgress from the scenes and shots already completed.
+
+Completions recorded since DailyProgress capture was added carry a
+completed_at timestamp. For older ones the day is reconstructed from,
+in order: the last take recorded for it, its scene's shooting date, and
+its last update. Those days are then stored in completed_at, so that
+reopening an old scene later takes it off the right day.
+
+    python manage.py backfill_daily_progress [--production ID]
+
+Hours worked and notes on existing rows are kept.
+"""
+
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from apps.analytics.models import DailyProgress
+from apps.analytics.progress import DONE_STATUSES, ZERO, as_moment
+from apps.productions.models import Production
+from apps.scenes.models import Scene
+from apps.shots.models import Shot
+
+
+def completion_time(row):
+    if row['completed_at']:
+        return row['completed_at']
+    if row['last_take']:
+        return row['last_take']
+    if row['shooting_date']:
+        return as_moment(row['shooting_date'])
+    return row['updated_at']
+
+
+class Command(BaseCommand):
+    help = 'Reconstruct per-day scene, shot and page completions from existing data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--production', type=int, default=None, help='Only this production')
+
+    def handle(self, *args, **options):
+        productions = Production.objects.all()
+        if options['production'] is not None:
+            productions = productions.filter(id=options['production'])
+
+        for production_id in productions.values_list('id', flat=True):
+            days = self.backfill(production_id)
+            self.stdout.write(f"Production {production_id}: {days} days with progress")
+        self.stdout.write(self.style.SUCCESS('DailyProgress backfilled'))
+
+    @transaction.atomic
+    def backfill(self, production_id):
+        totals = defaultdict(lambda: {'scenes_completed': 0, 'shots_completed': 0, 'pages_shot': ZERO})
+
+        scenes = Scene.objects.filter(
+            production_id=production_id, status__in=DONE_STATUSES['scenes.Scene']
+        ).annotate(
+            last_take=Max('shots__takes__created_at')
+        ).values('id', 'completed_at', 'last_take', 'shooting_date', 'updated_at', 'script_pages')
+        shots = Shot.objects.filter(
+            scene__production_id=production_id, status__in=DONE_STATUSES['shots.Shot']
+        ).annotate(
+            last_take=Max('takes__created_at'), shooting_date=F('scene__shooting_date')
+        ).values('id', 'completed_at', 'last_take', 'shooting_date', 'updated_at')
+
+        stamped = {Scene: [], Shot: []}
+        for model, rows in ((Scene, scenes), (Shot, shots)):
+            for row in rows:
+                completed_at = completion_time(row)
+                day = totals[timezone.localdate(completed_at)]
+                if model is Scene:
+                    day['scenes_completed'] += 1
+                    day['pages_shot'] += row['script_pages'] or ZERO
+                else:
+                    day['shots_completed'] += 1
+                if row['completed_at'] is None:
+                    stamped[model].append(model(id=row['id'], completed_at=completed_at))
+        for model, objs in stamped.items():
+            model.objects.bulk_update(objs, ['completed_at'], batch_size=500)
+
+        existing = {row.date: row for row in DailyProgress.objects.filter(production_id=production_id)}
+        changed, created = [], []
+        for date, row in existing.items():
+            values = totals.pop(date, {'scenes_completed': 0, 'shots_completed': 0, 'pages_shot': ZERO})
+            for field, value in values.items():
+                setattr(row, field, value)
+            changed.append(row)
+        for date, values in totals.items():
+            created.append(DailyProgress(production_id=production_id, date=date, **values))
+
+        DailyProgress.objects.bulk_update(changed, ['scenes_completed', 'shots_completed', 'pages_shot'])
+        DailyProgress.objects.bulk_create(created)
+        return sum(
+            1 for row in changed + created
+            if row.scenes_completed or row.shots_completed or row.pages_shot
+        )
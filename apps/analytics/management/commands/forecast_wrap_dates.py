@@ -0,0 +1,35 @@
+"""
+Forecast the wrap date of every active production and store the results.
+
+Run once a day, e.g. from cron overnight:
+    python manage.py forecast_wrap_dates
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.analytics.forecast import build_wrap_forecast
+from apps.productions.models import Production
+
+
+class Command(BaseCommand):
+    help = 'Project wrap dates from shooting velocity for active productions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--production', type=int, default=None, help='Only this production')
+
+    def handle(self, *args, **options):
+        productions = Production.objects.exclude(status='completed')
+        if options['production'] is not None:
+            productions = Production.objects.filter(id=options['production'])
+
+        built = 0
+        for production in productions.only('id', 'end_date'):
+            forecast = build_wrap_forecast(production)
+            if forecast['status'] == 'forecast':
+                wrap = forecast['wrap']
+                self.stdout.write(
+                    f"Production {production.id}: wrap {wrap['p10']['date']} / "
+                    f"{wrap['p50']['date']} / {wrap['p90']['date']} (P10/P50/P90)"
+                )
+            built += 1
+        self.stdout.write(self.style.SUCCESS(f"Forecast {built} productions"))
@@ -0,0 +1,35 @@
+"""
+Refit the scene duration model and update suggested durations.
+
+Run periodically, e.g. nightly from cron:
+    python manage.py suggest_scene_durations
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.analytics.estimates import suggest_durations
+from apps.productions.models import Production
+
+
+class Command(BaseCommand):
+    help = 'Suggest durations for unshot scenes from the durations of completed ones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--production', type=int, default=None, help='Only this production')
+
+    def handle(self, *args, **options):
+        productions = Production.objects.exclude(status='completed')
+        if options['production'] is not None:
+            productions = Production.objects.filter(id=options['production'])
+
+        summaries = suggest_durations(list(productions.values_list('id', flat=True)))
+        for production_id, model in summaries.items():
+            if model is None:
+                self.stdout.write(f"Production {production_id}: not enough completed scenes")
+                continue
+            source = 'all productions' if model.get('pooled') else 'own scenes'
+            self.stdout.write(
+                f"Production {production_id}: fitted on {model['scenes']} scenes ({source}), "
+                f"RMSE {model['rmse']} min vs {model['estimate_rmse']} min for the estimates"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Suggested durations for {len(summaries)} productions"))
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.1 on 2026-10-19 05:10
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0002_initial"),
+        ("productions", "0005_returns_digest"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WrapForecast",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                (
+                    "data",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "production",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="wrap_forecasts",
+                        to="productions.production",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "wrap_forecasts",
+                "ordering": ["-date"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="wrapforecast",
+            constraint=models.UniqueConstraint(
+                fields=("production", "date"), name="unique_wrap_forecast_per_day"
+            ),
+        ),
+    ]
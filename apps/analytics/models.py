@@ -3,6 +3,7 @@ Analytics models for ClapLog.
 Store cached production statistics and metrics.
 """
 
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from apps.productions.models import Production
 
@@ -66,4 +67,32 @@ class DailyProgress(models.Model):
         ordering = ['-date']
 
     def __str__(self):
-        return f"{self.production.title} - {self.date}"
\ No newline at end of file
+        return f"{self.production.title} - {self.date}"
+
+
+class WrapForecast(models.Model):
+    """
+    A production's wrap-date forecast for one day (see apps.analytics.forecast).
+
+    Stored in the database so the nightly forecast_wrap_dates run and every
+    web process share it.
+    """
+
+    production = models.ForeignKey(
+        Production,
+        on_delete=models.CASCADE,
+        related_name='wrap_forecasts'
+    )
+    date = models.DateField()
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'wrap_forecasts'
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['production', 'date'], name='unique_wrap_forecast_per_day'),
+        ]
+
+    def __str__(self):
+        return f"Wrap forecast for production {self.production_id} on {self.date}"
@@ -0,0 +1,139 @@
+"""
+Daily production progress: scenes, shots and script pages completed per day.
+
+When a scene or shot moves into a completed status, its completed_at is
+stamped and that day's DailyProgress row is incremented with a single
+UPDATE ... SET n = n + 1 (an INSERT for the first completion of the
+day). Reopening it takes the completion back off the day it was counted
+on, as does deleting it. Burndown and burn-up charts read these rows
+instead of scanning scenes and shots.
+
+`python manage.py backfill_daily_progress` rebuilds the rows from
+existing data.
+"""
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from .models import DailyProgress
+
+
+# Statuses that count as done, per model label.
+DONE_STATUSES = {
+    'scenes.Scene': {'completed'},
+    'shots.Shot': {'completed', 'approved'},
+}
+
+METRICS = {
+    'scenes': 'scenes_completed',
+    'shots': 'shots_completed',
+    'pages': 'pages_shot',
+}
+
+ZERO = Decimal('0')
+
+
+def record_progress(production_id, day, scenes=0, shots=0, pages=ZERO):
+    """
+    Add (or with negative values, take back) completions on a day.
+
+    Taking back only changes an existing row: a day with no row has
+    nothing counted to take back.
+    """
+    changes = {
+        'scenes_completed': F('scenes_completed') + scenes,
+        'shots_completed': F('shots_completed') + shots,
+        'pages_shot': F('pages_shot') + pages,
+    }
+    rows = DailyProgress.objects.filter(production_id=production_id, date=day)
+    if rows.update(**changes) or (scenes <= 0 and shots <= 0 and pages <= 0):
+        return
+    try:
+        with transaction.atomic():
+            DailyProgress.objects.create(
+                production_id=production_id,
+                date=day,
+                scenes_completed=scenes,
+                shots_completed=shots,
+                pages_shot=pages,
+            )
+    except IntegrityError:
+        # Another request created the day's row first.
+        rows.update(**changes)
+
+
+def as_moment(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _number(value):
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def burndown(production, metric='scenes'):
+    """
+    Burn-up and burndown series of one metric from DailyProgress.
+
+    Each day from the production's start (or first completion) through
+    today (or the last completion, if later) has the day's completions,
+    the cumulative total and what remains. If the production has start
+    and end dates, ideal_remaining falls linearly from the total to zero
+    across them.
+    """
+    from apps.scenes.models import Scene
+    from apps.shots.models import Shot
+
+    field = METRICS[metric]
+    if metric == 'shots':
+        total = Shot.objects.filter(scene__production=production).count()
+    else:
+        totals = Scene.objects.filter(production=production).aggregate(
+            scenes=Count('id'), pages=Sum('script_pages')
+        )
+        total = totals[metric] or ZERO
+
+    per_day = dict(
+        DailyProgress.objects.filter(production=production).exclude(**{field: 0}).order_by(
+            'date'
+        ).values_list('date', field)
+    )
+
+    today = timezone.localdate()
+    first = min(filter(None, [production.start_date, min(per_day, default=None)]), default=today)
+    last = max(filter(None, [min(today, production.end_date or today), max(per_day, default=None)]))
+
+    # The ideal line burns the total down evenly from start_date to end_date.
+    start, end = production.start_date, production.end_date
+    span = (end - start).days if start and end and end > start else None
+
+    series = []
+    cumulative = 0
+    day = first
+    while day <= last:
+        completed = per_day.get(day, 0)
+        cumulative += completed
+        ideal_remaining = None
+        if span:
+            elapsed = min(max((day - start).days, 0), span)
+            ideal_remaining = round(float(total) * (span - elapsed) / span, 2)
+        series.append({
+            'date': day,
+            'completed': _number(completed),
+            'cumulative': _number(cumulative),
+            'remaining': _number(total - cumulative),
+            'ideal_remaining': ideal_remaining,
+        })
+        day += timedelta(days=1)
+
+    return {
+        'production_id': production.id,
+        'metric': metric,
+        'total': _number(total),
+        'completed': _number(cumulative),
+        'remaining': _number(total - cumulative),
+        'series': series,
+    }
@@ -0,0 +1,120 @@
+"""
+Analytics signal handlers.
+
+Record scene and shot completions in DailyProgress as they happen. The
+previous status, completion time and script pages come from the row the
+instance was loaded with (TrackChangesMixin), so a save that doesn't
+complete anything costs no extra query.
+
+Pages are counted at their value when the scene was completed: editing
+script_pages on a completed scene moves the difference onto the day it
+was counted, and reopening it takes back the pages it was counted with.
+Deleting a completed scene or shot takes it back off its day.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+from .progress import DONE_STATUSES, ZERO, record_progress
+
+
+SCENE = 'scenes.Scene'
+
+
+def _tracked(sender):
+    """Fields whose change can alter a model's recorded progress."""
+    return ('status', 'script_pages') if sender._meta.label == SCENE else ('status',)
+
+
+def _stored(sender, instance):
+    """(status, completed_at, script_pages) as stored; shots have no pages."""
+    fields = ('status', 'completed_at', 'script_pages') if sender._meta.label == SCENE else ('status', 'completed_at')
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded is not None and all(field in loaded for field in fields):
+        values = tuple(loaded[field] for field in fields)
+    else:
+        values = sender.objects.filter(pk=instance.pk).values_list(*fields).first() or (None,) * len(fields)
+    return (values + (None,))[:3]
+
+
+def _production_id(sender, instance, origin=None):
+    from apps.scenes.models import Scene
+
+    if sender._meta.label == SCENE:
+        return instance.production_id
+    # A shot deleted along with its scene gets it from the cascade's origin.
+    if isinstance(origin, Scene) and origin.pk == instance.scene_id:
+        return origin.production_id
+    if sender._meta.get_field('scene').is_cached(instance):
+        return instance.scene.production_id
+    return Scene.objects.filter(pk=instance.scene_id).values_list('production_id', flat=True).first()
+
+
+def _record(sender, instance, day, sign, pages=ZERO, origin=None):
+    production_id = _production_id(sender, instance, origin)
+    if production_id is None:
+        return
+    if sender._meta.label == SCENE:
+        record_progress(production_id, day, scenes=sign, pages=sign * (pages or ZERO))
+    else:
+        record_progress(production_id, day, shots=sign)
+
+
+def remember_status(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields is not None and not set(_tracked(sender)) & set(update_fields)):
+        instance._previous_progress = None
+        return
+    if instance._state.adding:
+        instance._previous_progress = (None, None, None)
+        return
+    instance._previous_progress = _stored(sender, instance)
+
+
+def update_progress(sender, instance, update_fields=None, **kwargs):
+    previous = getattr(instance, '_previous_progress', None)
+    instance._previous_progress = None
+    if previous is None:
+        return
+    previous_status, previous_completed_at, previous_pages = previous
+    done = DONE_STATUSES[sender._meta.label]
+    was_done, is_done = previous_status in done, instance.status in done
+    # The pages this save stored, which unsaved edits do not change.
+    pages = previous_pages
+    if sender._meta.label == SCENE and (update_fields is None or 'script_pages' in update_fields):
+        pages = instance.script_pages
+
+    if was_done and is_done:
+        # Still completed: only a change of pages needs moving.
+        if sender._meta.label == SCENE and previous_completed_at and (pages or ZERO) != (previous_pages or ZERO):
+            day = timezone.localdate(previous_completed_at)
+            record_progress(instance.production_id, day, pages=(pages or ZERO) - (previous_pages or ZERO))
+        return
+    if was_done == is_done:
+        return
+
+    # Through the base manager: a bookkeeping write, not an activity-logged update.
+    rows = sender._base_manager.filter(pk=instance.pk)
+    if is_done:
+        instance.completed_at = timezone.now()
+        rows.update(completed_at=instance.completed_at)
+        _record(sender, instance, timezone.localdate(instance.completed_at), 1, pages)
+    else:
+        instance.completed_at = None
+        rows.update(completed_at=None)
+        if previous_completed_at:
+            _record(sender, instance, timezone.localdate(previous_completed_at), -1, previous_pages)
+
+
+def forget_progress(sender, instance, origin=None, **kwargs):
+    """Take a deleted scene or shot off the day it was completed on."""
+    status, completed_at, pages = _stored(sender, instance)
+    if status in DONE_STATUSES[sender._meta.label] and completed_at:
+        # Deleting a whole production removes its DailyProgress too; taking
+        # back never creates a row, so nothing is left behind for it.
+        _record(sender, instance, timezone.localdate(completed_at), -1, pages, origin)
+
+
+for label in DONE_STATUSES:
+    pre_save.connect(remember_status, sender=label, dispatch_uid=f'progress-status-{label}')
+    post_save.connect(update_progress, sender=label, dispatch_uid=f'progress-{label}')
+    post_delete.connect(forget_progress, sender=label, dispatch_uid=f'progress-delete-{label}')
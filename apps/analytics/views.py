@@ -1,3 +1,27 @@
-from django.shortcuts import render
+"""
+Analytics API views.
+"""
 
-# Create your views here.
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .comparison import production_comparison
+
+
+class AnalyticsViewSet(viewsets.ViewSet):
+    """
+    Analytics across the productions the user created or works on.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @action(detail=False, methods=['get'])
+    def comparison(self, request):
+        """
+        GET /api/analytics/comparison/
+        Pages per shoot day, takes per shot, take quality, completion
+        curves and duration estimate accuracy per production, with the
+        spread of each across productions.
+        """
+        return Response(production_comparison(request.user))
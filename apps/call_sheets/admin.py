@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import CallSheet, CallSheetScene, CastMember, CallSheetCast
+from .models import CallSheet, CallSheetScene, CastMember, CallSheetCast, CallSheetNotification
 
 
 @admin.register(CallSheet)
@@ -15,5 +15,12 @@ class CastMemberAdmin(admin.ModelAdmin):
     search_fields = ['name', 'character_name']
 
 
+@admin.register(CallSheetNotification)
+class CallSheetNotificationAdmin(admin.ModelAdmin):
+    list_display = ['email', 'call_sheet', 'status', 'attempts', 'next_attempt_at', 'sent_at']
+    list_filter = ['status']
+    search_fields = ['email']
+
+
 admin.site.register(CallSheetScene)
 admin.site.register(CallSheetCast)
\ No newline at end of file
@@ -0,0 +1,255 @@
+"""
+iCalendar (.ics) feeds of shoot days.
+
+Feeds are cached per production data version, so polling calendar
+clients get the cached text (or a 304) until something changes. Each
+event is also cached on its own, keyed by the fields it is rendered from,
+so regenerating a feed after a change only re-renders the changed events.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+
+from django.core import signing
+from django.core.cache import cache
+
+from apps.scenes.models import Scene
+from .models import CallSheet, CallSheetCast, CastMember, cast_scene_ids
+
+
+FEED_SALT = 'claplog.calendar-feed'
+CACHE_TIMEOUT = 7 * 24 * 60 * 60
+
+
+def feed_token(kind, object_id):
+    """Signed, unguessable token identifying a feed; kind is 'production' or 'cast'."""
+    return signing.dumps([kind, object_id], salt=FEED_SALT)
+
+
+def read_feed_token(token):
+    """Return (kind, object_id) for a feed token, or None if it is invalid."""
+    try:
+        kind, object_id = signing.loads(token, salt=FEED_SALT)
+    except (signing.BadSignature, ValueError, TypeError):
+        return None
+    if kind not in ('production', 'cast'):
+        return None
+    return kind, object_id
+
+
+def _escape(value):
+    return (
+        str(value or '').replace('\\', '\\\\').replace(';', '\\;')
+        .replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    """Fold a content line at 75 octets as required by RFC 5545."""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while encoded:
+        limit = 75 if not parts else 74
+        cut = min(limit, len(encoded))
+        # Do not split a multi-byte character.
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    return '\r\n '.join(parts)
+
+
+def _stamp(value):
+    return value.strftime('%Y%m%dT%H%M%SZ')
+
+
+def _local(value):
+    return value.strftime('%Y%m%dT%H%M%S')
+
+
+def _event(uid, updated_at, summary, start, end=None, all_day=False, location='', description='', cancelled=False):
+    lines = [
+        'BEGIN:VEVENT',
+        f"UID:{uid}",
+        f"DTSTAMP:{_stamp(updated_at)}",
+    ]
+    if all_day:
+        lines.append(f"DTSTART;VALUE=DATE:{start:%Y%m%d}")
+        lines.append(f"DTEND;VALUE=DATE:{start + timedelta(days=1):%Y%m%d}")
+    else:
+        lines.append(f"DTSTART:{_local(start)}")
+        lines.append(f"DTEND:{_local(end)}")
+    lines.append(f"SUMMARY:{_escape(summary)}")
+    if location:
+        lines.append(f"LOCATION:{_escape(location)}")
+    if description:
+        lines.append(f"DESCRIPTION:{_escape(description)}")
+    if cancelled:
+        lines.append('STATUS:CANCELLED')
+    lines.append('END:VEVENT')
+    return '\r\n'.join(_fold(line) for line in lines) + '\r\n'
+
+
+def _cached_event(parts, render):
+    """Render an event once per distinct set of inputs it depends on."""
+    digest = hashlib.md5('|'.join(str(part) for part in parts).encode()).hexdigest()
+    cache_key = f"ics:event:{digest}"
+    text = cache.get(cache_key)
+    if text is None:
+        text = render()
+        cache.set(cache_key, text, CACHE_TIMEOUT)
+    return text
+
+
+def call_sheet_event(call_sheet, production_title, booking=None):
+    """Event for a shoot day; with a booking, it starts at that cast member's call."""
+    call_time = booking.call_time if booking else call_sheet.call_time
+    start = datetime.combine(call_sheet.shoot_date, call_time)
+    if call_sheet.wrap_time_estimate and call_sheet.wrap_time_estimate > call_time:
+        end = datetime.combine(call_sheet.shoot_date, call_sheet.wrap_time_estimate)
+    else:
+        end = start + timedelta(hours=12)
+
+    day = f" - Day {call_sheet.day_number}" if call_sheet.day_number else ''
+    details = [f"General call: {call_sheet.call_time:%H:%M}"]
+    if call_sheet.crew_call_time:
+        details.append(f"Crew call: {call_sheet.crew_call_time:%H:%M}")
+    if booking:
+        details.append(f"Your call: {booking.call_time:%H:%M}")
+        if booking.makeup_time:
+            details.append(f"Makeup: {booking.makeup_time:%H:%M}")
+        if booking.pickup_location:
+            details.append(f"Pickup: {booking.pickup_location}")
+    if call_sheet.weather_forecast:
+        details.append(f"Weather: {call_sheet.weather_forecast}")
+    if call_sheet.nearest_hospital:
+        details.append(f"Nearest hospital: {call_sheet.nearest_hospital}")
+
+    return _event(
+        uid=f"callsheet-{call_sheet.id}{'-cast-' + str(booking.id) if booking else ''}@claplog",
+        updated_at=call_sheet.updated_at,
+        summary=f"{production_title}{day} shoot",
+        start=start,
+        end=end,
+        location=call_sheet.location_address,
+        description='\n'.join(details),
+        cancelled=call_sheet.status == 'cancelled' or (booking is not None and booking.status == 'cancelled'),
+    )
+
+
+def scene_event(scene, production_title):
+    """Event for a scheduled scene; all-day when it has no call time."""
+    if scene.call_time:
+        start = datetime.combine(scene.shooting_date, scene.call_time)
+        if scene.wrap_time and scene.wrap_time > scene.call_time:
+            end = datetime.combine(scene.shooting_date, scene.wrap_time)
+        else:
+            end = start + timedelta(minutes=scene.estimated_duration or 60)
+    else:
+        start, end = scene.shooting_date, None
+
+    return _event(
+        uid=f"scene-{scene.id}@claplog",
+        updated_at=scene.updated_at,
+        summary=f"{production_title}: Sc. {scene.scene_number} {scene.slug_line}".strip(),
+        start=start,
+        end=end,
+        all_day=scene.call_time is None,
+        location=scene.location_text,
+        description=scene.description,
+        cancelled=scene.status == 'cancelled',
+    )
+
+
+def _calendar(name, events):
+    return (
+        'BEGIN:VCALENDAR\r\n'
+        'VERSION:2.0\r\n'
+        'PRODID:-//ClapLog//Shoot Days//EN\r\n'
+        'CALSCALE:GREGORIAN\r\n'
+        + _fold(f"X-WR-CALNAME:{_escape(name)}") + '\r\n'
+        + ''.join(events)
+        + 'END:VCALENDAR\r\n'
+    )
+
+
+def render_production_feed(production):
+    """All shoot days and scheduled scenes of a production."""
+    title = production.title
+    call_sheets = CallSheet.objects.filter(production=production).order_by('shoot_date')
+    scenes = Scene.objects.filter(production=production, shooting_date__isnull=False).order_by('shooting_date')
+
+    events = [
+        _cached_event(
+            ['callsheet', cs.id, cs.updated_at, title],
+            lambda cs=cs: call_sheet_event(cs, title),
+        )
+        for cs in call_sheets
+    ]
+    events += [
+        _cached_event(
+            ['scene', scene.id, scene.updated_at, title],
+            lambda scene=scene: scene_event(scene, title),
+        )
+        for scene in scenes
+    ]
+    return _calendar(f"{title} - Shoot Days", events)
+
+
+def render_cast_feed(cast_member):
+    """Call times and scenes of one cast member."""
+    title = cast_member.production.title
+    bookings = CallSheetCast.objects.filter(
+        cast_member=cast_member
+    ).select_related('call_sheet').order_by('call_sheet__shoot_date')
+    scene_ids = cast_scene_ids([cast_member])[cast_member.id]
+    scenes = Scene.objects.filter(id__in=scene_ids, shooting_date__isnull=False).order_by('shooting_date')
+
+    events = [
+        _cached_event(
+            [
+                'booking', booking.id, booking.call_sheet.updated_at, title, booking.call_time,
+                booking.makeup_time, booking.pickup_location, booking.status,
+            ],
+            lambda booking=booking: call_sheet_event(booking.call_sheet, title, booking),
+        )
+        for booking in bookings
+    ]
+    events += [
+        _cached_event(
+            ['scene', scene.id, scene.updated_at, title],
+            lambda scene=scene: scene_event(scene, title),
+        )
+        for scene in scenes
+    ]
+    return _calendar(f"{title} - {cast_member.name}", events)
+
+
+def feed_etag(kind, object_id, version):
+    return f'"ics-{kind}-{object_id}-v{version}"'
+
+
+def get_feed(kind, object_id, version):
+    """
+    Return the feed text for a data version, rendering it on a cache miss.
+
+    Returns None if the production or cast member no longer exists.
+    """
+    cache_key = f"ics:feed:{kind}:{object_id}:{version}"
+    text = cache.get(cache_key)
+    if text is not None:
+        return text
+
+    if kind == 'production':
+        from apps.productions.models import Production
+        production = Production.objects.filter(id=object_id).first()
+        text = production and render_production_feed(production)
+    else:
+        cast_member = CastMember.objects.filter(id=object_id).select_related('production').first()
+        text = cast_member and render_cast_feed(cast_member)
+
+    if text:
+        cache.set(cache_key, text, CACHE_TIMEOUT)
+    return text
@@ -0,0 +1,74 @@
+"""
+Send queued call sheet notifications.
+
+Usage:
+    python manage.py send_call_sheet_notifications            # drain once
+    python manage.py send_call_sheet_notifications --loop 10  # poll every 10s
+
+To try it against a local SMTP stand-in instead of the configured server:
+    python -m aiosmtpd -n -l localhost:1025
+    python manage.py send_call_sheet_notifications --smtp-host localhost --smtp-port 1025
+"""
+
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from apps.call_sheets.notifications import deliver_pending_notifications
+
+
+class Command(BaseCommand):
+    help = 'Send pending call sheet notification emails from the outbox.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.CALL_SHEET_NOTIFICATION_BATCH_SIZE,
+            help='Notifications sent per SMTP connection'
+        )
+        parser.add_argument(
+            '--loop',
+            type=float,
+            default=None,
+            metavar='SECONDS',
+            help='Keep running, polling the outbox at this interval'
+        )
+        parser.add_argument('--smtp-host', help='Override EMAIL_HOST, e.g. for a local SMTP stand-in')
+        parser.add_argument('--smtp-port', type=int, help='Override EMAIL_PORT')
+
+    def get_connection(self, options):
+        if not options['smtp_host']:
+            return None
+        return get_connection(
+            'django.core.mail.backends.smtp.EmailBackend',
+            host=options['smtp_host'],
+            port=options['smtp_port'] or 25,
+            username='',
+            password='',
+            use_tls=False,
+            use_ssl=False,
+            timeout=settings.CALL_SHEET_NOTIFICATION_TIMEOUT,
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            total_sent = total_failed = 0
+            while True:
+                sent, failed = deliver_pending_notifications(
+                    batch_size=options['batch_size'],
+                    connection=self.get_connection(options),
+                )
+                total_sent += sent
+                total_failed += failed
+                if sent + failed < options['batch_size']:
+                    break
+
+            if total_sent or total_failed:
+                self.stdout.write(f"Sent {total_sent}, failed {total_failed}")
+
+            if options['loop'] is None:
+                break
+            time.sleep(options['loop'])
@@ -5,11 +5,13 @@ Manages daily shooting schedules.
 
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from apps.productions.models import Production
 from apps.scenes.models import Scene
+from apps.core.mixins import TrackChangesMixin, TrackChangesQuerySet
 
 
-class CallSheet(models.Model):
+class CallSheet(TrackChangesMixin, models.Model):
     """Daily call sheet for production."""
 
     STATUS_CHOICES = [
@@ -83,7 +85,28 @@ class CallSheetScene(models.Model):
         return f"{self.scene.scene_number} on {self.call_sheet.shoot_date}"
 
 
-class CastMember(models.Model):
+class CastMemberQuerySet(TrackChangesQuerySet):
+    """Query helpers for cast members."""
+
+    def with_stats(self):
+        """
+        Annotate call sheet and work day statistics in the same query.
+
+        Cancelled bookings and call sheets are not counted.
+        """
+        active = (
+            ~models.Q(callsheetcast__status='cancelled')
+            & ~models.Q(callsheetcast__call_sheet__status='cancelled')
+        )
+        return self.annotate(
+            total_call_sheets=models.Count('callsheetcast__call_sheet', filter=active, distinct=True),
+            total_work_days=models.Count('callsheetcast__call_sheet__shoot_date', filter=active, distinct=True),
+            first_work_day=models.Min('callsheetcast__call_sheet__shoot_date', filter=active),
+            last_work_day=models.Max('callsheetcast__call_sheet__shoot_date', filter=active),
+        )
+
+
+class CastMember(TrackChangesMixin, models.Model):
     """Cast member in a production."""
 
     ROLE_TYPE_CHOICES = [
@@ -106,6 +129,8 @@ class CastMember(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CastMemberQuerySet.as_manager()
+
     class Meta:
         db_table = 'cast_members'
         ordering = ['name']
@@ -138,4 +163,109 @@ class CallSheetCast(models.Model):
         db_table = 'call_sheet_cast'
 
     def __str__(self):
-        return f"{self.cast_member.name} - {self.call_sheet.shoot_date}"
\ No newline at end of file
+        return f"{self.cast_member.name} - {self.call_sheet.shoot_date}"
+
+    def clean(self):
+        """Reject bookings that overlap the cast member's other calls."""
+        from apps.productions.conflicts import validate_cast_booking
+
+        if self.status != 'cancelled' and self.call_sheet_id and self.cast_member_id and self.call_time:
+            validate_cast_booking(self.call_sheet, self.cast_member_id, self.call_time, exclude_id=self.pk)
+
+    def save(self, *args, **kwargs):
+        # Checked on every save that touches the booking, not only through
+        # forms and serializers, so scripts cannot double-book either.
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'call_sheet', 'cast_member', 'call_time', 'status'} & set(update_fields):
+            self.clean()
+        super().save(*args, **kwargs)
+
+
+class CallSheetNotification(models.Model):
+    """
+    Outbox of call sheet emails.
+
+    Rows are written when a call sheet is published and sent later by the
+    send_call_sheet_notifications worker, so publishing never waits on SMTP.
+    """
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    call_sheet = models.ForeignKey(CallSheet, on_delete=models.CASCADE, related_name='notifications')
+    call_sheet_cast = models.ForeignKey(
+        CallSheetCast,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='notifications'
+    )
+    email = models.EmailField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'call_sheet_notifications'
+        ordering = ['next_attempt_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.email} - {self.call_sheet.shoot_date} ({self.status})"
+
+
+def cast_scene_ids(cast_members):
+    """
+    Map cast member id to the set of scene ids they appear in.
+
+    A cast member appears in a scene when the scene's `cast_required`
+    lists their id, name or character name, or when a call sheet booking
+    lists the scene number in `scenes_today`. Runs two queries for any number
+    of cast members.
+    """
+    cast_members = list(cast_members)
+    result = {member.id: set() for member in cast_members}
+    if not cast_members:
+        return result
+
+    by_production = {}
+    for member in cast_members:
+        keys = by_production.setdefault(member.production_id, {})
+        keys.setdefault(member.id, []).append(member.id)
+        for name in (member.name, member.character_name):
+            if name:
+                keys.setdefault(name.strip().lower(), []).append(member.id)
+
+    scene_numbers = {}
+    scenes = Scene.objects.filter(production_id__in=by_production).values_list(
+        'id', 'production_id', 'scene_number', 'cast_required'
+    )
+    for scene_id, production_id, scene_number, cast_required in scenes:
+        scene_numbers[(production_id, scene_number)] = scene_id
+        keys = by_production[production_id]
+        for entry in cast_required or []:
+            if isinstance(entry, dict):
+                entry = entry.get('id') or entry.get('name')
+            key = entry.strip().lower() if isinstance(entry, str) else entry
+            for member_id in keys.get(key, ()):
+                result[member_id].add(scene_id)
+
+    bookings = CallSheetCast.objects.filter(cast_member__in=result).exclude(
+        status='cancelled'
+    ).values_list('cast_member_id', 'cast_member__production_id', 'scenes_today')
+    for member_id, production_id, scenes_today in bookings:
+        for entry in scenes_today or []:
+            scene_id = scene_numbers.get((production_id, str(entry).strip()))
+            if scene_id:
+                result[member_id].add(scene_id)
+
+    return result
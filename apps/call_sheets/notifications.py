@@ -0,0 +1,189 @@
+"""
+Call sheet notification outbox.
+
+Publishing a call sheet only inserts outbox rows. A worker
+(`python manage.py send_call_sheet_notifications`) sends them in batches
+over one SMTP connection, retrying failures with exponential backoff.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import CallSheetCast, CallSheetNotification
+
+logger = logging.getLogger(__name__)
+
+# How long a claimed batch may stay in 'sending' before another worker
+# assumes the first one died and picks the rows up again.
+CLAIM_LEASE = timedelta(minutes=10)
+
+
+def enqueue_call_sheet_notifications(call_sheet):
+    """
+    Queue one notification per cast email on the call sheet.
+
+    Returns the number of notifications queued.
+    """
+    bookings = CallSheetCast.objects.filter(
+        call_sheet=call_sheet
+    ).exclude(
+        status='cancelled'
+    ).exclude(
+        cast_member__contact_email=''
+    ).values_list('id', 'cast_member__contact_email')
+
+    seen = set()
+    notifications = []
+    for booking_id, email in bookings:
+        key = email.strip().lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        notifications.append(CallSheetNotification(
+            call_sheet=call_sheet,
+            call_sheet_cast_id=booking_id,
+            email=email.strip(),
+        ))
+
+    CallSheetNotification.objects.bulk_create(notifications)
+    return len(notifications)
+
+
+def build_message(notification, connection=None):
+    """Build the email for one outbox row."""
+    call_sheet = notification.call_sheet
+    booking = notification.call_sheet_cast
+    production = call_sheet.production.title
+
+    lines = [
+        f"The call sheet for {production} on {call_sheet.shoot_date:%A, %B %d, %Y} has been published.",
+        '',
+        f"General call: {call_sheet.call_time:%H:%M}",
+    ]
+    if booking:
+        lines.insert(0, f"Hi {booking.cast_member.name},")
+        lines.insert(1, '')
+        lines.append(f"Your call: {booking.call_time:%H:%M}")
+        if booking.makeup_time:
+            lines.append(f"Makeup: {booking.makeup_time:%H:%M}")
+        if booking.pickup_location:
+            lines.append(f"Pickup: {booking.pickup_location}")
+    if call_sheet.location_address:
+        lines.append(f"Location: {call_sheet.location_address}")
+    if call_sheet.nearest_hospital:
+        lines.append(f"Nearest hospital: {call_sheet.nearest_hospital}")
+    lines += ['', 'See the full call sheet in ClapLog.', '', 'The ClapLog Team']
+
+    return EmailMultiAlternatives(
+        subject=f"Call sheet: {production} - {call_sheet.shoot_date}",
+        body='\n'.join(lines),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[notification.email],
+        connection=connection,
+    )
+
+
+def claim_batch(batch_size):
+    """
+    Claim due outbox rows for this worker.
+
+    Rows are locked with SKIP LOCKED where the database supports it, so
+    concurrent workers never claim the same notification.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            CallSheetNotification.objects.select_for_update(skip_locked=True).filter(
+                status__in=['pending', 'sending'],
+                next_attempt_at__lte=now,
+            ).order_by('next_attempt_at').values_list('id', flat=True)[:batch_size]
+        )
+        CallSheetNotification.objects.filter(id__in=ids).update(
+            status='sending',
+            next_attempt_at=now + CLAIM_LEASE,
+        )
+
+    return list(
+        CallSheetNotification.objects.filter(id__in=ids).select_related(
+            'call_sheet__production', 'call_sheet_cast__cast_member'
+        )
+    )
+
+
+def retry_delay(attempts):
+    """Exponential backoff: base delay doubled per failed attempt, capped at a day."""
+    base = settings.CALL_SHEET_NOTIFICATION_RETRY_DELAY
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), 24 * 60 * 60))
+
+
+def _reconnect(connection):
+    """Reopen a mail connection, returning None if the server is unreachable."""
+    if connection is None:
+        return None
+    try:
+        connection.close()
+        connection.open()
+        return connection
+    except Exception as e:
+        logger.error(f"Could not reconnect to mail server: {str(e)}")
+        return None
+
+
+def deliver_pending_notifications(batch_size=None, connection=None):
+    """
+    Send one batch of due notifications over a single SMTP connection.
+
+    Returns a (sent, failed) tuple for the batch.
+    """
+    batch_size = batch_size or settings.CALL_SHEET_NOTIFICATION_BATCH_SIZE
+    notifications = claim_batch(batch_size)
+    if not notifications:
+        return 0, 0
+
+    connection = connection or get_connection(timeout=settings.CALL_SHEET_NOTIFICATION_TIMEOUT)
+    sent = failed = 0
+
+    try:
+        connection.open()
+    except Exception as e:
+        logger.error(f"Could not connect to mail server: {str(e)}")
+        connection = None
+
+    for notification in notifications:
+        notification.attempts += 1
+        try:
+            if connection is None:
+                raise ConnectionError('mail server unavailable')
+            if not connection.send_messages([build_message(notification, connection)]):
+                raise RuntimeError('message was not accepted')
+        except Exception as e:
+            failed += 1
+            notification.last_error = str(e)
+            if notification.attempts >= settings.CALL_SHEET_NOTIFICATION_MAX_ATTEMPTS:
+                notification.status = 'failed'
+                logger.error(f"Giving up on call sheet email to {notification.email}: {str(e)}")
+            else:
+                notification.status = 'pending'
+                notification.next_attempt_at = timezone.now() + retry_delay(notification.attempts)
+            # The connection may be broken; reconnect before the next message.
+            connection = _reconnect(connection)
+        else:
+            sent += 1
+            notification.status = 'sent'
+            notification.sent_at = timezone.now()
+            notification.last_error = ''
+
+    if connection is not None:
+        connection.close()
+
+    CallSheetNotification.objects.bulk_update(
+        notifications,
+        ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'],
+    )
+    logger.info(f"Call sheet notifications: {sent} sent, {failed} failed")
+    return sent, failed
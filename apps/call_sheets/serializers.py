@@ -2,8 +2,10 @@
 Call Sheet serializers for ClapLog API.
 """
 
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
-from .models import CallSheet, CallSheetScene, CastMember, CallSheetCast
+from apps.productions.conflicts import validate_cast_booking
+from .models import CallSheet, CallSheetScene, CastMember, CallSheetCast, cast_scene_ids
 from apps.users.serializers import UserListSerializer
 
 
@@ -25,14 +27,31 @@ class CastMemberSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at']
 
+class CastMemberStatsListSerializer(serializers.ListSerializer):
+    """Computes scene counts for the whole page at once."""
+
+    def to_representation(self, data):
+        cast_members = list(data.all() if hasattr(data, 'all') else data)
+        self.child.context['scene_ids'] = cast_scene_ids(cast_members)
+        return super().to_representation(cast_members)
+
+
 class CastMemberDetailSerializer(serializers.ModelSerializer):
-    """Detailed cast member serializer with additional info."""
+    """
+    Cast member serializer with work statistics.
+
+    Expects a queryset from `CastMember.objects.with_stats()`.
+    """
 
     total_scenes = serializers.SerializerMethodField()
-    total_call_sheets = serializers.SerializerMethodField()
+    total_call_sheets = serializers.IntegerField(read_only=True, default=0)
+    total_work_days = serializers.IntegerField(read_only=True, default=0)
+    first_work_day = serializers.DateField(read_only=True, default=None)
+    last_work_day = serializers.DateField(read_only=True, default=None)
 
     class Meta:
         model = CastMember
+        list_serializer_class = CastMemberStatsListSerializer
         fields = [
             'id',
             'production',
@@ -46,15 +65,17 @@ class CastMemberDetailSerializer(serializers.ModelSerializer):
             'updated_at',
             'total_scenes',
             'total_call_sheets',
+            'total_work_days',
+            'first_work_day',
+            'last_work_day',
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
     def get_total_scenes(self, obj):
-        return obj.callsheetcast_set.count()
-
-    def get_total_call_sheets(self, obj):
-        return obj.callsheetcast_set.values('call_sheet').distinct().count()
-
+        scene_ids = self.context.get('scene_ids')
+        if scene_ids is None or obj.id not in scene_ids:
+            scene_ids = cast_scene_ids([obj])
+        return len(scene_ids[obj.id])
 
 
 class CallSheetSceneSerializer(serializers.ModelSerializer):
@@ -104,6 +125,25 @@ class CallSheetCastSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id']
 
+    def validate(self, attrs):
+        """Reject double-booking the cast member on overlapping calls."""
+        instance = self.instance
+        call_sheet = attrs.get('call_sheet', getattr(instance, 'call_sheet', None))
+        cast_member_id = attrs.get('cast_member_id', getattr(instance, 'cast_member_id', None))
+        call_time = attrs.get('call_time', getattr(instance, 'call_time', None))
+        status = attrs.get('status', getattr(instance, 'status', 'scheduled'))
+
+        if call_sheet and cast_member_id and call_time and status != 'cancelled':
+            try:
+                validate_cast_booking(
+                    call_sheet, cast_member_id, call_time,
+                    exclude_id=instance.pk if instance else None
+                )
+            except DjangoValidationError as e:
+                raise serializers.ValidationError({'call_time': e.messages})
+
+        return attrs
+
 
 class CallSheetSerializer(serializers.ModelSerializer):
     """Main call sheet serializer."""
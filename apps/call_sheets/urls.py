@@ -4,7 +4,7 @@ Call Sheet API URLs.
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import CallSheetViewSet, CastMemberViewSet
+from .views import CallSheetViewSet, CastMemberViewSet, calendar_feed
 
 router = DefaultRouter()
 router.register(r'call-sheets', CallSheetViewSet, basename='call-sheet')
@@ -12,4 +12,5 @@ router.register(r'cast-members', CastMemberViewSet, basename='cast-member')
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('calendar/<str:token>.ics', calendar_feed, name='calendar-feed'),
 ]
\ No newline at end of file
@@ -1,7 +1,8 @@
 """
 Call Sheet API views.
 """
-from django.db import models
+from django.db import models, transaction
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, Http404
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -9,13 +10,16 @@ from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
 from .models import CallSheet, CallSheetScene, CastMember, CallSheetCast
+from .notifications import enqueue_call_sheet_notifications
 from .serializers import (
     CallSheetSerializer,
     CallSheetListSerializer,
     CallSheetSceneSerializer,
     CastMemberSerializer,
+    CastMemberDetailSerializer,
     CallSheetCastSerializer
 )
+from apps.productions.models import Production
 
 
 class CallSheetViewSet(viewsets.ModelViewSet):
@@ -57,11 +61,31 @@ class CallSheetViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        call_sheet.status = 'published'
-        call_sheet.published_at = timezone.now()
-        call_sheet.save()
+        with transaction.atomic():
+            call_sheet.status = 'published'
+            call_sheet.published_at = timezone.now()
+            call_sheet.save()
+            queued = enqueue_call_sheet_notifications(call_sheet)
 
-        return Response({'message': 'Call sheet published successfully'})
+        return Response({
+            'message': 'Call sheet published successfully',
+            'notifications_queued': queued,
+        })
+
+    @action(detail=True, methods=['get'])
+    def pdf(self, request, pk=None):
+        """Download the call sheet as PDF (cached by content)."""
+        from apps.exports.call_sheet_pdf import render_call_sheet_pdf
+
+        call_sheet = self.get_object()
+        path = render_call_sheet_pdf(call_sheet)
+
+        return FileResponse(
+            open(path, 'rb'),
+            as_attachment=True,
+            filename=f"call_sheet_{call_sheet.shoot_date}.pdf",
+            content_type='application/pdf'
+        )
 
     @action(detail=True, methods=['post'])
     def add_scene(self, request, pk=None):
@@ -93,42 +117,20 @@ class CallSheetViewSet(viewsets.ModelViewSet):
 
 
 class CastMemberViewSet(viewsets.ModelViewSet):
-    """API endpoint for cast members."""
-
-    queryset = CastMember.objects.all()
-    serializer_class = CastMemberSerializer
-    permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    filterset_fields = ['production', 'role_type']
-    search_fields = ['name', 'character_name']
-
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        user = self.request.user
-
-        queryset = queryset.filter(
-            models.Q(production__created_by=user) |
-            models.Q(production__team_members__user=user)
-        ).distinct()
-
-        return queryset
-
-
-from .serializers import CastMemberDetailSerializer
-
-
-class CastMemberViewSet(viewsets.ModelViewSet):
-    """API endpoint for cast members."""
+    """
+    API endpoint for cast members.
+    List and detail responses include scene, call sheet and work day stats.
+    """
 
     queryset = CastMember.objects.all()
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['production', 'role_type']
     search_fields = ['name', 'character_name']
-    ordering_fields = ['name', 'created_at']
+    ordering_fields = ['name', 'created_at', 'first_work_day', 'total_work_days']
 
     def get_serializer_class(self):
-        if self.action == 'retrieve':
+        if self.action in ['list', 'retrieve']:
             return CastMemberDetailSerializer
         return CastMemberSerializer
 
@@ -136,9 +138,52 @@ class CastMemberViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
         user = self.request.user
 
-        queryset = queryset.filter(
-            models.Q(production__created_by=user) |
-            models.Q(production__team_members__user=user)
-        ).distinct()
+        # Scope with a subquery rather than joins so the stats
+        # aggregates are not multiplied by team membership rows.
+        productions = Production.objects.filter(
+            models.Q(created_by=user) |
+            models.Q(team_members__user=user)
+        ).values('id')
+        queryset = queryset.filter(production__in=productions)
+
+        if self.action in ['list', 'retrieve']:
+            queryset = queryset.with_stats().order_by('name', 'id')
+
+        return queryset
+
 
-        return queryset
\ No newline at end of file
+def calendar_feed(request, token):
+    """
+    GET /api/calendar/{token}.ics
+    Public iCalendar feed; the signed token from
+    /api/productions/{id}/calendar_links/ grants access.
+    """
+    from apps.productions.signals import get_data_version
+    from .ical import read_feed_token, feed_etag, get_feed
+
+    feed = read_feed_token(token)
+    if feed is None:
+        raise Http404('Unknown calendar feed')
+    kind, object_id = feed
+
+    if kind == 'production':
+        production_id = object_id
+    else:
+        production_id = CastMember.objects.filter(id=object_id).values_list('production_id', flat=True).first()
+    version = get_data_version(production_id) if production_id else None
+    if version is None:
+        raise Http404('Unknown calendar feed')
+
+    etag = feed_etag(kind, object_id, version)
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+    else:
+        text = get_feed(kind, object_id, version)
+        if text is None:
+            raise Http404('Unknown calendar feed')
+        response = HttpResponse(text, content_type='text/calendar; charset=utf-8')
+        response['Content-Disposition'] = f'inline; filename="{kind}-{object_id}.ics"'
+
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, max-age=300'
+    return response
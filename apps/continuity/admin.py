@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ContinuityNote
+from .models import ContinuityNote, ContinuityPhoto
 
 @admin.register(ContinuityNote)
 class ContinuityNoteAdmin(admin.ModelAdmin):
@@ -14,3 +14,19 @@ class ContinuityNoteAdmin(admin.ModelAdmin):
     list_filter = ['category', 'status', 'severity']
     search_fields = ('description', 'warnings', 'actor_character')
     ordering = ('-created_at',)
+
+
+@admin.register(ContinuityPhoto)
+class ContinuityPhotoAdmin(admin.ModelAdmin):
+    list_display = (
+        'original_name',
+        'note',
+        'content_type',
+        'size',
+        'thumbnail_status',
+        'created_at',
+    )
+    list_filter = ['thumbnail_status', 'content_type']
+    search_fields = ('original_name', 'content_hash')
+    readonly_fields = ('content_hash', 'original_path', 'thumbnails')
+    ordering = ('-created_at',)
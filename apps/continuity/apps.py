@@ -5,3 +5,6 @@ class ContinuityConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.continuity"
     verbose_name = "Continuity"
+
+    def ready(self):
+        from . import signals  # noqa: F401
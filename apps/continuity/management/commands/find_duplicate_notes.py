@@ -0,0 +1,61 @@
+"""
+Find clusters of near-duplicate continuity notes.
+
+Usage:
+    python manage.py find_duplicate_notes --rebuild        # index existing notes first
+    python manage.py find_duplicate_notes --production 3 --threshold 0.6
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.continuity.models import ContinuityNote
+from apps.continuity.similarity import find_clusters, index_notes
+
+
+class Command(BaseCommand):
+    help = 'List clusters of continuity notes that likely describe the same issue.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--production', type=int, default=None, help='Limit to one production')
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=settings.CONTINUITY_DUPLICATE_THRESHOLD,
+            help='Minimum estimated similarity (0-1)'
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Refresh note signatures first (needed for notes saved before indexing existed)'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Notes indexed per batch')
+
+    def handle(self, *args, **options):
+        notes = ContinuityNote.objects.select_related('scene').order_by('id')
+        if options['production'] is not None:
+            notes = notes.filter(scene__production_id=options['production'])
+
+        if options['rebuild']:
+            batch = []
+            for note in notes.iterator(chunk_size=options['batch_size']):
+                batch.append(note)
+                if len(batch) >= options['batch_size']:
+                    index_notes(batch)
+                    batch = []
+            index_notes(batch)
+
+        clusters = find_clusters(options['production'], options['threshold'])
+        descriptions = dict(
+            ContinuityNote.objects.filter(
+                id__in=[note_id for cluster in clusters for note_id in cluster]
+            ).values_list('id', 'description')
+        )
+
+        for number, cluster in enumerate(clusters, 1):
+            self.stdout.write(f"Cluster {number} ({len(cluster)} notes)")
+            for note_id in cluster:
+                self.stdout.write(f"  #{note_id}: {descriptions[note_id][:80]}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Found {len(clusters)} clusters covering {sum(len(c) for c in clusters)} notes"
+        ))
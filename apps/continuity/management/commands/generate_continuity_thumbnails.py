@@ -0,0 +1,47 @@
+"""
+Build missing continuity photo thumbnails.
+
+Uploads queue their thumbnails in the web process; this picks up any that
+never finished (e.g. the server restarted) or failed.
+
+Usage:
+    python manage.py generate_continuity_thumbnails
+    python manage.py generate_continuity_thumbnails --all --workers 8
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.continuity.models import ContinuityPhoto
+from apps.continuity.photos import build_thumbnails
+
+
+class Command(BaseCommand):
+    help = 'Generate thumbnails for continuity photos that are pending or failed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Check every photo, e.g. after adding a size to CONTINUITY_THUMBNAIL_SIZES'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.CONTINUITY_THUMBNAIL_WORKERS,
+            help='Number of worker threads'
+        )
+
+    def handle(self, *args, **options):
+        photos = ContinuityPhoto.objects.all()
+        if not options['all']:
+            photos = photos.exclude(thumbnail_status='ready')
+        ids = list(photos.values_list('id', flat=True))
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            list(pool.map(build_thumbnails, ids))
+
+        failed = ContinuityPhoto.objects.filter(id__in=ids, thumbnail_status='failed').count()
+        self.stdout.write(self.style.SUCCESS(f"Processed {len(ids)} photos ({failed} failed)"))
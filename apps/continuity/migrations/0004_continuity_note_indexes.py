@@ -0,0 +1,33 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("continuity", "0003_remove_continuitynote_created_by_and_more"),
+        ("scenes", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="continuitynote",
+            index=models.Index(
+                fields=["scene", "status"], name="continuity__scene_i_ff8f0b_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="continuitynote",
+            index=models.Index(
+                fields=["category", "severity"], name="continuity__categor_0a1a9f_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="continuitynote",
+            index=models.Index(
+                fields=["actor_character", "scene"],
+                name="continuity__actor_c_301ee5_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("continuity", "0004_continuity_note_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContinuityPhoto",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("content_hash", models.CharField(db_index=True, max_length=64)),
+                ("original_path", models.CharField(max_length=255)),
+                ("original_name", models.CharField(blank=True, max_length=255)),
+                ("content_type", models.CharField(max_length=50)),
+                ("size", models.PositiveBigIntegerField()),
+                ("width", models.PositiveIntegerField()),
+                ("height", models.PositiveIntegerField()),
+                ("thumbnails", models.JSONField(blank=True, default=dict)),
+                (
+                    "thumbnail_status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("ready", "Ready"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "note",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="photos",
+                        to="continuity.continuitynote",
+                    ),
+                ),
+                (
+                    "uploaded_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="continuity_photos",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "continuity_photos",
+                "ordering": ["created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["thumbnail_status"],
+                        name="continuity__thumbna_0ada33_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="continuityphoto",
+            constraint=models.UniqueConstraint(
+                fields=("note", "content_hash"), name="unique_photo_per_note"
+            ),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("continuity", "0005_continuity_photo"),
+        ("productions", "0003_production_data_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContinuityNoteSignature",
+            fields=[
+                (
+                    "note",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="signature",
+                        serialize=False,
+                        to="continuity.continuitynote",
+                    ),
+                ),
+                ("text_hash", models.CharField(max_length=32)),
+                ("signature", models.JSONField()),
+                (
+                    "production",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="productions.production",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "continuity_note_signatures",
+            },
+        ),
+        migrations.CreateModel(
+            name="ContinuityNoteBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("band", models.PositiveSmallIntegerField()),
+                ("bucket", models.BigIntegerField()),
+                (
+                    "production",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="productions.production",
+                    ),
+                ),
+                (
+                    "signature",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="buckets",
+                        to="continuity.continuitynotesignature",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "continuity_note_buckets",
+                "indexes": [
+                    models.Index(
+                        fields=["production", "band", "bucket"],
+                        name="continuity__product_b1012f_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,11 +1,13 @@
 """
 Continuity tracking models.
 """
+from django.conf import settings
 from django.db import models
 from apps.scenes.models import Scene
+from apps.core.mixins import TrackChangesMixin
 
 
-class ContinuityNote(models.Model):
+class ContinuityNote(TrackChangesMixin, models.Model):
     """Continuity notes for tracking details across scenes."""
 
     CATEGORY_CHOICES = [
@@ -52,6 +54,119 @@ class ContinuityNote(models.Model):
     class Meta:
         db_table = 'continuity_notes'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['scene', 'status']),
+            models.Index(fields=['category', 'severity']),
+            models.Index(fields=['actor_character', 'scene']),
+        ]
 
     def __str__(self):
-        return f"{self.category} - Scene {self.scene.scene_number}"
\ No newline at end of file
+        return f"{self.category} - Scene {self.scene.scene_number}"
+
+
+class ContinuityPhoto(models.Model):
+    """
+    Reference photo attached to a continuity note.
+
+    Files are stored once per content hash, so the same image attached to
+    several notes shares one original and one set of thumbnails.
+    """
+
+    THUMBNAIL_STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+
+    note = models.ForeignKey(
+        ContinuityNote,
+        on_delete=models.CASCADE,
+        related_name='photos',
+    )
+    content_hash = models.CharField(max_length=64, db_index=True)
+    original_path = models.CharField(max_length=255)
+    original_name = models.CharField(max_length=255, blank=True)
+    content_type = models.CharField(max_length=50)
+    size = models.PositiveBigIntegerField()
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+
+    # Longest edge in pixels (as a string) -> path relative to MEDIA_ROOT
+    thumbnails = models.JSONField(default=dict, blank=True)
+    thumbnail_status = models.CharField(
+        max_length=20,
+        choices=THUMBNAIL_STATUS_CHOICES,
+        default='pending',
+    )
+
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='continuity_photos',
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'continuity_photos'
+        ordering = ['created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['note', 'content_hash'], name='unique_photo_per_note'),
+        ]
+        indexes = [
+            models.Index(fields=['thumbnail_status']),
+        ]
+
+    def __str__(self):
+        return f"{self.original_name or self.content_hash[:12]} ({self.note_id})"
+
+
+class ContinuityNoteSignature(models.Model):
+    """MinHash signature of a note's text, used to spot near-duplicates."""
+
+    note = models.OneToOneField(
+        ContinuityNote,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='signature',
+    )
+    production = models.ForeignKey(
+        'productions.Production',
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    text_hash = models.CharField(max_length=32)
+    signature = models.JSONField()
+
+    class Meta:
+        db_table = 'continuity_note_signatures'
+
+    def __str__(self):
+        return f"Signature of note {self.note_id}"
+
+
+class ContinuityNoteBucket(models.Model):
+    """One LSH band of a signature; notes sharing a bucket are candidates."""
+
+    signature = models.ForeignKey(
+        ContinuityNoteSignature,
+        on_delete=models.CASCADE,
+        related_name='buckets',
+    )
+    production = models.ForeignKey(
+        'productions.Production',
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        db_table = 'continuity_note_buckets'
+        indexes = [
+            models.Index(fields=['production', 'band', 'bucket']),
+        ]
+
+    def __str__(self):
+        return f"Note {self.signature_id} band {self.band}"
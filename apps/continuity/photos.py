@@ -0,0 +1,204 @@
+"""
+Storage and thumbnails for continuity reference photos.
+
+Uploads are streamed to disk in chunks while being hashed, and stored
+under CONTINUITY_PHOTO_ROOT by their SHA-256, so re-uploading an image
+costs no extra space. Thumbnails are built after the upload's
+transaction commits, in a small thread pool (Pillow releases the GIL
+while decoding and resizing), and are also keyed by content hash.
+`python manage.py generate_continuity_thumbnails` rebuilds any that are
+missing, e.g. after a restart dropped queued work.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+# Pillow format -> (file extension, content type)
+ALLOWED_FORMATS = {
+    'JPEG': ('jpg', 'image/jpeg'),
+    'PNG': ('png', 'image/png'),
+    'WEBP': ('webp', 'image/webp'),
+    'GIF': ('gif', 'image/gif'),
+}
+
+_executor = None
+
+
+class InvalidPhoto(ValueError):
+    """The upload is not an image we can store."""
+
+
+def _relative(path):
+    return Path(path).relative_to(settings.MEDIA_ROOT).as_posix()
+
+
+def media_path(relative_path):
+    """Absolute path of a file stored relative to MEDIA_ROOT."""
+    return Path(settings.MEDIA_ROOT) / relative_path
+
+
+def original_path(content_hash, extension):
+    return Path(settings.CONTINUITY_PHOTO_ROOT) / 'originals' / content_hash[:2] / f"{content_hash}.{extension}"
+
+
+def thumbnail_path(content_hash, size):
+    return Path(settings.CONTINUITY_PHOTO_ROOT) / 'thumbnails' / str(size) / content_hash[:2] / f"{content_hash}.jpg"
+
+
+def store_upload(uploaded_file):
+    """
+    Stream an uploaded image into content-addressed storage.
+
+    Returns a dict of ContinuityPhoto field values. Raises InvalidPhoto if
+    the file is too large or is not a supported image.
+    """
+    if uploaded_file.size > settings.CONTINUITY_PHOTO_MAX_SIZE:
+        raise InvalidPhoto(
+            f"Photos can be at most {settings.CONTINUITY_PHOTO_MAX_SIZE // (1024 * 1024)} MB."
+        )
+
+    tmp_dir = Path(settings.CONTINUITY_PHOTO_ROOT) / 'tmp'
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            for chunk in uploaded_file.chunks():
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+
+        try:
+            with Image.open(tmp_path) as image:
+                image_format, (width, height) = image.format, image.size
+        except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+            raise InvalidPhoto('Upload a JPEG, PNG, WebP or GIF image.')
+        if image_format not in ALLOWED_FORMATS:
+            raise InvalidPhoto('Upload a JPEG, PNG, WebP or GIF image.')
+
+        content_hash = digest.hexdigest()
+        extension, content_type = ALLOWED_FORMATS[image_format]
+        final_path = original_path(content_hash, extension)
+        if final_path.exists():
+            os.unlink(tmp_path)
+        else:
+            final_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, final_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    return {
+        'content_hash': content_hash,
+        'original_path': _relative(final_path),
+        'original_name': os.path.basename(uploaded_file.name or '')[:255],
+        'content_type': content_type,
+        'size': size,
+        'width': width,
+        'height': height,
+    }
+
+
+def generate_thumbnails(content_hash, source, sizes=None):
+    """
+    Write JPEG thumbnails of an original for each size (longest edge).
+
+    Sizes whose thumbnail already exists are skipped. Each size is scaled
+    down from the previous one, largest first, so the original is decoded
+    only once. Returns {str(size): path relative to MEDIA_ROOT}.
+    """
+    sizes = sorted(sizes or settings.CONTINUITY_THUMBNAIL_SIZES, reverse=True)
+    paths = {size: thumbnail_path(content_hash, size) for size in sizes}
+    missing = [size for size in sizes if not paths[size].exists()]
+
+    if missing:
+        with Image.open(source) as image:
+            # JPEG can decode straight to a reduced scale.
+            image.draft('RGB', (missing[0], missing[0]))
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ('RGB', 'L'):
+                image = image.convert('RGBA')
+                background = Image.new('RGB', image.size, 'white')
+                background.paste(image, mask=image.getchannel('A'))
+                image = background
+
+            for size in missing:
+                image.thumbnail((size, size), Image.Resampling.LANCZOS)
+                path = paths[size]
+                path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'wb') as out:
+                        image.save(out, 'JPEG', quality=82, optimize=True, progressive=True)
+                    os.replace(tmp_path, path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+
+    return {str(size): _relative(paths[size]) for size in sorted(sizes)}
+
+
+def build_thumbnails(photo_id):
+    """Generate thumbnails for one photo and record the result."""
+    from .models import ContinuityPhoto
+
+    close_old_connections()
+    try:
+        photo = ContinuityPhoto.objects.filter(id=photo_id).first()
+        if photo is None:
+            return
+        try:
+            thumbnails = generate_thumbnails(photo.content_hash, media_path(photo.original_path))
+        except Exception as e:
+            logger.error(f"Thumbnail generation failed for continuity photo {photo_id}: {str(e)}")
+            ContinuityPhoto.objects.filter(id=photo_id).update(thumbnail_status='failed')
+        else:
+            ContinuityPhoto.objects.filter(id=photo_id).update(
+                thumbnails=thumbnails,
+                thumbnail_status='ready',
+            )
+    finally:
+        close_old_connections()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.CONTINUITY_THUMBNAIL_WORKERS,
+            thread_name_prefix='continuity-thumbnails',
+        )
+    return _executor
+
+
+def schedule_thumbnails(photo):
+    """Queue thumbnail generation once the current transaction commits."""
+    transaction.on_commit(lambda: _get_executor().submit(build_thumbnails, photo.id))
+
+
+def delete_unreferenced_files(content_hash, original):
+    """Remove an original and its thumbnails once no photo uses the hash."""
+    from .models import ContinuityPhoto
+
+    if ContinuityPhoto.objects.filter(content_hash=content_hash).exists():
+        return
+    paths = [media_path(original)]
+    paths += [thumbnail_path(content_hash, size) for size in settings.CONTINUITY_THUMBNAIL_SIZES]
+    for path in paths:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
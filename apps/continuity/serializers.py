@@ -1,14 +1,50 @@
 """
 Continuity Notes serializers.
 """
+from django.urls import reverse
 from rest_framework import serializers
-from .models import ContinuityNote
+from .models import ContinuityNote, ContinuityPhoto
+
+
+class ContinuityPhotoSerializer(serializers.ModelSerializer):
+    """Serializer for continuity reference photos."""
+
+    thumbnail_sizes = serializers.SerializerMethodField()
+    image_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ContinuityPhoto
+        fields = [
+            'id',
+            'note',
+            'content_hash',
+            'original_name',
+            'content_type',
+            'size',
+            'width',
+            'height',
+            'thumbnail_status',
+            'thumbnail_sizes',
+            'image_url',
+            'created_at'
+        ]
+        read_only_fields = fields
+
+    def get_thumbnail_sizes(self, obj):
+        return sorted(int(size) for size in obj.thumbnails)
+
+    def get_image_url(self, obj):
+        """Full-size image; add ?size=N for a thumbnail."""
+        url = reverse('continuity-photo-image', args=[obj.id])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
 
 
 class ContinuityNoteSerializer(serializers.ModelSerializer):
     """Serializer for continuity notes."""
 
     scene_number = serializers.CharField(source='scene.scene_number', read_only=True)
+    photos = ContinuityPhotoSerializer(many=True, read_only=True)
 
     class Meta:
         model = ContinuityNote
@@ -22,13 +58,45 @@ class ContinuityNoteSerializer(serializers.ModelSerializer):
             'description',
             'actor_character',
             'warnings',
+            'photos',
             'created_at',
             'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'scene_number']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'scene_number', 'photos']
 
     def validate_description(self, value):
         """Ensure description is not empty."""
         if not value or not value.strip():
             raise serializers.ValidationError("Description cannot be empty.")
-        return value
\ No newline at end of file
+        return value
+
+
+class ContinuityTimelineSerializer(ContinuityNoteSerializer):
+    """Continuity note with the scene's position in the script."""
+
+    scene_name = serializers.CharField(source='scene.scene_name', read_only=True)
+    sequence_order = serializers.IntegerField(source='scene.sequence_order', read_only=True)
+
+    class Meta(ContinuityNoteSerializer.Meta):
+        fields = ContinuityNoteSerializer.Meta.fields + ['scene_name', 'sequence_order']
+
+
+class ContinuityDuplicateSerializer(serializers.ModelSerializer):
+    """A likely duplicate of another note, with its estimated similarity."""
+
+    scene_number = serializers.CharField(source='scene.scene_number', read_only=True)
+    similarity = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = ContinuityNote
+        fields = [
+            'id',
+            'scene',
+            'scene_number',
+            'category',
+            'severity',
+            'status',
+            'description',
+            'actor_character',
+            'similarity'
+        ]
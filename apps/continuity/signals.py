@@ -0,0 +1,31 @@
+"""
+Continuity signal handlers.
+
+Photo files are shared between photos with the same content hash, so they
+are only removed once the last photo using them is gone. Note signatures
+for duplicate detection are refreshed whenever a note is saved.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ContinuityNote, ContinuityPhoto
+from .photos import delete_unreferenced_files
+from .similarity import index_notes
+
+INDEXED_FIELDS = {'description', 'warnings', 'scene', 'scene_id'}
+
+
+@receiver(post_delete, sender=ContinuityPhoto)
+def delete_photo_files(sender, instance, **kwargs):
+    transaction.on_commit(
+        lambda: delete_unreferenced_files(instance.content_hash, instance.original_path)
+    )
+
+
+@receiver(post_save, sender=ContinuityNote)
+def index_note(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not INDEXED_FIELDS.intersection(update_fields):
+        return
+    index_notes([instance])
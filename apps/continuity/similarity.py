@@ -0,0 +1,240 @@
+"""
+Near-duplicate detection for continuity notes.
+
+Each note's description and warnings are normalised and cut into
+character shingles. A MinHash signature of the shingles estimates the
+Jaccard similarity between two notes. The signature is split into LSH
+bands, and the bands are stored as indexed bucket rows per production,
+so the likely duplicates of a note come from one indexed lookup rather
+than a comparison against every note.
+
+Signatures are kept current by a post_save signal. For existing data,
+`python manage.py find_duplicate_notes --rebuild` indexes and clusters
+everything.
+"""
+
+import hashlib
+import random
+import re
+import zlib
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .models import ContinuityNote, ContinuityNoteBucket, ContinuityNoteSignature
+
+
+SHINGLE_SIZE = 5
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS  # candidate threshold ~ (1 / BANDS) ** (1 / ROWS) = 0.5
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240611)
+PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def note_text(note):
+    return f"{note.description}\n{note.warnings}"
+
+
+def normalize(text):
+    return _NON_WORD.sub(' ', (text or '').lower()).strip()
+
+
+def shingles(text):
+    """Set of hashed character shingles of normalised text."""
+    text = normalize(text)
+    if not text:
+        return set()
+    if len(text) <= SHINGLE_SIZE:
+        return {zlib.crc32(text.encode())}
+    return {
+        zlib.crc32(text[i:i + SHINGLE_SIZE].encode())
+        for i in range(len(text) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash(shingle_hashes):
+    """MinHash signature (NUM_PERM ints) of a non-empty set of shingle hashes."""
+    return [
+        min((a * x + b) % _PRIME for x in shingle_hashes)
+        for a, b in PERMUTATIONS
+    ]
+
+
+def band_buckets(signature):
+    """One signed 64-bit bucket id per band."""
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(repr(rows).encode(), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'big', signed=True))
+    return buckets
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def _production_id(note):
+    return note.scene.production_id if note.scene_id else None
+
+
+def index_notes(notes):
+    """
+    Bring the stored signatures of these notes up to date.
+
+    Notes whose text and production are unchanged are skipped. Notes
+    without a scene (and so without a production) are dropped from the
+    index. Pass notes with `scene` selected to avoid a query per note.
+    """
+    notes = list(notes)
+    if not notes:
+        return
+
+    stored = {
+        note_id: (text_hash, production_id)
+        for note_id, text_hash, production_id in ContinuityNoteSignature.objects.filter(
+            note_id__in=[note.id for note in notes]
+        ).values_list('note_id', 'text_hash', 'production_id')
+    }
+
+    stale = []
+    signatures = []
+    buckets = []
+    for note in notes:
+        text = note_text(note)
+        text_hash = hashlib.md5(normalize(text).encode()).hexdigest()
+        production_id = _production_id(note)
+        if stored.get(note.id) == (text_hash, production_id):
+            continue
+        if note.id in stored:
+            stale.append(note.id)
+
+        hashes = shingles(text)
+        if production_id is None or not hashes:
+            continue
+        signature = minhash(hashes)
+        signatures.append(ContinuityNoteSignature(
+            note_id=note.id,
+            production_id=production_id,
+            text_hash=text_hash,
+            signature=signature,
+        ))
+        buckets += [
+            ContinuityNoteBucket(signature_id=note.id, production_id=production_id, band=band, bucket=bucket)
+            for band, bucket in enumerate(band_buckets(signature))
+        ]
+
+    with transaction.atomic():
+        if stale:
+            ContinuityNoteSignature.objects.filter(note_id__in=stale).delete()
+        ContinuityNoteSignature.objects.bulk_create(signatures)
+        ContinuityNoteBucket.objects.bulk_create(buckets)
+
+
+def find_duplicates(note, threshold=None):
+    """
+    Likely duplicates of an indexed note within its production.
+
+    Returns a list of (note, similarity) with the most similar first.
+    Archived notes are ignored.
+    """
+    threshold = settings.CONTINUITY_DUPLICATE_THRESHOLD if threshold is None else threshold
+    own = ContinuityNoteSignature.objects.filter(note_id=note.id).first()
+    if own is None:
+        return []
+
+    band_match = Q()
+    for band, bucket in enumerate(band_buckets(own.signature)):
+        band_match |= Q(band=band, bucket=bucket)
+    candidates = ContinuityNoteSignature.objects.filter(
+        production_id=own.production_id,
+        note_id__in=ContinuityNoteBucket.objects.filter(
+            band_match, production_id=own.production_id
+        ).values('signature_id'),
+    ).exclude(note_id=note.id).values_list('note_id', 'signature')
+
+    scores = {}
+    for note_id, signature in candidates:
+        score = similarity(own.signature, signature)
+        if score >= threshold:
+            scores[note_id] = score
+    if not scores:
+        return []
+
+    matches = ContinuityNote.objects.filter(
+        id__in=scores
+    ).exclude(status='archived').select_related('scene')
+    return sorted(
+        ((match, scores[match.id]) for match in matches),
+        key=lambda pair: (-pair[1], pair[0].id),
+    )
+
+
+def find_clusters(production_id=None, threshold=None):
+    """
+    Group indexed notes into clusters of likely duplicates.
+
+    Notes sharing a bucket are compared by signature. Pairs above the
+    threshold are merged with union-find, so A~B and B~C put A, B and C
+    in one cluster. Returns a list of sorted note id lists, largest
+    first, ignoring singletons.
+    """
+    threshold = settings.CONTINUITY_DUPLICATE_THRESHOLD if threshold is None else threshold
+    signatures = ContinuityNoteSignature.objects.all()
+    buckets = ContinuityNoteBucket.objects.all()
+    if production_id is not None:
+        signatures = signatures.filter(production_id=production_id)
+        buckets = buckets.filter(production_id=production_id)
+    signatures = dict(signatures.values_list('note_id', 'signature'))
+
+    parent = {}
+
+    def find(x):
+        while parent.get(x, x) != x:
+            parent[x] = parent.get(parent[x], parent[x])
+            x = parent[x]
+        return x
+
+    def union(a, b):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    compared = set()
+    group_key, group = None, []
+    rows = buckets.order_by('production_id', 'band', 'bucket').values_list(
+        'production_id', 'band', 'bucket', 'signature_id'
+    ).iterator(chunk_size=5000)
+
+    def compare(group):
+        for i, a in enumerate(group):
+            for b in group[i + 1:]:
+                pair = (a, b) if a < b else (b, a)
+                if pair in compared or find(a) == find(b):
+                    continue
+                compared.add(pair)
+                if similarity(signatures[a], signatures[b]) >= threshold:
+                    union(a, b)
+
+    for production, band, bucket, note_id in rows:
+        key = (production, band, bucket)
+        if key != group_key:
+            compare(group)
+            group_key, group = key, []
+        group.append(note_id)
+    compare(group)
+
+    clusters = {}
+    for note_id in signatures:
+        clusters.setdefault(find(note_id), []).append(note_id)
+    return sorted(
+        (sorted(members) for members in clusters.values() if len(members) > 1),
+        key=lambda members: (-len(members), members[0]),
+    )
@@ -4,10 +4,11 @@ Continuity API URLs.
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ContinuityNoteViewSet
+from .views import ContinuityNoteViewSet, ContinuityPhotoViewSet
 
 router = DefaultRouter()
 router.register(r'continuity', ContinuityNoteViewSet, basename='continuity-note')
+router.register(r'continuity-photos', ContinuityPhotoViewSet, basename='continuity-photo')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,9 +1,23 @@
-from rest_framework import viewsets
+from django.db import IntegrityError, transaction
+from django.http import Http404
+from rest_framework import mixins, viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
-from .models import ContinuityNote
-from .serializers import ContinuityNoteSerializer
+from apps.core.utils import ranged_file_response, user_production_ids
+from .models import ContinuityNote, ContinuityPhoto
+from .photos import InvalidPhoto, media_path, schedule_thumbnails, store_upload
+from .similarity import find_duplicates
+from .serializers import (
+    ContinuityDuplicateSerializer,
+    ContinuityNoteSerializer,
+    ContinuityPhotoSerializer,
+    ContinuityTimelineSerializer,
+)
 
 
 class ContinuityNoteViewSet(viewsets.ModelViewSet):
@@ -19,19 +33,176 @@ class ContinuityNoteViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        """Filter by production if specified."""
-        queryset = super().get_queryset()
-        production_id = self.request.query_params.get('production')
+        """Notes from the user's productions, optionally one production."""
+        queryset = super().get_queryset().filter(
+            scene__production__in=user_production_ids(self.request.user)
+        ).select_related('scene').prefetch_related('photos')
 
+        production_id = self.request.query_params.get('production')
         if production_id:
+            try:
+                production_id = int(production_id)
+            except ValueError:
+                raise ValidationError({'error': 'production must be an integer'})
             queryset = queryset.filter(scene__production_id=production_id)
 
         return queryset
 
+    def _duplicates(self, note):
+        matches = []
+        for match, score in find_duplicates(note):
+            match.similarity = round(score, 3)
+            matches.append(match)
+        return ContinuityDuplicateSerializer(matches, many=True).data
+
     def create(self, request, *args, **kwargs):
-        """Override create to add better error logging."""
-        print("=" * 50)
-        print("CONTINUITY NOTE CREATE REQUEST")
-        print("Data received:", request.data)
-        print("=" * 50)
-        return super().create(request, *args, **kwargs)
+        """Create a note and report existing notes it likely duplicates."""
+        response = super().create(request, *args, **kwargs)
+        note = ContinuityNote(id=response.data['id'])
+        response.data['possible_duplicates'] = self._duplicates(note)
+        return response
+
+    @action(detail=True, methods=['get'])
+    def duplicates(self, request, pk=None):
+        """
+        GET /api/continuity/{id}/duplicates/
+        Notes in the same production that likely describe the same issue.
+        """
+        return Response(self._duplicates(self.get_object()))
+
+    @action(detail=False, methods=['get'])
+    def timeline(self, request):
+        """
+        GET /api/continuity/timeline/?character=NAME[&production=ID]
+        One character's notes in script order.
+        """
+        character = request.query_params.get('character', '').strip()
+        if not character:
+            return Response(
+                {'error': 'character is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        notes = self.get_queryset().filter(
+            actor_character=character
+        ).order_by('scene__sequence_order', 'scene__scene_number', 'created_at')
+
+        serializer = ContinuityTimelineSerializer(notes, many=True)
+        return Response({
+            'character': character,
+            'count': len(serializer.data),
+            'notes': serializer.data,
+        })
+
+    @action(detail=True, methods=['get', 'post'], parser_classes=[MultiPartParser])
+    def photos(self, request, pk=None):
+        """
+        GET  /api/continuity/{id}/photos/  - the note's reference photos
+        POST /api/continuity/{id}/photos/  - attach a photo (multipart field "image")
+        """
+        note = self.get_object()
+        if request.method == 'GET':
+            serializer = ContinuityPhotoSerializer(
+                note.photos.all(), many=True, context={'request': request}
+            )
+            return Response(serializer.data)
+
+        upload = request.FILES.get('image')
+        if upload is None:
+            return Response(
+                {'error': 'image file is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            fields = store_upload(upload)
+        except InvalidPhoto as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        existing = note.photos.filter(content_hash=fields['content_hash']).first()
+        if existing:
+            serializer = ContinuityPhotoSerializer(existing, context={'request': request})
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        # Same image elsewhere already has thumbnails: reuse them.
+        done = ContinuityPhoto.objects.filter(
+            content_hash=fields['content_hash'], thumbnail_status='ready'
+        ).values_list('thumbnails', flat=True).first()
+
+        try:
+            with transaction.atomic():
+                photo = ContinuityPhoto.objects.create(
+                    note=note,
+                    uploaded_by=request.user,
+                    thumbnails=done or {},
+                    thumbnail_status='ready' if done else 'pending',
+                    **fields
+                )
+                if not done:
+                    schedule_thumbnails(photo)
+        except IntegrityError:
+            # A concurrent upload of the same image won the race.
+            photo = note.photos.get(content_hash=fields['content_hash'])
+            serializer = ContinuityPhotoSerializer(photo, context={'request': request})
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        serializer = ContinuityPhotoSerializer(photo, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class ContinuityPhotoViewSet(mixins.RetrieveModelMixin,
+                             mixins.DestroyModelMixin,
+                             mixins.ListModelMixin,
+                             viewsets.GenericViewSet):
+    """API endpoint for continuity reference photos."""
+
+    queryset = ContinuityPhoto.objects.all()
+    serializer_class = ContinuityPhotoSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['note', 'thumbnail_status']
+
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            note__scene__production__in=user_production_ids(self.request.user)
+        )
+
+    @action(detail=True, methods=['get'])
+    def image(self, request, pk=None):
+        """
+        GET /api/continuity-photos/{id}/image/?size=160
+
+        With size, serves the smallest thumbnail at least that large (or the
+        largest there is). Supports Range and If-None-Match; files are
+        addressed by content, so responses can be cached indefinitely.
+        """
+        photo = self.get_object()
+        path, content_type, variant = photo.original_path, photo.content_type, 'original'
+
+        size = request.query_params.get('size')
+        if size:
+            try:
+                size = int(size)
+            except ValueError:
+                return Response(
+                    {'error': 'size must be an integer'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            available = sorted(int(s) for s in photo.thumbnails)
+            if available:
+                variant = next((s for s in available if s >= size), available[-1])
+                path, content_type = photo.thumbnails[str(variant)], 'image/jpeg'
+
+        full_path = media_path(path)
+        if not full_path.exists():
+            raise Http404('Image file is missing.')
+
+        # Until thumbnails exist the original stands in, so do not let
+        # clients cache that answer for the thumbnail URL.
+        immutable = variant != 'original' or not size
+        return ranged_file_response(
+            request,
+            full_path,
+            content_type,
+            etag=f'"{photo.content_hash}-{variant}"',
+            cache_control='private, max-age=31536000, immutable' if immutable else 'private, no-cache',
+        )
@@ -64,4 +64,60 @@ class StatusMixin(models.Model):
         return self.status == 'active'
 
     def is_completed(self):
-        return self.status == 'completed'
\ No newline at end of file
+        return self.status == 'completed'
+
+class TrackChangesQuerySet(models.QuerySet):
+    """
+    QuerySet whose update() and bulk_create() send the signals in
+    apps.core.signals, since neither sends post_save.
+    """
+
+    def update(self, **kwargs):
+        from .signals import post_update, pre_update
+
+        if self.query.is_sliced:
+            return super().update(**kwargs)
+        fields = sorted(kwargs)
+        pre_update.send(sender=self.model, queryset=self, fields=fields)
+        rows = super().update(**kwargs)
+        post_update.send(sender=self.model, queryset=self, fields=fields, rows=rows)
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from .signals import post_bulk_create
+
+        objs = super().bulk_create(objs, *args, **kwargs)
+        post_bulk_create.send(sender=self.model, queryset=self, objs=objs)
+        return objs
+
+
+class TrackChangesMixin(models.Model):
+    """
+    Mixin that remembers the field values an instance was loaded with.
+
+    The values come straight from the row Django already fetched, so
+    activity capture can diff a save against them without another query.
+    They are refreshed after each save, once post_save handlers have run.
+    Its manager's update() and bulk_create() send signals of their own
+    (see TrackChangesQuerySet).
+    """
+
+    objects = TrackChangesQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        deferred = self.get_deferred_fields()
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname not in deferred
+        }
@@ -0,0 +1,19 @@
+"""
+Signals for queryset operations that skip the model signals.
+
+QuerySet.update() and bulk_create() never send pre_save/post_save, so
+TrackChangesQuerySet sends these instead. Receivers get sender (the
+model) and queryset, plus:
+
+* pre_update / post_update: fields (the names being set); post_update
+  also rows, the number of rows updated. pre_update is sent before the
+  UPDATE runs, while the queryset still matches the rows it changes.
+* post_bulk_create: objs, the created instances.
+"""
+
+from django.dispatch import Signal
+
+
+pre_update = Signal()
+post_update = Signal()
+post_bulk_create = Signal()
@@ -3,8 +3,14 @@ Utility functions for ClapLog.
 """
 
 import os
-from datetime import datetime, timedelta
+import re
+from datetime import datetime, time, timedelta
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_ipv46_address
+from django.db import transaction
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 
 
 def generate_unique_filename(instance, filename):
@@ -22,7 +28,7 @@ def get_client_ip(request):
     """
     x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
     if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
+        ip = x_forwarded_for.split(',')[0].strip()
     else:
         ip = request.META.get('REMOTE_ADDR')
     return ip
@@ -47,6 +53,19 @@ def calculate_shooting_days(start_date, end_date):
     return days
 
 
+def add_shooting_days(start_date, days):
+    """
+    The date of the given number of shooting days after start_date.
+    Skips weekends, like calculate_shooting_days.
+    """
+    current_date = start_date
+    while days > 0:
+        current_date += timedelta(days=1)
+        if current_date.weekday() < 5:
+            days -= 1
+    return current_date
+
+
 def format_duration(seconds):
     """
     Format duration in seconds to human-readable format.
@@ -84,18 +103,128 @@ def get_file_size_display(bytes_size):
     return f"{bytes_size:.1f} PB"
 
 
-def log_activity(user, action_type, entity_type, entity_id, description, production=None, metadata=None):
+def log_activity(user, action_type, entity_type, entity_id, description, production=None, metadata=None,
+                 request=None):
     """
     Helper function to log user activities.
+
+    The entry is handed to the buffered activity writer once the current
+    transaction commits, so a rolled back change is not logged. Pass the
+    request to record the client's IP address and user agent.
     """
     from apps.activity.models import ActivityLog
-
-    ActivityLog.objects.create(
+    from apps.activity.writer import write_activity
+
+    ip_address, user_agent = None, ''
+    if request is not None:
+        ip_address = get_client_ip(request)
+        try:
+            validate_ipv46_address(ip_address)
+        except ValidationError:
+            ip_address = None
+        user_agent = request.META.get('HTTP_USER_AGENT', '')
+
+    entry = ActivityLog(
         user=user,
         production=production,
         action_type=action_type,
         entity_type=entity_type,
         entity_id=entity_id,
         description=description,
-        metadata=metadata or {}
-    )
\ No newline at end of file
+        metadata=metadata or {},
+        ip_address=ip_address,
+        user_agent=user_agent,
+        created_at=timezone.now(),
+    )
+    transaction.on_commit(lambda: write_activity(entry))
+
+
+def user_production_ids(user):
+    """Subquery of the ids of productions the user created or works on."""
+    from django.db.models import Q
+    from apps.productions.models import Production
+
+    return Production.objects.filter(
+        Q(created_by=user) | Q(team_members__user=user)
+    ).values('id')
+
+
+def parse_moment(value, end_of_day=False):
+    """Parse an ISO datetime, or a date meaning the start (or end) of that day."""
+    day = parse_date(value)
+    if day is not None:
+        if end_of_day:
+            day += timedelta(days=1)
+        moment = datetime.combine(day, time.min)
+    else:
+        moment = parse_datetime(value)
+        if moment is None:
+            raise ValueError(value)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _read_range(path, start, length, chunk_size=64 * 1024):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(chunk_size, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def ranged_file_response(request, path, content_type, etag=None, cache_control=None):
+    """
+    Serve a file with HTTP Range and conditional request support.
+
+    A single byte range gets a 206 response with only those bytes; anything
+    else (no Range, several ranges, a stale If-Range) gets the whole file.
+    If-None-Match matching the ETag gets a 304.
+    """
+    size = os.path.getsize(path)
+
+    def finish(response):
+        response['Accept-Ranges'] = 'bytes'
+        if etag:
+            response['ETag'] = etag
+        if cache_control:
+            response['Cache-Control'] = cache_control
+        return response
+
+    if etag and request.META.get('HTTP_IF_NONE_MATCH') == etag:
+        return finish(HttpResponse(status=304))
+
+    match = RANGE_RE.match(request.META.get('HTTP_RANGE', '').strip())
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if match and match.group(0) != 'bytes=-' and (not if_range or if_range == etag):
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            # Suffix range: the last N bytes.
+            start = max(size - int(last), 0)
+            end = size - 1
+
+        if start >= size or start > end:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f"bytes */{size}"
+            return finish(response)
+
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _read_range(path, start, length),
+            status=206,
+            content_type=content_type,
+        )
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f"bytes {start}-{end}/{size}"
+        return finish(response)
+
+    return finish(FileResponse(open(path, 'rb'), content_type=content_type))
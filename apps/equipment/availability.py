@@ -0,0 +1,61 @@
+"""
+Equipment availability over a time window.
+
+Only checkouts overlapping the window are loaded (an indexed range scan
+on checked_out_at per item, see overlapping_checkouts()), and the peak
+number of units out at once is found with a sweep per item.
+"""
+
+from collections import defaultdict
+
+from django.utils import timezone
+
+from apps.productions.conflicts import checkout_end, overlapping_checkouts, peak_usage
+from .models import Equipment, EquipmentCheckout
+
+
+# Items in these states cannot be checked out at all.
+UNAVAILABLE_STATUSES = ('maintenance', 'damaged', 'lost')
+
+
+def equipment_availability(production_id, start, end, category=None):
+    """
+    Units of each item free for the whole of [start, end).
+
+    Returns {'equipment': [...], 'by_category': [...]} in two queries.
+    """
+    now = timezone.now()
+    equipment = Equipment.objects.filter(production_id=production_id)
+    checkouts = EquipmentCheckout.objects.filter(equipment__production_id=production_id)
+    if category:
+        equipment = equipment.filter(category=category)
+        checkouts = checkouts.filter(equipment__category=category)
+
+    windows = defaultdict(list)
+    for equipment_id, checked_out_at, due_back_at, returned_at in overlapping_checkouts(
+        checkouts, start, end, now
+    ).values_list('equipment_id', 'checked_out_at', 'due_back_at', 'returned_at'):
+        windows[equipment_id].append((checked_out_at, checkout_end(returned_at, due_back_at, now)))
+
+    items = []
+    by_category = {}
+    for item in equipment.values('id', 'name', 'category', 'quantity', 'status', 'daily_rate'):
+        quantity = max(item['quantity'], 1)
+        in_use = peak_usage(windows.get(item['id'], []), start, end)
+        available = 0 if item['status'] in UNAVAILABLE_STATUSES else max(quantity - in_use, 0)
+        items.append({**item, 'in_use': in_use, 'available': available})
+
+        summary = by_category.setdefault(item['category'], {
+            'category': item['category'],
+            'items': 0,
+            'quantity': 0,
+            'available': 0,
+        })
+        summary['items'] += 1
+        summary['quantity'] += quantity
+        summary['available'] += available
+
+    return {
+        'equipment': items,
+        'by_category': sorted(by_category.values(), key=lambda c: c['category']),
+    }
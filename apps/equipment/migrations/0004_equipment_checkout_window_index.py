@@ -0,0 +1,22 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("equipment", "0003_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="equipmentcheckout",
+            index=models.Index(
+                fields=["equipment", "checked_out_at", "returned_at"],
+                name="equipment_c_equipme_3f63df_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("equipment", "0004_equipment_checkout_window_index"),
+        ("productions", "0004_budget_rollup"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="equipment",
+            index=models.Index(
+                fields=["production", "serial_number"],
+                name="equipment_product_e79105_idx",
+            ),
+        ),
+    ]
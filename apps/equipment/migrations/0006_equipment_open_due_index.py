@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("equipment", "0005_equipment_serial_number_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="equipmentcheckout",
+            index=models.Index(
+                condition=models.Q(("returned_at__isnull", True)),
+                fields=["equipment", "due_back_at"],
+                name="equipment_open_due_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.1 on 2026-10-19 05:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("equipment", "0006_equipment_open_due_index"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="equipmentcheckout",
+            name="equipment_open_due_idx",
+        ),
+        migrations.AddIndex(
+            model_name="equipmentcheckout",
+            index=models.Index(
+                fields=["equipment", "returned_at", "due_back_at"],
+                name="equipment_open_due_idx",
+            ),
+        ),
+    ]
@@ -52,6 +52,10 @@ class Equipment(models.Model):
     class Meta:
         db_table = 'equipment'
         ordering = ['category', 'name']
+        indexes = [
+            # Scan lookups resolve serial numbers within a production.
+            models.Index(fields=['production', 'serial_number']),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_category_display()})"
@@ -83,6 +87,33 @@ class EquipmentCheckout(models.Model):
     class Meta:
         db_table = 'equipment_checkout'
         ordering = ['-checked_out_at']
+        indexes = [
+            # Interval lookups: checkouts of an item starting before a window ends.
+            models.Index(fields=['equipment', 'checked_out_at', 'returned_at']),
+            # Open checkouts by due date (see productions.returns). A plain
+            # index rather than a partial one, which MySQL cannot create.
+            models.Index(
+                fields=['equipment', 'returned_at', 'due_back_at'],
+                name='equipment_open_due_idx',
+            ),
+        ]
 
     def __str__(self):
-        return f"{self.equipment.name} - {self.checked_out_by.username}"
\ No newline at end of file
+        return f"{self.equipment.name} - {self.checked_out_by.username}"
+
+    def clean(self):
+        """Reject checkouts that would exceed the equipment quantity."""
+        from apps.productions.conflicts import validate_equipment_checkout
+
+        if self.equipment_id and not self.returned_at:
+            validate_equipment_checkout(
+                self.equipment, self.checked_out_at, self.due_back_at, exclude_id=self.pk
+            )
+
+    def save(self, *args, **kwargs):
+        # Checked on every save that touches the checkout window, not only
+        # through forms and serializers, so scripts cannot overbook either.
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'equipment', 'checked_out_at', 'due_back_at', 'returned_at'} & set(update_fields):
+            self.clean()
+        super().save(*args, **kwargs)
\ No newline at end of file
@@ -0,0 +1,192 @@
+"""
+Barcode/serial number scanning for equipment check-in and check-out.
+
+A batch of scans is resolved with one indexed (production, serial_number)
+lookup. It is then applied with one bulk_create of new checkouts and one
+bulk_update of returned ones, inside a transaction that locks the
+scanned items. bulk operations skip model signals, so the production's
+data version and budget rollup are updated explicitly.
+"""
+
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from apps.productions.conflicts import checkout_end, overlapping_checkouts, peak_usage
+from .availability import UNAVAILABLE_STATUSES
+from .models import Equipment, EquipmentCheckout
+
+
+SCAN_MODES = ('checkout', 'return', 'auto')
+
+
+def normalize_scan(scan):
+    """A scan is a serial string or {'serial': ..., 'condition': ..., 'notes': ...}."""
+    if isinstance(scan, dict):
+        return {
+            'serial': str(scan.get('serial', '')).strip(),
+            'condition': scan.get('condition'),
+            'notes': str(scan.get('notes') or '').strip(),
+        }
+    return {'serial': str(scan).strip(), 'condition': None, 'notes': ''}
+
+
+def _result(scan, status, equipment=None, checkout=None, message=''):
+    return {
+        'serial': scan['serial'],
+        'status': status,
+        'equipment': equipment.id if equipment else None,
+        'equipment_name': equipment.name if equipment else None,
+        'checkout': checkout.id if checkout else None,
+        'message': message,
+    }
+
+
+def process_scans(production_id, scans, user, mode='auto', due_back_at=None, condition='good'):
+    """
+    Check out or return the scanned items of one production.
+
+    In 'auto' mode an item with an open checkout is returned and any
+    other item is checked out. Several scans of the same serial check
+    out (or return) several units. Returns one result per scan, in order.
+    """
+    scans = [normalize_scan(scan) for scan in scans]
+    now = timezone.now()
+    valid_conditions = dict(EquipmentCheckout.CONDITION_CHOICES)
+
+    with transaction.atomic():
+        items = {
+            item.serial_number: item
+            for item in Equipment.objects.select_for_update().filter(
+                production_id=production_id,
+                serial_number__in={scan['serial'] for scan in scans if scan['serial']},
+            )
+        }
+
+        open_checkouts = defaultdict(list)
+        for checkout in EquipmentCheckout.objects.filter(
+            equipment__in=items.values(), returned_at__isnull=True
+        ).order_by('checked_out_at'):
+            open_checkouts[checkout.equipment_id].append(checkout)
+
+        existing_ids = {checkout.id for checkouts in open_checkouts.values() for checkout in checkouts}
+
+        # Units that can still go out before due_back_at, per item: its
+        # booked windows, less the checkouts made by this batch so far.
+        windows = defaultdict(dict)
+        for checkout_id, equipment_id, checked_out_at, due, returned_at in overlapping_checkouts(
+            EquipmentCheckout.objects.filter(equipment__in=items.values()), now, due_back_at, now
+        ).values_list('id', 'equipment_id', 'checked_out_at', 'due_back_at', 'returned_at'):
+            windows[equipment_id][checkout_id] = (checked_out_at, checkout_end(returned_at, due, now))
+        taken = Counter()
+
+        def free(item):
+            return max(item.quantity, 1) - peak_usage(windows[item.id].values(), now, due_back_at) - taken[item.id]
+
+        results = []
+        new_checkouts = []
+        created = []
+        returned = []
+        for scan in scans:
+            item = items.get(scan['serial'])
+            if item is None:
+                results.append(_result(scan, 'unknown_serial', message='No equipment with this serial number'))
+                continue
+            scan_condition = scan['condition'] or condition
+            if scan_condition not in valid_conditions:
+                results.append(_result(scan, 'invalid', item, message=f"Unknown condition '{scan_condition}'"))
+                continue
+
+            action = mode
+            if mode == 'auto':
+                action = 'return' if open_checkouts[item.id] else 'checkout'
+
+            if action == 'return':
+                if not open_checkouts[item.id]:
+                    results.append(_result(scan, 'not_checked_out', item, message='Item is not checked out'))
+                    continue
+                checkout = open_checkouts[item.id].pop(0)
+                checkout.returned_at = now
+                # Returned now, so it no longer holds a unit from now on.
+                windows[item.id].pop(checkout.id, None)
+                checkout.condition_in = scan_condition
+                if scan['notes']:
+                    checkout.notes = f"{checkout.notes}\n{scan['notes']}".strip()
+                returned.append(checkout)
+                results.append(_result(scan, 'returned', item, checkout))
+                continue
+
+            if item.status in UNAVAILABLE_STATUSES:
+                results.append(_result(scan, 'unavailable', item, message=f"Item is {item.get_status_display().lower()}"))
+                continue
+            if free(item) <= 0:
+                results.append(_result(scan, 'fully_booked', item, message=f"All {item.quantity} units are out"))
+                continue
+            taken[item.id] += 1
+            checkout = EquipmentCheckout(
+                equipment=item,
+                checked_out_by=user,
+                due_back_at=due_back_at,
+                condition_out=scan_condition,
+                notes=scan['notes'],
+            )
+            new_checkouts.append(checkout)
+            results.append(_result(scan, 'checked_out', item))
+            created.append((results[-1], checkout))
+
+        EquipmentCheckout.objects.bulk_create(new_checkouts)
+        EquipmentCheckout.objects.bulk_update(returned, ['returned_at', 'condition_in', 'notes'])
+
+        # Ids are only known once the rows are inserted, and only some
+        # backends (not MySQL) return them from a bulk insert. The scanned
+        # items are locked, so their open checkouts that were not open
+        # before are exactly this batch's, in insertion order.
+        if created and created[0][1].pk is None:
+            new_ids = EquipmentCheckout.objects.filter(
+                equipment__in=items.values(), returned_at__isnull=True
+            ).exclude(id__in=existing_ids).order_by('id').values_list('id', flat=True)
+            for (_, checkout), checkout_id in zip(created, new_ids):
+                checkout.pk = checkout_id
+        for result, checkout in created:
+            result['checkout'] = checkout.pk
+
+        if new_checkouts or returned:
+            _sync_statuses(items.values(), now)
+            _mark_changed(production_id)
+
+    return results
+
+
+def _sync_statuses(items, now):
+    """Set checked_out/available on the scanned items from their open checkouts."""
+    open_counts = dict(
+        Equipment.objects.filter(id__in=[item.id for item in items]).annotate(
+            open_count=Count('checkouts', filter=Q(checkouts__returned_at__isnull=True))
+        ).values_list('id', 'open_count')
+    )
+    changed = []
+    for item in items:
+        if item.status in UNAVAILABLE_STATUSES:
+            continue
+        status = 'checked_out' if open_counts.get(item.id, 0) >= max(item.quantity, 1) else 'available'
+        if status != item.status:
+            item.status = status
+            # bulk_update() does not apply auto_now.
+            item.updated_at = now
+            changed.append(item)
+    Equipment.objects.bulk_update(changed, ['status', 'updated_at'])
+
+
+def _mark_changed(production_id):
+    from apps.productions.models import BudgetRollup
+    from apps.productions.signals import bump_data_version
+
+    bump_data_version(production_id)
+    BudgetRollup.objects.filter(production_id=production_id).update(equipment_stale=True)
+
+
+def summarize(results):
+    """Count of results per status."""
+    return dict(Counter(result['status'] for result in results))
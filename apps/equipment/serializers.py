@@ -0,0 +1,86 @@
+"""
+Equipment serializers for ClapLog API.
+"""
+
+from django.utils import timezone
+from rest_framework import serializers
+from .models import Equipment, EquipmentCheckout
+
+
+class EquipmentSerializer(serializers.ModelSerializer):
+    """Full equipment serializer."""
+
+    category_display = serializers.CharField(source='get_category_display', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+
+    class Meta:
+        model = Equipment
+        fields = [
+            'id',
+            'production',
+            'name',
+            'category',
+            'category_display',
+            'manufacturer',
+            'model',
+            'serial_number',
+            'quantity',
+            'status',
+            'status_display',
+            'daily_rate',
+            'purchase_date',
+            'last_maintenance',
+            'notes',
+            'created_at',
+            'updated_at',
+        ]
+        read_only_fields = ['id', 'created_at', 'updated_at']
+
+    def validate_quantity(self, value):
+        if value < 1:
+            raise serializers.ValidationError("Quantity must be at least 1.")
+        return value
+
+
+class EquipmentCheckoutSerializer(serializers.ModelSerializer):
+    """Checkout of one unit of equipment."""
+
+    equipment_name = serializers.CharField(source='equipment.name', read_only=True)
+    checked_out_by_name = serializers.CharField(source='checked_out_by.username', read_only=True)
+    is_open = serializers.SerializerMethodField()
+
+    class Meta:
+        model = EquipmentCheckout
+        fields = [
+            'id',
+            'equipment',
+            'equipment_name',
+            'checked_out_by',
+            'checked_out_by_name',
+            'checked_out_at',
+            'due_back_at',
+            'returned_at',
+            'condition_out',
+            'condition_in',
+            'notes',
+            'is_open',
+        ]
+        read_only_fields = [
+            'id', 'equipment', 'checked_out_by', 'checked_out_at', 'returned_at', 'condition_in'
+        ]
+
+    def get_is_open(self, obj):
+        return obj.returned_at is None
+
+    def validate_due_back_at(self, value):
+        if value and value <= timezone.now():
+            raise serializers.ValidationError("Due back time must be in the future.")
+        return value
+
+
+class EquipmentReturnSerializer(serializers.Serializer):
+    """Input for returning a checked out item."""
+
+    checkout = serializers.IntegerField(required=False, help_text="Checkout to close; defaults to the oldest open one")
+    condition_in = serializers.ChoiceField(choices=EquipmentCheckout.CONDITION_CHOICES)
+    notes = serializers.CharField(required=False, allow_blank=True)
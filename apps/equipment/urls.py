@@ -0,0 +1,15 @@
+"""
+Equipment URL configuration.
+"""
+
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import EquipmentViewSet, EquipmentCheckoutViewSet
+
+router = DefaultRouter()
+router.register(r'equipment', EquipmentViewSet, basename='equipment')
+router.register(r'equipment-checkouts', EquipmentCheckoutViewSet, basename='equipment-checkout')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -1,3 +1,271 @@
-from django.shortcuts import render
+"""
+Equipment API views.
+"""
 
-# Create your views here.
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import filters, mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from apps.core.utils import parse_moment, user_production_ids
+from apps.productions.conflicts import validate_equipment_checkout
+from .availability import UNAVAILABLE_STATUSES, equipment_availability
+from .models import Equipment, EquipmentCheckout
+from .scanning import SCAN_MODES, process_scans, summarize
+from .serializers import (
+    EquipmentCheckoutSerializer,
+    EquipmentReturnSerializer,
+    EquipmentSerializer,
+)
+
+
+def sync_status(equipment):
+    """Mark an item checked out while all its units are out, available otherwise."""
+    if equipment.status in UNAVAILABLE_STATUSES:
+        return
+    open_count = EquipmentCheckout.objects.filter(equipment=equipment, returned_at__isnull=True).count()
+    new_status = 'checked_out' if open_count >= max(equipment.quantity, 1) else 'available'
+    if new_status != equipment.status:
+        equipment.status = new_status
+        equipment.save(update_fields=['status', 'updated_at'])
+
+
+class EquipmentViewSet(viewsets.ModelViewSet):
+    """API endpoint for production equipment."""
+
+    queryset = Equipment.objects.all()
+    serializer_class = EquipmentSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filterset_fields = ['production', 'category', 'status']
+    search_fields = ['name', 'manufacturer', 'model', 'serial_number']
+    ordering_fields = ['name', 'category', 'daily_rate', 'created_at']
+
+    def get_queryset(self):
+        """Equipment from the user's productions."""
+        return super().get_queryset().filter(
+            production__in=user_production_ids(self.request.user)
+        )
+
+    @action(detail=True, methods=['post'])
+    def checkout(self, request, pk=None):
+        """
+        POST /api/equipment/{id}/checkout/
+        Check out one unit. Rejected if every unit is out at some point
+        before due_back_at.
+        """
+        equipment = self.get_object()
+        serializer = EquipmentCheckoutSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            # Lock the item so concurrent checkouts are checked one at a time.
+            equipment = Equipment.objects.select_for_update().get(pk=equipment.pk)
+            if equipment.status in UNAVAILABLE_STATUSES:
+                return Response(
+                    {'error': f"{equipment.name} is {equipment.get_status_display().lower()}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            try:
+                validate_equipment_checkout(
+                    equipment, timezone.now(), serializer.validated_data.get('due_back_at')
+                )
+            except ValidationError as e:
+                return Response({'error': e.messages[0]}, status=status.HTTP_409_CONFLICT)
+
+            checkout = serializer.save(equipment=equipment, checked_out_by=request.user)
+            sync_status(equipment)
+
+        return Response(EquipmentCheckoutSerializer(checkout).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'], url_path='return')
+    def return_item(self, request, pk=None):
+        """
+        POST /api/equipment/{id}/return/
+        Close a checkout (by default the oldest open one) with condition_in.
+        """
+        equipment = self.get_object()
+        serializer = EquipmentReturnSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        with transaction.atomic():
+            open_checkouts = EquipmentCheckout.objects.select_for_update().filter(
+                equipment=equipment, returned_at__isnull=True
+            ).order_by('checked_out_at')
+            if 'checkout' in data:
+                open_checkouts = open_checkouts.filter(id=data['checkout'])
+            checkout = open_checkouts.first()
+            if checkout is None:
+                return Response(
+                    {'error': 'No open checkout to return'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            checkout.returned_at = timezone.now()
+            checkout.condition_in = data['condition_in']
+            if data.get('notes'):
+                checkout.notes = f"{checkout.notes}\n{data['notes']}".strip()
+            checkout.save()
+            sync_status(equipment)
+
+        return Response(EquipmentCheckoutSerializer(checkout).data)
+
+    @action(detail=False, methods=['post'])
+    def scan(self, request):
+        """
+        POST /api/equipment/scan/
+        Check items in or out by serial number, with one result per scan.
+
+        JSON body: {"production": ID, "mode": "auto|checkout|return",
+        "due_back_at": ISO, "condition": "good", "scans": ["SN1", {"serial":
+        "SN2", "condition": "fair", "notes": "..."}]}
+
+        Streaming: send Content-Type application/x-ndjson with one scan per
+        line and the other options as query parameters. Scans are applied in
+        small batches as the body is read, and results stream back as NDJSON.
+        """
+        streaming = request.content_type.startswith('application/x-ndjson')
+        options = request.query_params if streaming else request.data
+
+        mode = options.get('mode') or 'auto'
+        condition = options.get('condition') or 'good'
+        if mode not in SCAN_MODES:
+            return Response(
+                {'error': f"mode must be one of {', '.join(SCAN_MODES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            production_id = int(options['production'])
+        except (KeyError, TypeError, ValueError):
+            return Response({'error': 'production must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        due_back_at = None
+        if options.get('due_back_at'):
+            try:
+                due_back_at = parse_moment(options['due_back_at'])
+            except ValueError:
+                return Response(
+                    {'error': 'due_back_at must be an ISO date or datetime'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        if not user_production_ids(request.user).filter(id=production_id).exists():
+            return Response({'error': 'Production not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        def apply(scans):
+            return process_scans(
+                production_id, scans, request.user,
+                mode=mode, due_back_at=due_back_at, condition=condition,
+            )
+
+        if streaming:
+            return StreamingHttpResponse(
+                self._stream_scans(request._request, apply),
+                content_type='application/x-ndjson'
+            )
+
+        scans = request.data.get('scans')
+        if not isinstance(scans, list) or not scans:
+            return Response({'error': 'scans must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(scans) > settings.EQUIPMENT_SCAN_MAX_BATCH:
+            return Response(
+                {'error': f"At most {settings.EQUIPMENT_SCAN_MAX_BATCH} scans per request"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = apply(scans)
+        return Response({'summary': summarize(results), 'results': results})
+
+    @staticmethod
+    def _stream_scans(http_request, apply):
+        """Read NDJSON scans from the request body and yield NDJSON results."""
+        batch = []
+        for line in http_request:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                batch.append(json.loads(line))
+            except ValueError:
+                # A bare serial number rather than JSON.
+                batch.append(line.decode('utf-8', 'replace'))
+            if len(batch) >= settings.EQUIPMENT_SCAN_STREAM_BATCH:
+                for result in apply(batch):
+                    yield json.dumps(result) + '\n'
+                batch = []
+        if batch:
+            for result in apply(batch):
+                yield json.dumps(result) + '\n'
+
+    @action(detail=False, methods=['get'])
+    def availability(self, request):
+        """
+        GET /api/equipment/availability/?production=ID&start=T1&end=T2[&category=C]
+        Units of each item free for the whole window. start and end are
+        ISO datetimes or dates (an end date includes that whole day).
+        """
+        params = request.query_params
+        if not params.get('start') or not params.get('end'):
+            return Response(
+                {'error': 'start and end are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            production_id = int(params['production'])
+        except (KeyError, ValueError):
+            return Response({'error': 'production must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            start = parse_moment(params['start'])
+            end = parse_moment(params['end'], end_of_day=True)
+        except ValueError:
+            return Response(
+                {'error': 'start and end must be ISO dates or datetimes'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if end <= start:
+            return Response(
+                {'error': 'end must be after start'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not user_production_ids(request.user).filter(id=production_id).exists():
+            return Response({'error': 'Production not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            'production_id': production_id,
+            'start': start,
+            'end': end,
+            **equipment_availability(production_id, start, end, params.get('category')),
+        })
+
+
+class EquipmentCheckoutViewSet(mixins.ListModelMixin,
+                               mixins.RetrieveModelMixin,
+                               viewsets.GenericViewSet):
+    """
+    Checkout history. Checkouts are opened and closed through
+    /api/equipment/{id}/checkout/ and /api/equipment/{id}/return/.
+    """
+
+    queryset = EquipmentCheckout.objects.all()
+    serializer_class = EquipmentCheckoutSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['equipment', 'equipment__production', 'checked_out_by']
+    ordering_fields = ['checked_out_at', 'due_back_at', 'returned_at']
+
+    def get_queryset(self):
+        queryset = super().get_queryset().filter(
+            equipment__production__in=user_production_ids(self.request.user)
+        ).select_related('equipment', 'checked_out_by')
+
+        is_open = self.request.query_params.get('open')
+        if is_open is not None:
+            queryset = queryset.filter(returned_at__isnull=is_open.lower() in ('1', 'true', 'yes'))
+        return queryset
@@ -4,6 +4,6 @@ from .models import ExportJob
 
 @admin.register(ExportJob)
 class ExportJobAdmin(admin.ModelAdmin):
-    list_display = ['export_type', 'user', 'status', 'created_at', 'completed_at']
+    list_display = ['export_type', 'user', 'status', 'attempts', 'created_at', 'completed_at']
     list_filter = ['status', 'export_type', 'created_at']
-    readonly_fields = ['created_at', 'started_at', 'completed_at']
\ No newline at end of file
+    readonly_fields = ['created_at', 'started_at', 'heartbeat_at', 'completed_at', 'attempts', 'cache_key', 'source_job', 'last_accessed_at']
\ No newline at end of file
@@ -0,0 +1,275 @@
+"""
+Call sheet PDF rendering for ClapLog.
+
+Rendered files are cached by a hash of the call sheet's content, so a
+sheet that has not changed since its last render is never re-rendered.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+
+from .pdf import PDFDocument, PAGE_WIDTH, PAGE_HEIGHT, wrap_text
+
+
+# Bump when the layout changes so cached files are not reused.
+RENDERER_VERSION = 1
+
+MARGIN = 40
+CONTENT_WIDTH = PAGE_WIDTH - 2 * MARGIN
+ACCENT = (0.545, 0.0, 0.0)
+MUTED = (0.4, 0.4, 0.4)
+
+
+def _time(value):
+    return value.strftime('%H:%M') if value else ''
+
+
+def call_sheet_snapshot(call_sheet):
+    """
+    Collect everything printed on the call sheet as plain data.
+
+    Prefetch `scenes__scene` and `cast__cast_member` when snapshotting
+    many sheets to avoid per-sheet queries.
+    """
+    return {
+        'version': RENDERER_VERSION,
+        'id': call_sheet.id,
+        'production': call_sheet.production.title,
+        'director': call_sheet.production.director,
+        'shoot_date': call_sheet.shoot_date.isoformat(),
+        'day_number': call_sheet.day_number,
+        'status': call_sheet.get_status_display(),
+        'call_time': _time(call_sheet.call_time),
+        'crew_call_time': _time(call_sheet.crew_call_time),
+        'wrap_time_estimate': _time(call_sheet.wrap_time_estimate),
+        'location_address': call_sheet.location_address,
+        'parking_info': call_sheet.parking_info,
+        'weather_forecast': call_sheet.weather_forecast,
+        'sunrise_time': _time(call_sheet.sunrise_time),
+        'sunset_time': _time(call_sheet.sunset_time),
+        'meals_provided': call_sheet.meals_provided,
+        'nearest_hospital': call_sheet.nearest_hospital,
+        'safety_notes': call_sheet.safety_notes,
+        'general_notes': call_sheet.general_notes,
+        'scenes': [
+            {
+                'scene_number': item.scene.scene_number,
+                'slug_line': item.scene.slug_line,
+                'script_pages': str(item.scene.script_pages or ''),
+                'scheduled_time': _time(item.scheduled_time),
+                'estimated_duration': item.estimated_duration,
+                'notes': item.notes,
+            }
+            for item in sorted(call_sheet.scenes.all(), key=lambda s: (s.sequence_order, s.id))
+        ],
+        'cast': [
+            {
+                'name': item.cast_member.name,
+                'character_name': item.cast_member.character_name,
+                'call_time': _time(item.call_time),
+                'makeup_time': _time(item.makeup_time),
+                'pickup_location': item.pickup_location,
+                'scenes_today': item.scenes_today,
+                'status': item.get_status_display(),
+            }
+            for item in sorted(call_sheet.cast.all(), key=lambda c: (c.call_time, c.id))
+        ],
+    }
+
+
+def snapshot_hash(snapshot):
+    """Stable content hash of a call sheet snapshot."""
+    payload = json.dumps(snapshot, sort_keys=True, default=str).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+def cache_path(content_hash):
+    """Location of the cached PDF for a content hash."""
+    return Path(settings.EXPORT_ROOT) / 'call_sheets' / f"{content_hash}.pdf"
+
+
+class _Layout:
+    """Tracks the cursor and starts new pages when the current one fills up."""
+
+    def __init__(self, doc, footer):
+        self.doc = doc
+        self.footer = footer
+        self.y = 0
+        self.new_page()
+
+    def new_page(self):
+        self.doc.add_page()
+        self.doc.text(MARGIN, 24, self.footer, size=7, color=MUTED)
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def ensure(self, height):
+        if self.y - height < MARGIN:
+            self.new_page()
+
+    def heading(self, title):
+        self.ensure(40)
+        self.y -= 18
+        self.doc.rect(MARGIN, self.y - 4, CONTENT_WIDTH, 16, color=ACCENT)
+        self.doc.text(MARGIN + 6, self.y, title.upper(), size=9, font='bold', color=(1, 1, 1))
+        self.y -= 16
+
+    def paragraph(self, text, size=9, font='regular'):
+        for line in wrap_text(text, size, CONTENT_WIDTH):
+            self.ensure(size + 3)
+            self.doc.text(MARGIN, self.y, line, size=size, font=font)
+            self.y -= size + 3
+
+    def pairs(self, items):
+        for label, value in items:
+            if not value:
+                continue
+            lines = wrap_text(value, 9, CONTENT_WIDTH - 110)
+            self.ensure(12 * len(lines))
+            self.doc.text(MARGIN, self.y, label, size=9, font='bold')
+            for line in lines:
+                self.doc.text(MARGIN + 110, self.y, line, size=9)
+                self.y -= 12
+
+    def table(self, columns, rows):
+        """Draw a table; columns is a list of (title, width, key)."""
+        def header():
+            x = MARGIN
+            for title, width, _ in columns:
+                self.doc.text(x, self.y, title, size=8, font='bold', color=MUTED)
+                x += width
+            self.y -= 4
+            self.doc.line(MARGIN, self.y, MARGIN + CONTENT_WIDTH, self.y)
+            self.y -= 11
+
+        self.ensure(30)
+        header()
+        if not rows:
+            self.paragraph('None scheduled.')
+            return
+        for row in rows:
+            cells = [wrap_text(row.get(key) or '', 8, width - 6) for _, width, key in columns]
+            height = 10 * max(len(cell) for cell in cells) + 3
+            if self.y - height < MARGIN:
+                self.new_page()
+                header()
+            x = MARGIN
+            for (_, width, _), cell in zip(columns, cells):
+                for offset, line in enumerate(cell):
+                    self.doc.text(x, self.y - offset * 10, line, size=8)
+                x += width
+            self.y -= height
+            self.doc.line(MARGIN, self.y + 8, MARGIN + CONTENT_WIDTH, self.y + 8, width=0.2, color=MUTED)
+
+
+def render_call_sheet(snapshot):
+    """Render a call sheet snapshot to PDF bytes."""
+    title = f"{snapshot['production']} - Call Sheet {snapshot['shoot_date']}"
+    doc = PDFDocument(title=title)
+    layout = _Layout(doc, f"{title} | generated by ClapLog")
+
+    doc.text(MARGIN, layout.y - 16, snapshot['production'], size=20, font='bold', color=ACCENT)
+    day = f"Day {snapshot['day_number']}  |  " if snapshot['day_number'] else ''
+    doc.text(MARGIN, layout.y - 34, f"{day}{snapshot['shoot_date']}  |  {snapshot['status']}", size=11)
+    if snapshot['director']:
+        doc.text(MARGIN, layout.y - 48, f"Director: {snapshot['director']}", size=9, color=MUTED)
+    doc.text(PAGE_WIDTH - MARGIN - 110, layout.y - 16, 'GENERAL CALL', size=9, font='bold', color=MUTED)
+    doc.text(PAGE_WIDTH - MARGIN - 110, layout.y - 38, snapshot['call_time'], size=20, font='bold')
+    layout.y -= 60
+
+    layout.heading('Schedule')
+    meals = ', '.join(
+        meal if isinstance(meal, str) else ' '.join(str(v) for v in meal.values())
+        for meal in snapshot['meals_provided']
+    ) if isinstance(snapshot['meals_provided'], list) else str(snapshot['meals_provided'])
+    layout.pairs([
+        ('Crew Call', snapshot['crew_call_time']),
+        ('Est. Wrap', snapshot['wrap_time_estimate']),
+        ('Location', snapshot['location_address']),
+        ('Parking', snapshot['parking_info']),
+        ('Weather', snapshot['weather_forecast']),
+        ('Sunrise / Sunset', ' / '.join(t for t in [snapshot['sunrise_time'], snapshot['sunset_time']] if t)),
+        ('Meals', meals),
+    ])
+
+    layout.heading('Scenes')
+    layout.table(
+        [('SC', 40, 'scene_number'), ('SET / DESCRIPTION', 250, 'slug_line'),
+         ('PAGES', 50, 'script_pages'), ('TIME', 50, 'scheduled_time'),
+         ('MIN', 40, 'estimated_duration'), ('NOTES', 102, 'notes')],
+        [dict(scene, estimated_duration=str(scene['estimated_duration'] or '')) for scene in snapshot['scenes']],
+    )
+
+    layout.heading('Cast')
+    layout.table(
+        [('CAST', 120, 'name'), ('CHARACTER', 110, 'character_name'), ('CALL', 45, 'call_time'),
+         ('MAKEUP', 50, 'makeup_time'), ('PICKUP', 105, 'pickup_location'), ('SCENES', 102, 'scenes_today')],
+        [
+            dict(member, scenes_today=', '.join(str(s) for s in member['scenes_today'] or []))
+            for member in snapshot['cast']
+        ],
+    )
+
+    layout.heading('Safety')
+    layout.pairs([
+        ('Nearest Hospital', snapshot['nearest_hospital'] or 'Not provided'),
+        ('Safety Notes', snapshot['safety_notes']),
+    ])
+
+    if snapshot['general_notes']:
+        layout.heading('Notes')
+        layout.paragraph(snapshot['general_notes'])
+
+    return doc.to_bytes()
+
+
+def _write_atomic(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def render_call_sheet_pdf(call_sheet):
+    """
+    Return the path of the PDF for a call sheet, rendering it only if
+    no PDF exists for the sheet's current content.
+    """
+    snapshot = call_sheet_snapshot(call_sheet)
+    path = cache_path(snapshot_hash(snapshot))
+    if not path.exists():
+        _write_atomic(path, render_call_sheet(snapshot))
+    return path
+
+
+def render_call_sheet_pdfs(call_sheets, max_workers=None):
+    """
+    Render many call sheets, e.g. a whole shooting week.
+
+    Snapshots are taken in this process; cache misses are rendered in a
+    process pool since rendering is CPU-bound. Returns a dict mapping
+    call sheet id to PDF path.
+    """
+    paths = {}
+    pending = []
+    for call_sheet in call_sheets:
+        snapshot = call_sheet_snapshot(call_sheet)
+        path = cache_path(snapshot_hash(snapshot))
+        paths[call_sheet.id] = path
+        if not path.exists():
+            pending.append((path, snapshot))
+
+    if len(pending) == 1 or max_workers == 1:
+        for path, snapshot in pending:
+            _write_atomic(path, render_call_sheet(snapshot))
+    elif pending:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            rendered = pool.map(render_call_sheet, [snapshot for _, snapshot in pending])
+            for (path, _), data in zip(pending, rendered):
+                _write_atomic(path, data)
+
+    return paths
@@ -0,0 +1,231 @@
+"""
+Streaming CSV exports of scenes, shots, call sheets and continuity notes.
+
+Rows are read with values_list().iterator(), so the database hands them
+over in chunks (a server-side cursor on Postgres) and no model instances
+are built. They are formatted by a csv.writer into a generator of text
+chunks. The header is the first chunk, so a download starts at once, and
+memory stays flat however many rows there are.
+
+The same generator feeds the streaming download view and the export
+worker, which writes it to a file.
+"""
+
+import csv
+import os
+from datetime import date, datetime, time
+
+from django.conf import settings
+
+
+CSV_EXPORT_TYPES = ('scenes_csv', 'shots_csv', 'call_sheets_csv', 'continuity_csv')
+
+# Spreadsheets treat text starting with these as a formula.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _scenes(production_id, parameters):
+    from apps.scenes.models import Scene
+
+    columns = [
+        ('Scene', 'scene_number'),
+        ('Name', 'scene_name'),
+        ('INT/EXT', 'interior_exterior'),
+        ('Day/Night', 'day_night'),
+        ('Location', 'location_text'),
+        ('Description', 'description'),
+        ('Script Pages', 'script_pages'),
+        ('Script Day', 'script_day'),
+        ('Status', 'status'),
+        ('Shooting Date', 'shooting_date'),
+        ('Call Time', 'call_time'),
+        ('Wrap Time', 'wrap_time'),
+        ('Estimated Duration (min)', 'estimated_duration'),
+        ('Actual Duration (min)', 'actual_duration'),
+        ('Suggested Duration (min)', 'suggested_duration'),
+        ('Cast', 'cast_required'),
+        ('Crew', 'crew_required'),
+        ('Equipment', 'equipment_needed'),
+        ('Special Effects', 'special_effects'),
+        ('Stunts', 'stunts_required'),
+        ('VFX', 'vfx_required'),
+        ('Weather Dependent', 'weather_dependent'),
+        ('Priority', 'priority'),
+        ('Notes', 'notes'),
+    ]
+    rows = Scene.objects.filter(production_id=production_id).order_by('sequence_order', 'scene_number', 'id')
+    return columns, rows
+
+
+def _shots(production_id, parameters):
+    """One row per shot; with parameters {"takes": true}, one row per take."""
+    from apps.shots.models import Shot
+
+    columns = [
+        ('Scene', 'scene__scene_number'),
+        ('Shot', 'shot_number'),
+        ('Name', 'shot_name'),
+        ('Description', 'description'),
+        ('Shot Type', 'shot_type'),
+        ('Camera Angle', 'camera_angle'),
+        ('Camera Movement', 'camera_movement'),
+        ('Camera', 'camera_model'),
+        ('Lens', 'lens'),
+        ('Focal Length', 'focal_length'),
+        ('Aperture', 'aperture'),
+        ('ISO', 'iso'),
+        ('Frame Rate', 'frame_rate'),
+        ('Duration (s)', 'duration'),
+        ('Takes Planned', 'takes_planned'),
+        ('Takes Completed', 'takes_completed'),
+        ('Best Take', 'best_take'),
+        ('Status', 'status'),
+        ('VFX', 'vfx_required'),
+        ('Notes', 'notes'),
+    ]
+    order = ['scene__sequence_order', 'scene__scene_number', 'sequence_order', 'shot_number', 'id']
+    if parameters.get('takes'):
+        # Shots without takes still get a row, with the take columns empty.
+        columns += [
+            ('Take', 'takes__take_number'),
+            ('Take Duration (s)', 'takes__duration'),
+            ('Selected', 'takes__is_selected'),
+            ('Rating', 'takes__quality_rating'),
+            ('Take Notes', 'takes__notes'),
+            ('Take Issues', 'takes__issues'),
+            ('Recorded At', 'takes__created_at'),
+        ]
+        order.append('takes__take_number')
+    rows = Shot.objects.filter(scene__production_id=production_id).order_by(*order)
+    return columns, rows
+
+
+def _call_sheets(production_id, parameters):
+    """One row per scheduled scene of each call sheet."""
+    from apps.call_sheets.models import CallSheet
+
+    columns = [
+        ('Shoot Date', 'shoot_date'),
+        ('Day', 'day_number'),
+        ('Status', 'status'),
+        ('Call Time', 'call_time'),
+        ('Crew Call', 'crew_call_time'),
+        ('Estimated Wrap', 'wrap_time_estimate'),
+        ('Location', 'location_address'),
+        ('Parking', 'parking_info'),
+        ('Weather', 'weather_forecast'),
+        ('Sunrise', 'sunrise_time'),
+        ('Sunset', 'sunset_time'),
+        ('Nearest Hospital', 'nearest_hospital'),
+        ('Safety Notes', 'safety_notes'),
+        ('General Notes', 'general_notes'),
+        ('Scene', 'scenes__scene__scene_number'),
+        ('Scene Name', 'scenes__scene__scene_name'),
+        ('Scheduled Time', 'scenes__scheduled_time'),
+        ('Scene Duration (min)', 'scenes__estimated_duration'),
+        ('Scene Notes', 'scenes__notes'),
+    ]
+    rows = CallSheet.objects.filter(production_id=production_id).order_by(
+        'shoot_date', 'id', 'scenes__sequence_order', 'scenes__id'
+    )
+    return columns, rows
+
+
+def _continuity(production_id, parameters):
+    from apps.continuity.models import ContinuityNote
+
+    columns = [
+        ('Scene', 'scene__scene_number'),
+        ('Category', 'category'),
+        ('Severity', 'severity'),
+        ('Status', 'status'),
+        ('Character', 'actor_character'),
+        ('Description', 'description'),
+        ('Warnings', 'warnings'),
+        ('Created', 'created_at'),
+        ('Updated', 'updated_at'),
+    ]
+    rows = ContinuityNote.objects.filter(scene__production_id=production_id).order_by(
+        'scene__sequence_order', 'scene__scene_number', 'created_at', 'id'
+    )
+    return columns, rows
+
+
+SOURCES = {
+    'scenes_csv': _scenes,
+    'shots_csv': _shots,
+    'call_sheets_csv': _call_sheets,
+    'continuity_csv': _continuity,
+}
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'Yes' if value else 'No'
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ', timespec='seconds')
+    if isinstance(value, time):
+        return value.strftime('%H:%M')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, list):
+        value = '; '.join(str(item) for item in value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # Quoted so a spreadsheet shows the text instead of running it.
+        return f"'{value}"
+    return value
+
+
+class _Line:
+    """File-like object whose write() returns the line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def source_rows(source, production_id, parameters=None):
+    """Header, then the raw value tuples of each row, read in chunks."""
+    columns, queryset = source(production_id, parameters or {})
+    yield [header for header, _ in columns]
+    rows = queryset.values_list(*[lookup for _, lookup in columns])
+    yield from rows.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+
+
+def csv_rows(export_type, production_id, parameters=None):
+    """Header and data rows of a CSV export, as lists of cells."""
+    rows = source_rows(SOURCES[export_type], production_id, parameters)
+    yield next(rows)
+    for row in rows:
+        yield [_cell(value) for value in row]
+
+
+def csv_stream(export_type, production_id, parameters=None):
+    """Text chunks of a CSV export: the header alone, then many rows at a time."""
+    writer = csv.writer(_Line())
+    rows = csv_rows(export_type, production_id, parameters)
+    yield writer.writerow(next(rows))
+    lines = []
+    for row in rows:
+        lines.append(writer.writerow(row))
+        if len(lines) >= settings.EXPORT_CHUNK_SIZE:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+def write_csv(export_type, production_id, path, parameters=None):
+    """Write a CSV export to path, replacing it only once complete."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            for chunk in csv_stream(export_type, production_id, parameters):
+                f.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return path
@@ -0,0 +1,399 @@
+"""
+Export job queue.
+
+Requesting an export only inserts a pending ExportJob. Workers started by
+`python manage.py run_export_worker` claim jobs from the table and run
+them in a pool of processes, so no export runs inside a web request.
+
+Jobs are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent
+workers never take the same job. SQLite has no row locks: there each
+candidate is claimed with an UPDATE conditional on its status, which only
+one worker can win. While a job runs, its worker refreshes heartbeat_at;
+a job whose heartbeat is older than EXPORT_JOB_LEASE (its worker died) is
+claimed again, up to EXPORT_JOB_MAX_ATTEMPTS times. Each claim's attempt
+number fences its outcome: a worker only records the result of a job it
+still holds, so a superseded attempt cannot overwrite a newer one.
+
+Each export type has an exporter in EXPORTERS: a function taking the job
+and returning the path of the finished file under EXPORT_ROOT.
+
+Finished files are reused. A job's cache_key hashes the production's data
+version, the export type and the canonical JSON of its parameters, so it
+changes whenever the production's data does; exports in DATED_EXPORTS
+also key on the day, so they are not reused into the next one. A request
+matching a queued, running or completed job becomes a follower of it
+(source_job) instead of a second export: it shares the job's file and is
+updated with its outcome, and workers only ever claim primary jobs. Files not used for the longest
+are deleted once they take up more than EXPORT_CACHE_MAX_BYTES.
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Max, Q
+from django.utils import timezone
+
+from .models import ExportJob
+
+logger = logging.getLogger(__name__)
+
+
+def export_call_sheet_pdf(job):
+    """PDF of one call sheet: parameters {"call_sheet": id}."""
+    from apps.call_sheets.models import CallSheet
+    from .call_sheet_pdf import render_call_sheet_pdf
+
+    call_sheet_id = job.parameters.get('call_sheet')
+    call_sheet = CallSheet.objects.filter(
+        id=call_sheet_id, production_id=job.production_id
+    ).select_related('production').prefetch_related('scenes__scene', 'cast__cast_member').first()
+    if call_sheet is None:
+        raise ValueError(f"Call sheet {call_sheet_id!r} not found in this production")
+    return render_call_sheet_pdf(call_sheet)
+
+
+def export_csv(job):
+    """Scenes, shots, call sheets or continuity notes as CSV."""
+    from .csv_exports import write_csv
+
+    return write_csv(job.export_type, job.production_id, output_path(job, 'csv'), job.parameters)
+
+
+def export_production_book(job):
+    """Every sheet of the production in one Excel workbook."""
+    from .production_book import write_production_book
+
+    return write_production_book(job.production, output_path(job, 'xlsx'))
+
+
+# export_type -> function(job) returning the path of the finished file
+EXPORTERS = {
+    'scenes_csv': export_csv,
+    'shots_csv': export_csv,
+    'call_sheets_csv': export_csv,
+    'continuity_csv': export_csv,
+    'production_book_excel': export_production_book,
+    'call_sheet_pdf': export_call_sheet_pdf,
+}
+
+
+def output_path(job, extension):
+    """Where an exporter writes a job's file."""
+    return Path(settings.EXPORT_ROOT) / f"production_{job.production_id}" / f"{job.export_type}_{job.id}.{extension}"
+
+
+# Exports whose content also depends on the date, not just the data: the
+# production book's budget sheet has spend to date and billable days.
+DATED_EXPORTS = {'production_book_excel'}
+
+
+def cache_key(production_id, data_version, export_type, parameters, today=None):
+    """Key of an export's output: the same data, type and parameters give the same file."""
+    canonical = json.dumps(parameters, sort_keys=True, separators=(',', ':'), default=str)
+    key = f"{production_id}:{data_version}:{export_type}:{canonical}"
+    if export_type in DATED_EXPORTS:
+        key += f":{(today or timezone.localdate()).isoformat()}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+# Fields a follower copies from its source job.
+SHARED_FIELDS = ['status', 'started_at', 'completed_at', 'file_path', 'file_size', 'error_message']
+
+
+def _follow(source):
+    """Fields of a follower of source, as they stand now."""
+    return {field: getattr(source, field) for field in SHARED_FIELDS}
+
+
+def submit_export(production, user, export_type, parameters=None):
+    """
+    Queue an export; a worker picks it up.
+
+    If an identical export is queued, running or already finished, the new
+    job follows it instead, and is returned completed on a cache hit.
+    """
+    from apps.productions.models import Production
+
+    parameters = parameters or {}
+    with transaction.atomic():
+        # Locking the production serializes submissions for it, so two
+        # identical requests cannot both start an export.
+        data_version = Production.objects.select_for_update().filter(
+            id=production.id
+        ).values_list('data_version', flat=True).get()
+        key = cache_key(production.id, data_version, export_type, parameters)
+
+        source = ExportJob.objects.filter(
+            cache_key=key,
+            source_job__isnull=True,
+            status__in=['pending', 'processing', 'completed'],
+        ).order_by('-created_at').first()
+        if source is not None and source.status == 'completed':
+            if not source.file_path or not job_file(source).is_file():
+                source = None
+            else:
+                source.last_accessed_at = timezone.now()
+                source.save(update_fields=['last_accessed_at'])
+
+        return ExportJob.objects.create(
+            production=production,
+            user=user,
+            export_type=export_type,
+            parameters=parameters,
+            cache_key=key,
+            source_job=source,
+            **(_follow(source) if source is not None else {}),
+        )
+
+
+def _update_followers(job):
+    """Give the pending and running followers of job its current state."""
+    ExportJob.objects.filter(
+        source_job_id=job.id, status__in=['pending', 'processing']
+    ).update(**_follow(job))
+
+
+def _claimable(now):
+    abandoned = now - timedelta(seconds=settings.EXPORT_JOB_LEASE)
+    return Q(source_job__isnull=True) & (Q(status='pending') | Q(
+        status='processing',
+        heartbeat_at__lt=abandoned,
+        attempts__lt=settings.EXPORT_JOB_MAX_ATTEMPTS,
+    ))
+
+
+def fail_abandoned():
+    """Give up on jobs whose workers died on every attempt."""
+    abandoned = timezone.now() - timedelta(seconds=settings.EXPORT_JOB_LEASE)
+    jobs = ExportJob.objects.filter(
+        source_job__isnull=True,
+        status='processing',
+        heartbeat_at__lt=abandoned,
+        attempts__gte=settings.EXPORT_JOB_MAX_ATTEMPTS,
+    )
+    ids = list(jobs.values_list('id', flat=True))
+    return ExportJob.objects.filter(
+        Q(id__in=ids) | Q(source_job_id__in=ids, status__in=['pending', 'processing'])
+    ).update(
+        status='failed',
+        completed_at=timezone.now(),
+        error_message='The export worker stopped while running this job',
+    )
+
+
+def claim_jobs(limit):
+    """
+    Claim up to limit jobs for this worker, oldest first. Returns
+    (job id, attempt) pairs; the attempt fences the claim.
+    """
+    now = timezone.now()
+    claim = {'status': 'processing', 'started_at': now, 'heartbeat_at': now, 'attempts': F('attempts') + 1}
+    candidates = ExportJob.objects.filter(_claimable(now)).order_by('created_at')
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            rows = list(candidates.select_for_update(skip_locked=True).values_list('id', 'attempts')[:limit])
+            ids = [job_id for job_id, _ in rows]
+            ExportJob.objects.filter(id__in=ids).update(**claim)
+            ExportJob.objects.filter(source_job_id__in=ids, status='pending').update(
+                status='processing', started_at=now
+            )
+        return [(job_id, attempts + 1) for job_id, attempts in rows]
+
+    # No row locks: only the worker whose UPDATE still sees the job as it
+    # was read gets it.
+    claimed = []
+    for job_id, job_status, attempts in candidates.values_list('id', 'status', 'attempts')[:limit]:
+        if ExportJob.objects.filter(id=job_id, status=job_status, attempts=attempts).update(**claim):
+            ExportJob.objects.filter(source_job_id=job_id, status='pending').update(
+                status='processing', started_at=now
+            )
+            claimed.append((job_id, attempts + 1))
+    return claimed
+
+
+def _held(job_id, attempt):
+    """The job, if it is still processing under this worker's claim."""
+    return ExportJob.objects.filter(id=job_id, attempts=attempt, status='processing')
+
+
+def heartbeat(claims):
+    """Mark the (job id, attempt) claims this worker still runs as alive."""
+    claims = list(claims)
+    if not claims:
+        return
+    held = Q()
+    for job_id, attempt in claims:
+        held |= Q(id=job_id, attempts=attempt)
+    ExportJob.objects.filter(held, status='processing').update(heartbeat_at=timezone.now())
+
+
+def release_job(job_id, attempt, error):
+    """Put back a job whose worker process died, or fail it after too many attempts."""
+    job = _held(job_id, attempt).first()
+    if job is None:
+        # Another worker has claimed it since.
+        return
+    if job.attempts >= settings.EXPORT_JOB_MAX_ATTEMPTS:
+        job.status = 'failed'
+        job.completed_at = timezone.now()
+        job.error_message = str(error) or 'The export worker stopped while running this job'
+    else:
+        job.status = 'pending'
+    if _held(job_id, attempt).update(
+        status=job.status, completed_at=job.completed_at, error_message=job.error_message
+    ):
+        _update_followers(job)
+
+
+def run_job(job_id, attempt):
+    """Run one claimed job and record the outcome. Returns the job's status."""
+    job = ExportJob.objects.select_related('production').get(id=job_id)
+    try:
+        exporter = EXPORTERS.get(job.export_type)
+        if exporter is None:
+            raise NotImplementedError(f"{job.get_export_type_display()} export is not available")
+        path = Path(exporter(job))
+        job.file_path = str(path.relative_to(settings.EXPORT_ROOT))
+        job.file_size = path.stat().st_size
+    except Exception as e:
+        logger.exception(f"Export job {job.id} ({job.export_type}) failed")
+        job.status = 'failed'
+        job.error_message = str(e) or e.__class__.__name__
+        job.file_path = ''
+        job.file_size = None
+    else:
+        job.status = 'completed'
+        job.error_message = ''
+    job.completed_at = job.last_accessed_at = timezone.now()
+    recorded = _held(job_id, attempt).update(
+        status=job.status,
+        error_message=job.error_message,
+        file_path=job.file_path,
+        file_size=job.file_size,
+        completed_at=job.completed_at,
+        last_accessed_at=job.last_accessed_at,
+    )
+    if not recorded:
+        # The lease ran out and another worker claimed the job; its
+        # outcome is the one that counts.
+        logger.warning(f"Export job {job.id} attempt {attempt} was superseded; outcome discarded")
+        return 'superseded'
+    _update_followers(job)
+    return job.status
+
+
+def job_file(job):
+    """Absolute path of a completed job's file."""
+    return Path(settings.EXPORT_ROOT) / job.file_path
+
+
+def touch_job(job):
+    """Record that a job's file was used, keeping it out of eviction for longer."""
+    ExportJob.objects.filter(id=job.source_job_id or job.id).update(last_accessed_at=timezone.now())
+
+
+def evict_exports(max_bytes=None):
+    """
+    Delete the least recently used export files until the rest fit in
+    max_bytes (EXPORT_CACHE_MAX_BYTES). Jobs that shared a deleted file
+    keep their status but lose their download. Returns the bytes freed.
+    """
+    max_bytes = settings.EXPORT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    files = list(
+        ExportJob.objects.filter(status='completed')
+        .exclude(file_path='')
+        .values('file_path')
+        .annotate(size=Max('file_size'), used=Max('last_accessed_at'))
+        .order_by(F('used').asc(nulls_first=True))
+    )
+    total = sum(entry['size'] or 0 for entry in files)
+    freed = evicted = 0
+    for entry in files:
+        if total - freed <= max_bytes:
+            break
+        (Path(settings.EXPORT_ROOT) / entry['file_path']).unlink(missing_ok=True)
+        ExportJob.objects.filter(file_path=entry['file_path']).update(file_path='', file_size=None)
+        freed += entry['size'] or 0
+        evicted += 1
+    if evicted:
+        logger.info(f"Evicted {evicted} export files ({freed} bytes)")
+    return freed
+
+
+def _init_process():
+    import django
+
+    django.setup()
+
+
+def work(max_workers=None, poll_interval=None, drain=False, on_finish=None):
+    """
+    Claim and run jobs in a pool of worker processes.
+
+    Runs until interrupted, or with drain=True until the queue is empty.
+    on_finish(job_id, status) is called as each job ends; status is
+    'superseded' if the job was reclaimed by another worker meanwhile.
+    """
+    max_workers = max_workers or settings.EXPORT_WORKERS
+    poll_interval = poll_interval or settings.EXPORT_POLL_INTERVAL
+    # Spawned processes open their own database connections.
+    context = multiprocessing.get_context('spawn')
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'claplog.settings')
+
+    # Often enough that a running job never looks abandoned.
+    heartbeat_interval = max(poll_interval, settings.EXPORT_JOB_LEASE / 10)
+    last_heartbeat = time.monotonic()
+
+    while True:
+        with ProcessPoolExecutor(max_workers, mp_context=context, initializer=_init_process) as pool:
+            running = {}
+            try:
+                while True:
+                    fail_abandoned()
+                    if time.monotonic() - last_heartbeat >= heartbeat_interval:
+                        heartbeat(running.values())
+                        last_heartbeat = time.monotonic()
+                    free = max_workers - len(running)
+                    if free:
+                        for claim in claim_jobs(free):
+                            running[pool.submit(run_job, *claim)] = claim
+                    if not running:
+                        if drain:
+                            return
+                        time.sleep(poll_interval)
+                        continue
+
+                    done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        claim = running.pop(future)
+                        job_id = claim[0]
+                        try:
+                            job_status = future.result()
+                        except BrokenProcessPool:
+                            running[future] = claim
+                            raise
+                        except Exception as e:
+                            logger.exception(f"Export job {job_id} could not be run")
+                            release_job(*claim, e)
+                            job_status = 'failed'
+                        if on_finish:
+                            on_finish(job_id, job_status)
+                    if done:
+                        evict_exports()
+            except BrokenProcessPool as e:
+                # A worker process died; its jobs go back in the queue and
+                # a fresh pool takes over.
+                logger.error(f"Export worker process died: {str(e)}")
+                for claim in running.values():
+                    release_job(*claim, e)
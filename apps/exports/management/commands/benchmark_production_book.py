@@ -0,0 +1,136 @@
+"""
+Benchmark the production book export on a synthetic production.
+
+Creates a production with the given number of scenes and shots inside a
+transaction that is rolled back afterwards, then writes its production
+book twice: streamed, as the exporter does, and with every sheet's rows
+loaded into memory first. Runtime, peak traced Python memory and growth
+of the process's peak RSS are reported for both.
+
+Usage:
+    python manage.py benchmark_production_book                  # 10k scenes, 100k shots
+    python manage.py benchmark_production_book --scenes 1000 --shots 10000 --takes 2
+"""
+
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from decimal import Decimal
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.exports.csv_exports import source_rows
+from apps.exports.production_book import SHEETS, write_production_book
+from apps.exports.xlsx import Workbook
+from apps.productions.models import Production
+from apps.scenes.models import Scene
+from apps.shots.models import Shot, Take
+
+
+BATCH_SIZE = 5000
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def write_buffered(production, path):
+    """The production book written from fully loaded row lists, for comparison."""
+    with Workbook(path) as book:
+        for name, source in SHEETS:
+            rows = list(source_rows(source, production.id))
+            book.add_sheet(name, rows[0])
+            for row in rows[1:]:
+                book.append(row)
+
+
+class Command(BaseCommand):
+    help = 'Compare streamed and in-memory production book exports on synthetic data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenes', type=int, default=10000, help='Scenes to create')
+        parser.add_argument('--shots', type=int, default=100000, help='Shots to create, spread over the scenes')
+        parser.add_argument('--takes', type=int, default=0, help='Takes to create per shot')
+
+    def populate(self, options):
+        production = Production.objects.create(title='Production book benchmark')
+        for start in range(0, options['scenes'], BATCH_SIZE):
+            Scene.objects.bulk_create(
+                Scene(
+                    production=production,
+                    scene_number=str(n + 1),
+                    scene_name=f"Scene {n + 1}",
+                    description='Benchmark scene ' * 8,
+                    script_pages=Decimal('1.5'),
+                    estimated_duration=30,
+                    sequence_order=n,
+                )
+                for n in range(start, min(start + BATCH_SIZE, options['scenes']))
+            )
+        # Re-selected: bulk_create() does not return ids on every backend (MySQL).
+        scene_ids = list(Scene.objects.filter(production=production).order_by('id').values_list('id', flat=True))
+
+        for start in range(0, options['shots'], BATCH_SIZE):
+            Shot.objects.bulk_create(
+                Shot(
+                    scene_id=scene_ids[n % len(scene_ids)],
+                    shot_number=str(n // len(scene_ids) + 1),
+                    description='Benchmark shot ' * 4,
+                    lens='50mm',
+                    sequence_order=n // len(scene_ids),
+                )
+                for n in range(start, min(start + BATCH_SIZE, options['shots']))
+            )
+
+        if options['takes']:
+            shot_ids = list(
+                Shot.objects.filter(scene__production=production).order_by('id').values_list('id', flat=True)
+            )
+            for start in range(0, len(shot_ids), BATCH_SIZE):
+                Take.objects.bulk_create(
+                    Take(shot_id=shot_id, take_number=t + 1, duration=20, quality_rating=3)
+                    for shot_id in shot_ids[start:start + BATCH_SIZE] for t in range(options['takes'])
+                )
+        return production
+
+    def measure(self, label, write, production, path):
+        rss_before = peak_rss_mb()
+        start = time.perf_counter()
+        write(production, path)
+        elapsed = time.perf_counter() - start
+        rss_growth = peak_rss_mb() - rss_before
+
+        tracemalloc.start()
+        write(production, path)
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.stdout.write(
+            f"{label:<10} {elapsed:8.2f} s   traced peak {traced_peak / (1024 * 1024):8.1f} MB   "
+            f"peak RSS growth {rss_growth:8.1f} MB   file {os.path.getsize(path) / (1024 * 1024):.1f} MB"
+        )
+
+    def handle(self, *args, **options):
+        options['scenes'] = max(options['scenes'], 1)
+        with transaction.atomic():
+            start = time.perf_counter()
+            production = self.populate(options)
+            self.stdout.write(
+                f"Created {options['scenes']} scenes, {options['shots']} shots and "
+                f"{options['shots'] * options['takes']} takes in {time.perf_counter() - start:.1f} s"
+            )
+
+            with tempfile.TemporaryDirectory() as directory:
+                # Streamed first, so the in-memory run cannot raise its peak RSS.
+                self.measure('streamed', write_production_book, production, Path(directory) / 'streamed.xlsx')
+                self.measure('in-memory', write_buffered, production, Path(directory) / 'buffered.xlsx')
+
+            transaction.set_rollback(True)
@@ -0,0 +1,45 @@
+"""
+Render a week of call sheet PDFs.
+
+Usage:
+    python manage.py render_call_sheets --production 3 --week-of 2026-03-02
+"""
+
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.call_sheets.models import CallSheet
+from apps.exports.call_sheet_pdf import render_call_sheet_pdfs
+
+
+class Command(BaseCommand):
+    help = 'Render call sheet PDFs for one shooting week using a process pool.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--production', type=int, required=True, help='Production id')
+        parser.add_argument(
+            '--week-of',
+            type=date.fromisoformat,
+            default=date.today(),
+            help='Any date in the week to render (YYYY-MM-DD, default: today)'
+        )
+        parser.add_argument('--workers', type=int, default=None, help='Number of render processes')
+
+    def handle(self, *args, **options):
+        week_start = options['week_of'] - timedelta(days=options['week_of'].weekday())
+        week_end = week_start + timedelta(days=6)
+
+        call_sheets = list(
+            CallSheet.objects.filter(
+                production_id=options['production'],
+                shoot_date__range=(week_start, week_end),
+            ).select_related('production').prefetch_related('scenes__scene', 'cast__cast_member')
+        )
+        if not call_sheets:
+            raise CommandError(f"No call sheets between {week_start} and {week_end}")
+
+        paths = render_call_sheet_pdfs(call_sheets, max_workers=options['workers'])
+        for call_sheet in call_sheets:
+            self.stdout.write(f"{call_sheet.shoot_date}: {paths[call_sheet.id]}")
+        self.stdout.write(self.style.SUCCESS(f"Rendered {len(paths)} call sheets"))
@@ -0,0 +1,47 @@
+"""
+Run queued export jobs.
+
+Usage:
+    python manage.py run_export_worker               # keep running
+    python manage.py run_export_worker --workers 4
+    python manage.py run_export_worker --drain       # stop once the queue is empty
+
+Several workers, on one machine or many, can share the queue.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.exports.jobs import work
+
+
+class Command(BaseCommand):
+    help = 'Claim pending export jobs and run them in a pool of worker processes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.EXPORT_WORKERS,
+            help='Number of worker processes'
+        )
+        parser.add_argument(
+            '--poll',
+            type=float,
+            default=settings.EXPORT_POLL_INTERVAL,
+            metavar='SECONDS',
+            help='How often to look for new jobs'
+        )
+        parser.add_argument('--drain', action='store_true', help='Exit when no jobs are left')
+
+    def handle(self, *args, **options):
+        counts = {'completed': 0, 'failed': 0}
+
+        def on_finish(job_id, job_status):
+            counts[job_status] = counts.get(job_status, 0) + 1
+            self.stdout.write(f"Export job {job_id}: {job_status}")
+
+        work(options['workers'], options['poll'], drain=options['drain'], on_finish=on_finish)
+        self.stdout.write(self.style.SUCCESS(
+            f"Exports: {counts['completed']} completed, {counts['failed']} failed"
+        ))
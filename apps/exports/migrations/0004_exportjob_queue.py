@@ -0,0 +1,24 @@
+# Generated by Django 5.0.1 on 2026-10-19 03:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exports", "0003_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportjob",
+            name="attempts",
+            field=models.PositiveSmallIntegerField(
+                default=0, help_text="Times a worker has claimed this job"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="exportjob",
+            index=models.Index(fields=["status", "created_at"], name="export_job_queue_idx"),
+        ),
+    ]
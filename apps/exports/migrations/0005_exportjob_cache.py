@@ -0,0 +1,46 @@
+# Generated by Django 5.0.1 on 2026-10-19 03:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exports", "0004_exportjob_queue"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportjob",
+            name="cache_key",
+            field=models.CharField(
+                blank=True,
+                help_text="Hash of the production data version, export type and parameters",
+                max_length=64,
+            ),
+        ),
+        migrations.AddField(
+            model_name="exportjob",
+            name="source_job",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Identical job whose file this request shares",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="followers",
+                to="exports.exportjob",
+            ),
+        ),
+        migrations.AddField(
+            model_name="exportjob",
+            name="last_accessed_at",
+            field=models.DateTimeField(
+                blank=True, help_text="Last produced, reused or downloaded", null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="exportjob",
+            index=models.Index(fields=["cache_key", "status"], name="export_job_cache_idx"),
+        ),
+    ]
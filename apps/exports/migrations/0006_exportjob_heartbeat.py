@@ -0,0 +1,30 @@
+# Generated by Django 5.0.1 on 2026-10-19 05:40
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def start_heartbeats(apps, schema_editor):
+    # Jobs running now keep the lease they had under started_at.
+    ExportJob = apps.get_model("exports", "ExportJob")
+    ExportJob.objects.filter(status="processing").update(heartbeat_at=F("started_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exports", "0005_exportjob_cache"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Last sign of life from the worker running this job",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(start_heartbeats, migrations.RunPython.noop),
+    ]
@@ -43,14 +43,38 @@ class ExportJob(models.Model):
     file_size = models.BigIntegerField(null=True, blank=True, help_text="Size in bytes")
     error_message = models.TextField(blank=True)
     parameters = models.JSONField(default=dict, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0, help_text="Times a worker has claimed this job")
+    cache_key = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Hash of the production data version, export type and parameters"
+    )
+    source_job = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='followers',
+        help_text="Identical job whose file this request shares"
+    )
+    last_accessed_at = models.DateTimeField(null=True, blank=True, help_text="Last produced, reused or downloaded")
 
     created_at = models.DateTimeField(auto_now_add=True)
     started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Last sign of life from the worker running this job"
+    )
     completed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         db_table = 'export_jobs'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='export_job_queue_idx'),
+            models.Index(fields=['cache_key', 'status'], name='export_job_cache_idx'),
+        ]
 
     def __str__(self):
         return f"{self.get_export_type_display()} - {self.status}"
\ No newline at end of file
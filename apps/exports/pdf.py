@@ -0,0 +1,155 @@
+"""
+Minimal pure-Python PDF writer for ClapLog exports.
+
+Only what the export renderers need: US Letter pages, the built-in
+Helvetica fonts, text runs, horizontal rules and filled bars.
+No third-party dependency, so rendering works offline.
+"""
+
+import zlib
+
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+
+FONTS = {
+    'regular': ('F1', 'Helvetica'),
+    'bold': ('F2', 'Helvetica-Bold'),
+}
+
+# Average Helvetica glyph width as a fraction of the font size.
+# Close enough for column truncation and wrapping.
+AVERAGE_CHAR_WIDTH = 0.5
+
+
+def _escape(text):
+    """Escape a string for use inside a PDF literal string."""
+    text = str(text).replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+    text = text.replace('\r', ' ').replace('\n', ' ').replace('\t', ' ')
+    return text.encode('cp1252', errors='replace')
+
+
+def text_width(text, size):
+    """Approximate rendered width of text in points."""
+    return len(str(text)) * size * AVERAGE_CHAR_WIDTH
+
+
+def wrap_text(text, size, width):
+    """Split text into lines that fit within width points."""
+    max_chars = max(int(width / (size * AVERAGE_CHAR_WIDTH)), 1)
+    lines = []
+    for paragraph in str(text or '').splitlines() or ['']:
+        words = paragraph.split()
+        line = ''
+        for word in words:
+            while len(word) > max_chars:
+                if line:
+                    lines.append(line)
+                    line = ''
+                lines.append(word[:max_chars])
+                word = word[max_chars:]
+            candidate = f"{line} {word}" if line else word
+            if len(candidate) > max_chars:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return lines
+
+
+class PDFDocument:
+    """
+    Build a PDF page by page.
+
+    Coordinates are in points with the origin at the bottom-left corner,
+    as in the PDF specification.
+    """
+
+    def __init__(self, title=''):
+        self.title = title
+        self.pages = []
+        self._ops = None
+
+    def add_page(self):
+        """Start a new page and make it the drawing target."""
+        self._ops = []
+        self.pages.append(self._ops)
+
+    def text(self, x, y, text, size=10, font='regular', color=(0, 0, 0)):
+        """Draw a single line of text."""
+        name = FONTS[font][0]
+        r, g, b = color
+        self._ops.append(
+            b'BT %.3f %.3f %.3f rg /' % (r, g, b) + name.encode()
+            + b' %.1f Tf %.2f %.2f Td (' % (size, x, y) + _escape(text) + b') Tj ET'
+        )
+
+    def line(self, x1, y1, x2, y2, width=0.5, color=(0, 0, 0)):
+        """Draw a straight line."""
+        r, g, b = color
+        self._ops.append(
+            b'%.3f %.3f %.3f RG %.2f w %.2f %.2f m %.2f %.2f l S'
+            % (r, g, b, width, x1, y1, x2, y2)
+        )
+
+    def rect(self, x, y, width, height, color=(0, 0, 0)):
+        """Draw a filled rectangle."""
+        r, g, b = color
+        self._ops.append(
+            b'%.3f %.3f %.3f rg %.2f %.2f %.2f %.2f re f'
+            % (r, g, b, x, y, width, height)
+        )
+
+    def to_bytes(self):
+        """Serialize the document to PDF bytes."""
+        objects = []
+
+        def add(body):
+            objects.append(body)
+            return len(objects)
+
+        catalog_id = add(None)
+        pages_id = add(None)
+        font_ids = {}
+        for name, base_font in FONTS.values():
+            font_ids[name] = add(
+                b'<< /Type /Font /Subtype /Type1 /BaseFont /' + base_font.encode()
+                + b' /Encoding /WinAnsiEncoding >>'
+            )
+        font_refs = b' '.join(b'/%s %d 0 R' % (name.encode(), obj_id) for name, obj_id in font_ids.items())
+
+        page_ids = []
+        for ops in self.pages or [[]]:
+            stream = zlib.compress(b'\n'.join(ops))
+            content_id = add(
+                b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(stream)
+                + stream + b'\nendstream'
+            )
+            page_ids.append(add(
+                b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] ' % (pages_id, PAGE_WIDTH, PAGE_HEIGHT)
+                + b'/Resources << /Font << ' + font_refs + b' >> >> /Contents %d 0 R >>' % content_id
+            ))
+
+        objects[catalog_id - 1] = b'<< /Type /Catalog /Pages %d 0 R >>' % pages_id
+        objects[pages_id - 1] = (
+            b'<< /Type /Pages /Kids [' + b' '.join(b'%d 0 R' % pid for pid in page_ids)
+            + b'] /Count %d >>' % len(page_ids)
+        )
+        info_id = add(b'<< /Title (' + _escape(self.title) + b') /Producer (ClapLog) >>')
+
+        out = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        offsets = []
+        for index, body in enumerate(objects, start=1):
+            offsets.append(len(out))
+            out += b'%d 0 obj\n' % index + body + b'\nendobj\n'
+
+        xref_offset = len(out)
+        out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+        for offset in offsets:
+            out += b'%010d 00000 n \n' % offset
+        out += (
+            b'trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+            % (len(objects) + 1, catalog_id, info_id, xref_offset)
+        )
+        return bytes(out)
@@ -0,0 +1,128 @@
+"""
+Production book: one Excel workbook with a production's scenes, shots,
+takes, cast, props, continuity notes, call sheets and budget rollup.
+
+Each sheet is fed from a chunked values_list() iterator straight into the
+streaming XLSX writer, so peak memory does not depend on how big the
+production is. Scenes, shots, call sheets and continuity notes use the
+same columns as their CSV exports.
+"""
+
+import os
+from decimal import Decimal
+
+from .csv_exports import SOURCES, source_rows
+from .xlsx import Workbook
+
+
+def _takes(production_id, parameters):
+    from apps.shots.models import Take
+
+    columns = [
+        ('Scene', 'shot__scene__scene_number'),
+        ('Shot', 'shot__shot_number'),
+        ('Take', 'take_number'),
+        ('Duration (s)', 'duration'),
+        ('Selected', 'is_selected'),
+        ('Rating', 'quality_rating'),
+        ('Notes', 'notes'),
+        ('Issues', 'issues'),
+        ('Recorded At', 'created_at'),
+    ]
+    rows = Take.objects.filter(shot__scene__production_id=production_id).order_by(
+        'shot__scene__sequence_order', 'shot__scene__scene_number',
+        'shot__sequence_order', 'shot__shot_number', 'shot_id', 'take_number',
+    )
+    return columns, rows
+
+
+def _cast(production_id, parameters):
+    from apps.call_sheets.models import CastMember
+
+    columns = [
+        ('Name', 'name'),
+        ('Character', 'character_name'),
+        ('Role', 'role_type'),
+        ('Phone', 'contact_phone'),
+        ('Email', 'contact_email'),
+        ('Notes', 'notes'),
+    ]
+    rows = CastMember.objects.filter(production_id=production_id).order_by('name', 'id')
+    return columns, rows
+
+
+def _props(production_id, parameters):
+    from apps.props.models import Prop
+
+    columns = [
+        ('Name', 'name'),
+        ('Category', 'category'),
+        ('Scene', 'scene__scene_number'),
+        ('Status', 'status'),
+        ('Quantity', 'quantity'),
+        ('Cost', 'cost'),
+        ('Source', 'source'),
+        ('Rented', 'is_rented'),
+        ('Return Date', 'rental_return_date'),
+        ('Brand/Model', 'brand_model'),
+        ('Color', 'color'),
+        ('Size', 'size_dimensions'),
+        ('Hero Prop', 'hero_prop'),
+        ('Continuity Notes', 'continuity_notes'),
+        ('Description', 'description'),
+        ('Notes', 'notes'),
+    ]
+    rows = Prop.objects.filter(production_id=production_id).order_by('category', 'name', 'id')
+    return columns, rows
+
+
+SHEETS = [
+    ('Scenes', SOURCES['scenes_csv']),
+    ('Shots', SOURCES['shots_csv']),
+    ('Takes', _takes),
+    ('Cast', _cast),
+    ('Props', _props),
+    ('Continuity', SOURCES['continuity_csv']),
+    ('Call Sheets', SOURCES['call_sheets_csv']),
+]
+
+
+def _amount(value):
+    return Decimal(value) if value is not None else None
+
+
+def _budget_rows(production):
+    """Summary figures, then prop and equipment spend by category."""
+    from apps.productions.budget import budget_report
+
+    report = budget_report(production)
+    yield ['Budget', None, None, None, _amount(report['budget'])]
+    yield ['Committed', None, None, None, _amount(report['committed'])]
+    yield ['Spent to date', None, None, None, _amount(report['spent_to_date'])]
+    yield ['Remaining', None, None, None, _amount(report['remaining'])]
+    for entry in report['props']['by_category']:
+        yield ['Props', entry['category'], entry['count'], entry['quantity'], _amount(entry['cost'])]
+    for entry in report['equipment']['by_category']:
+        yield ['Equipment', entry['category'], entry['checkouts'], entry['billable_days'], _amount(entry['cost'])]
+
+
+def write_production_book(production, path):
+    """Write the production book to path, replacing it only once complete."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with Workbook(tmp_path) as book:
+            for name, source in SHEETS:
+                rows = source_rows(source, production.id)
+                book.add_sheet(name, next(rows))
+                for row in rows:
+                    book.append(row)
+
+            book.add_sheet('Budget', ['Section', 'Category', 'Items / Checkouts', 'Quantity / Days', 'Amount'])
+            for row in _budget_rows(production):
+                book.append(row)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return path
@@ -0,0 +1,49 @@
+"""
+Export serializers for ClapLog API.
+"""
+
+from rest_framework import serializers
+from .models import ExportJob
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    """Export job with its progress."""
+
+    export_type_display = serializers.CharField(source='get_export_type_display', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id',
+            'production',
+            'export_type',
+            'export_type_display',
+            'parameters',
+            'status',
+            'status_display',
+            'file_size',
+            'error_message',
+            'attempts',
+            'created_at',
+            'started_at',
+            'completed_at',
+            'download_url',
+        ]
+        read_only_fields = [
+            'id', 'status', 'file_size', 'error_message', 'attempts',
+            'created_at', 'started_at', 'completed_at',
+        ]
+
+    def get_download_url(self, obj):
+        if obj.status != 'completed' or not obj.file_path:
+            return None
+        request = self.context.get('request')
+        url = f"/api/exports/{obj.id}/download/"
+        return request.build_absolute_uri(url) if request else url
+
+    def validate_parameters(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Parameters must be an object.")
+        return value
@@ -0,0 +1,13 @@
+"""
+Exports URL configuration.
+"""
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import ExportJobViewSet
+
+router = DefaultRouter()
+router.register(r'exports', ExportJobViewSet, basename='export')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -1,3 +1,111 @@
-from django.shortcuts import render
+"""
+Export API views.
+"""
 
-# Create your views here.
+import mimetypes
+
+from django.http import Http404, StreamingHttpResponse
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from apps.core.utils import ranged_file_response, user_production_ids
+from apps.productions.models import Production
+from .csv_exports import CSV_EXPORT_TYPES, csv_stream
+from .jobs import job_file, submit_export, touch_job
+from .models import ExportJob
+from .serializers import ExportJobSerializer
+
+
+class ExportJobViewSet(mixins.CreateModelMixin,
+                       mixins.RetrieveModelMixin,
+                       mixins.ListModelMixin,
+                       viewsets.GenericViewSet):
+    """
+    Export jobs of the current user.
+
+    create: queue an export and return at once with the pending job.
+
+        POST /api/exports/ {"production": 1, "export_type": "scenes_csv", "parameters": {}}
+
+    retrieve: poll a job until its status is completed or failed, then
+    fetch the file from download_url. A request identical to an earlier one
+    on unchanged data shares its job, and may come back already completed.
+    """
+    serializer_class = ExportJobSerializer
+    permission_classes = [IsAuthenticated]
+    filterset_fields = ['production', 'export_type', 'status']
+    ordering_fields = ['created_at', 'completed_at']
+
+    def get_queryset(self):
+        return ExportJob.objects.filter(user=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        production = data['production']
+        if not Production.objects.filter(id=production.id, id__in=user_production_ids(request.user)).exists():
+            return Response({'error': 'Production not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        job = submit_export(production, request.user, data['export_type'], data.get('parameters'))
+        # A cache hit is ready to download at once.
+        code = status.HTTP_201_CREATED if job.status == 'completed' else status.HTTP_202_ACCEPTED
+        return Response(self.get_serializer(job).data, status=code)
+
+    @action(detail=False, methods=['get'])
+    def stream(self, request):
+        """
+        GET /api/exports/stream/?production=1&export_type=shots_csv[&takes=1]
+        A CSV export streamed straight to the client without queueing a job.
+        Rows are sent as they are read, so the download starts at once.
+        """
+        export_type = request.query_params.get('export_type')
+        if export_type not in CSV_EXPORT_TYPES:
+            return Response(
+                {'error': f"export_type must be one of {', '.join(CSV_EXPORT_TYPES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            production_id = int(request.query_params['production'])
+        except (KeyError, ValueError):
+            return Response({'error': 'production must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        if not Production.objects.filter(id=production_id, id__in=user_production_ids(request.user)).exists():
+            return Response({'error': 'Production not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        parameters = {'takes': request.query_params.get('takes') in ('1', 'true')}
+        response = StreamingHttpResponse(
+            csv_stream(export_type, production_id, parameters),
+            content_type='text/csv; charset=utf-8',
+        )
+        filename = f"production_{production_id}_{export_type[:-len('_csv')]}.csv"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """
+        GET /api/exports/{id}/download/
+        The finished file; 409 while the job is still pending or running.
+        """
+        job = self.get_object()
+        if job.status != 'completed':
+            return Response(
+                {'error': f"Export is {job.get_status_display().lower()}"},
+                status=status.HTTP_409_CONFLICT
+            )
+        path = job_file(job)
+        if not job.file_path or not path.is_file():
+            raise Http404('Export file no longer exists')
+        touch_job(job)
+
+        content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        response = ranged_file_response(
+            request, path, content_type, etag=f'"export-{job.id}-{job.file_size}"',
+            cache_control='private, max-age=3600',
+        )
+        extension = path.suffix
+        response['Content-Disposition'] = f'attachment; filename="{job.export_type}_{job.id}{extension}"'
+        return response
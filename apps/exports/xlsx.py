@@ -0,0 +1,251 @@
+"""
+Minimal pure-Python streaming XLSX writer for ClapLog exports.
+
+Only what the production book needs: several sheets of rows with a bold
+header row, holding text, numbers, booleans and dates. No third-party
+dependency, like the PDF writer.
+
+The writer is write-only. Each sheet is written row by row straight into
+its entry in the zip file, and text is stored inline rather than in a
+shared strings table. Nothing but the sheet names is kept in memory, so
+a workbook of any size is written in constant memory. Sheets are written
+one after the other: add_sheet() finishes the previous one.
+"""
+
+import re
+import zipfile
+from datetime import date, datetime, time
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+
+MAX_SHEET_NAME = 31
+BUFFER_SIZE = 64 * 1024  # bytes of row XML collected before writing to the zip entry
+MAX_CELL_TEXT = 32767
+EXCEL_EPOCH = datetime(1899, 12, 30)
+
+# Control characters XML 1.0 does not allow.
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Cell style ids in STYLES: header, date, date and time, time.
+HEADER, DATE, DATETIME, TIME = 1, 2, 3, 4
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '{sheets}'
+    '</Types>'
+)
+SHEET_CONTENT_TYPE = (
+    '<Override PartName="/xl/worksheets/sheet{n}.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+)
+ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets>{sheets}</sheets></workbook>'
+)
+WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '{sheets}'
+    '<Relationship Id="rIdStyles" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="2">'
+    '<numFmt numFmtId="164" formatCode="yyyy-mm-dd hh:mm"/>'
+    '<numFmt numFmtId="165" formatCode="hh:mm"/>'
+    '</numFmts>'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="5">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '</cellXfs>'
+    '</styleSheet>'
+)
+SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetViews><sheetView workbookViewId="0">'
+    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    '</sheetView></sheetViews>'
+    '<sheetData>'
+)
+SHEET_END = '</sheetData></worksheet>'
+
+
+def column_letter(index):
+    """Spreadsheet column name of a 0-based column index (0 -> A, 26 -> AA)."""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _serial(value):
+    """Excel serial day number of a date, datetime or time."""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.replace(tzinfo=None)
+        delta = value - EXCEL_EPOCH
+        return delta.days + delta.seconds / 86400
+    if isinstance(value, date):
+        return (value - EXCEL_EPOCH.date()).days
+    return (value.hour * 3600 + value.minute * 60 + value.second) / 86400
+
+
+def _text(value):
+    return _INVALID_XML.sub('', escape(str(value)[:MAX_CELL_TEXT]))
+
+
+def _cell(ref, value, style=0):
+    if value is None or value == '':
+        return ''
+    s = f' s="{style}"' if style else ''
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"{s}><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        return f'<c r="{ref}"{s}><v>{value}</v></c>'
+    if isinstance(value, datetime):
+        return f'<c r="{ref}" s="{style or DATETIME}"><v>{_serial(value)}</v></c>'
+    if isinstance(value, date):
+        return f'<c r="{ref}" s="{style or DATE}"><v>{_serial(value)}</v></c>'
+    if isinstance(value, time):
+        return f'<c r="{ref}" s="{style or TIME}"><v>{_serial(value)}</v></c>'
+    if isinstance(value, (list, tuple)):
+        value = '; '.join(str(item) for item in value)
+    return f'<c r="{ref}" t="inlineStr"{s}><is><t xml:space="preserve">{_text(value)}</t></is></c>'
+
+
+class Workbook:
+    """
+    Write-only workbook.
+
+        with Workbook(path) as book:
+            book.add_sheet('Scenes', ['Scene', 'Pages'])
+            for row in rows:
+                book.append(row)
+    """
+
+    def __init__(self, file):
+        self._zip = zipfile.ZipFile(file, 'w', compression=zipfile.ZIP_DEFLATED)
+        self._sheets = []
+        self._stream = None
+        self._buffer = []
+        self._buffered = 0
+        self._row = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            if self._stream is not None:
+                self._stream.close()
+            self._zip.close()
+
+    def _flush(self):
+        if self._buffer:
+            self._stream.write(''.join(self._buffer).encode())
+            self._buffer = []
+            self._buffered = 0
+
+    def _finish_sheet(self):
+        if self._stream is not None:
+            self._flush()
+            self._stream.write(SHEET_END.encode())
+            self._stream.close()
+            self._stream = None
+
+    def _unique_name(self, name):
+        for char in '[]:*?/\\':
+            name = name.replace(char, ' ')
+        name = name[:MAX_SHEET_NAME] or 'Sheet'
+        taken = {existing.lower() for existing in self._sheets}
+        candidate, n = name, 2
+        while candidate.lower() in taken:
+            suffix = f" ({n})"
+            candidate = name[:MAX_SHEET_NAME - len(suffix)] + suffix
+            n += 1
+        return candidate
+
+    def add_sheet(self, name, header=None):
+        """Start a new sheet, finishing the current one, with an optional bold header row."""
+        self._finish_sheet()
+        self._sheets.append(self._unique_name(name))
+        self._stream = self._zip.open(f"xl/worksheets/sheet{len(self._sheets)}.xml", 'w', force_zip64=True)
+        self._stream.write(SHEET_START.encode())
+        self._row = 0
+        if header:
+            self.append(header, style=HEADER)
+
+    def append(self, values, style=0):
+        """Add a row to the current sheet."""
+        self._row += 1
+        cells = ''.join(
+            _cell(f"{column_letter(i)}{self._row}", value, style)
+            for i, value in enumerate(values)
+        )
+        row = f'<row r="{self._row}">{cells}</row>'
+        self._buffer.append(row)
+        self._buffered += len(row)
+        if self._buffered >= BUFFER_SIZE:
+            self._flush()
+
+    def close(self):
+        if self._zip is None:
+            return
+        if not self._sheets:
+            self.add_sheet('Sheet')
+        self._finish_sheet()
+
+        names = self._sheets
+        self._zip.writestr('[Content_Types].xml', CONTENT_TYPES.format(sheets=''.join(
+            SHEET_CONTENT_TYPE.format(n=n) for n in range(1, len(names) + 1)
+        )))
+        self._zip.writestr('_rels/.rels', ROOT_RELS)
+        self._zip.writestr('xl/workbook.xml', WORKBOOK.format(sheets=''.join(
+            f'<sheet name="{escape(name, {chr(34): "&quot;"})}" sheetId="{n}" r:id="rId{n}"/>'
+            for n, name in enumerate(names, start=1)
+        )))
+        self._zip.writestr('xl/_rels/workbook.xml.rels', WORKBOOK_RELS.format(sheets=''.join(
+            f'<Relationship Id="rId{n}" '
+            f'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+            f'Target="worksheets/sheet{n}.xml"/>'
+            for n in range(1, len(names) + 1)
+        )))
+        self._zip.writestr('xl/styles.xml', STYLES)
+        self._zip.close()
+        self._zip = None
@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class ProductionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.productions'
-    verbose_name = 'Productions'
\ No newline at end of file
+    verbose_name = 'Productions'
+
+    def ready(self):
+        from . import signals  # noqa: F401
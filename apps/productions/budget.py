@@ -0,0 +1,260 @@
+"""
+Budget rollup: production spend against Production.budget.
+
+Spend has two sources:
+
+* Props: cost x quantity, summed in SQL by category, status, scene and
+  the day the prop was added, all from one grouped query.
+* Equipment: each checkout bills the item's daily_rate once per
+  scheduled shoot day (non-cancelled call sheet) inside the checkout
+  window, and at least one day. An unreturned item is billed through
+  its due date, or through today if it is overdue or has no due date.
+
+Both sections are materialized in BudgetRollup. Signals mark a section
+stale when a prop, equipment item, checkout, call sheet or scene
+changes, and a read only recomputes the stale sections. The equipment
+section is also refreshed once a day, since open checkouts accrue days.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .conflicts import checkout_end
+from .models import BudgetRollup
+
+
+ZERO = Decimal('0.00')
+
+
+def _money(value):
+    return f"{(value or ZERO):.2f}"
+
+
+def _rollup(rows, key, label=None):
+    """Sum grouped rows into one entry per key, largest cost first."""
+    totals = {}
+    for row in rows:
+        entry = totals.setdefault(row[key], {
+            key: row[key],
+            **({label: row[label]} if label else {}),
+            'count': 0,
+            'quantity': 0,
+            'cost': ZERO,
+        })
+        entry['count'] += row['count']
+        entry['quantity'] += row['total_quantity'] or 0
+        entry['cost'] += row['total_cost'] or ZERO
+    return [
+        {**entry, 'cost': _money(entry['cost'])}
+        for entry in sorted(totals.values(), key=lambda e: (-e['cost'], str(e[key])))
+    ]
+
+
+def compute_props_section(production_id):
+    """Prop spend by category, status, scene and day, from one GROUP BY."""
+    from apps.props.models import Prop
+
+    line_cost = ExpressionWrapper(
+        F('cost') * F('quantity'),
+        output_field=DecimalField(max_digits=14, decimal_places=2)
+    )
+    rows = list(
+        Prop.objects.filter(production_id=production_id).annotate(
+            day=TruncDate('created_at')
+        ).values(
+            'category', 'status', 'scene', 'day', scene_number=F('scene__scene_number')
+        ).annotate(
+            count=Count('id'),
+            total_quantity=Sum('quantity'),
+            total_cost=Sum(line_cost),
+        ).order_by()
+    )
+
+    by_day = defaultdict(lambda: ZERO)
+    for row in rows:
+        by_day[row['day'].isoformat()] += row['total_cost'] or ZERO
+
+    return {
+        'total': _money(sum((row['total_cost'] or ZERO for row in rows), ZERO)),
+        'by_category': _rollup(rows, 'category'),
+        'by_status': _rollup(rows, 'status'),
+        'by_scene': _rollup(rows, 'scene', 'scene_number'),
+        'by_day': {day: _money(cost) for day, cost in sorted(by_day.items())},
+    }
+
+
+def shoot_days(production_id):
+    """Sorted dates of the production's non-cancelled call sheets."""
+    from apps.call_sheets.models import CallSheet
+
+    return sorted(set(
+        CallSheet.objects.filter(
+            production_id=production_id
+        ).exclude(
+            status='cancelled'
+        ).values_list('shoot_date', flat=True)
+    ))
+
+
+def billable_days(start, end, days):
+    """Scheduled shoot days within [start, end], or the start day if none."""
+    billed = days[bisect_left(days, start):bisect_right(days, end)]
+    return billed or [start]
+
+
+def compute_equipment_section(production_id, today=None):
+    """Equipment rental spend by category and day."""
+    from apps.equipment.models import EquipmentCheckout
+
+    now = timezone.now()
+    today = today or timezone.localdate()
+    days = shoot_days(production_id)
+
+    checkouts = EquipmentCheckout.objects.filter(
+        equipment__production_id=production_id,
+        equipment__daily_rate__isnull=False,
+    ).values(
+        'equipment__category', 'equipment__daily_rate',
+        'checked_out_at', 'due_back_at', 'returned_at',
+    )
+
+    by_category = {}
+    by_day = defaultdict(lambda: ZERO)
+    for row in checkouts:
+        end = checkout_end(row['returned_at'], row['due_back_at'], now) or now
+        start_day = timezone.localdate(row['checked_out_at'])
+        billed = billable_days(start_day, max(timezone.localdate(end), start_day), days)
+
+        rate = row['equipment__daily_rate']
+        entry = by_category.setdefault(row['equipment__category'], {
+            'category': row['equipment__category'],
+            'checkouts': 0,
+            'billable_days': 0,
+            'cost': ZERO,
+        })
+        entry['checkouts'] += 1
+        entry['billable_days'] += len(billed)
+        entry['cost'] += rate * len(billed)
+        for day in billed:
+            by_day[day.isoformat()] += rate
+
+    return {
+        'total': _money(sum((entry['cost'] for entry in by_category.values()), ZERO)),
+        'by_category': [
+            {**entry, 'cost': _money(entry['cost'])}
+            for entry in sorted(by_category.values(), key=lambda e: (-e['cost'], e['category']))
+        ],
+        'by_day': {day: _money(cost) for day, cost in sorted(by_day.items())},
+        'shoot_days': [day.isoformat() for day in days],
+    }
+
+
+def refresh_budget_rollup(production_id, force=False):
+    """
+    Recompute the stale sections of a production's rollup and return it.
+
+    A section is marked fresh before it is computed, so a change that
+    lands while it is being computed marks it stale again.
+    """
+    rollup, _ = BudgetRollup.objects.get_or_create(production_id=production_id)
+    today = timezone.localdate()
+    rollups = BudgetRollup.objects.filter(production_id=production_id)
+    fields = []
+
+    if force or rollup.props_stale:
+        rollups.update(props_stale=False)
+        rollup.props = compute_props_section(production_id)
+        fields.append('props')
+
+    if force or rollup.equipment_stale or rollup.equipment_computed_on != today:
+        rollups.update(equipment_stale=False, equipment_computed_on=today)
+        rollup.equipment = compute_equipment_section(production_id, today)
+        fields.append('equipment')
+
+    if fields:
+        rollup.props_stale = rollup.equipment_stale = False
+        rollup.save(update_fields=fields + ['updated_at'])
+    return rollup
+
+
+def burn_series(production, rollup):
+    """
+    Daily and cumulative spend, with the planned burn for comparison.
+
+    The plan spreads the budget evenly over the scheduled shoot days, or
+    over start_date..end_date when nothing is scheduled yet.
+    """
+    props_by_day = rollup.props.get('by_day', {})
+    equipment_by_day = rollup.equipment.get('by_day', {})
+    days = sorted(set(props_by_day) | set(equipment_by_day))
+
+    budget = production.budget
+    planned = None  # day -> planned cumulative spend, when there is a plan
+    if budget:
+        scheduled = rollup.equipment.get('shoot_days', [])
+        if scheduled:
+            def by_shoot_day(day):
+                return budget * bisect_right(scheduled, day) / len(scheduled)
+            planned = by_shoot_day
+        elif production.start_date and production.end_date and production.end_date >= production.start_date:
+            span = (production.end_date - production.start_date).days + 1
+
+            def by_calendar_day(day):
+                elapsed = (date.fromisoformat(day) - production.start_date).days + 1
+                return budget * min(max(elapsed, 0), span) / span
+            planned = by_calendar_day
+
+    series = []
+    cumulative = ZERO
+    for day in days:
+        props = Decimal(props_by_day.get(day, '0'))
+        equipment = Decimal(equipment_by_day.get(day, '0'))
+        cumulative += props + equipment
+        series.append({
+            'date': day,
+            'props': _money(props),
+            'equipment': _money(equipment),
+            'total': _money(props + equipment),
+            'cumulative': _money(cumulative),
+            'planned_cumulative': _money(planned(day)) if planned else None,
+        })
+    return series
+
+
+def budget_report(production):
+    """Budget vs spend for a production, refreshing stale rollup sections."""
+    rollup = refresh_budget_rollup(production.id)
+    props_total = Decimal(rollup.props['total'])
+    equipment_total = Decimal(rollup.equipment['total'])
+    committed = props_total + equipment_total
+
+    today = timezone.localdate().isoformat()
+    series = burn_series(production, rollup)
+    spent_to_date = next(
+        (Decimal(entry['cumulative']) for entry in reversed(series) if entry['date'] <= today),
+        ZERO,
+    )
+
+    budget = production.budget
+    return {
+        'production_id': production.id,
+        'budget': _money(budget) if budget is not None else None,
+        'committed': _money(committed),
+        'spent_to_date': _money(spent_to_date),
+        'remaining': _money(budget - committed) if budget is not None else None,
+        'percent_committed': float(round(committed / budget * 100, 1)) if budget else None,
+        'props': {key: value for key, value in rollup.props.items() if key != 'by_day'},
+        'equipment': {
+            key: value for key, value in rollup.equipment.items()
+            if key not in ('by_day', 'shoot_days')
+        },
+        'burn': series,
+        'updated_at': rollup.updated_at,
+    }
+
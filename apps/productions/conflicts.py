@@ -0,0 +1,319 @@
+"""
+Scheduling conflict detection for ClapLog.
+
+Builds per-production interval indexes over cast call windows, equipment
+checkouts and scheduled scenes, and reports every overlap with a sweep
+over intervals sorted by start time (O(n log n + conflicts)).
+"""
+
+import heapq
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+
+def find_overlaps(intervals, capacity=1):
+    """
+    Find intervals that overlap more than `capacity` others with the same key.
+
+    Args:
+        intervals: iterable of (key, start, end, ref); `end` may be None
+            for an open-ended interval. Intervals are half-open [start, end).
+        capacity: how many intervals with the same key may overlap, either
+            an int or a dict of key -> int.
+
+    Yields:
+        (key, ref, [refs of earlier overlapping intervals]) for every
+        interval that exceeds the capacity when it starts.
+    """
+    by_key = defaultdict(list)
+    for key, start, end, ref in intervals:
+        by_key[key].append((start, end, ref))
+
+    for key, items in by_key.items():
+        limit = capacity.get(key, 1) if isinstance(capacity, dict) else capacity
+        items.sort(key=lambda item: item[0])
+        # Min-heap of active intervals by end; open-ended ones sort last.
+        active = []
+        for order, (start, end, ref) in enumerate(items):
+            while active and active[0][0][0] == 0 and active[0][0][1] <= start:
+                heapq.heappop(active)
+            if len(active) >= limit:
+                yield key, ref, [entry[2] for entry in active]
+            heapq.heappush(active, ((0, end) if end is not None else (1, None), order, ref))
+
+
+def checkout_end(returned_at, due_back_at, now):
+    """
+    When a checkout stops occupying its equipment.
+
+    Unreturned items are out until their due date, and overdue ones are
+    still out now; without a due date they are out indefinitely.
+    """
+    if returned_at:
+        return returned_at
+    if due_back_at:
+        return max(due_back_at, now)
+    return None
+
+
+def cast_window(shoot_date, call_time, wrap_time=None):
+    """A cast member is booked from their call until wrap, or end of day."""
+    start = datetime.combine(shoot_date, call_time)
+    if wrap_time and wrap_time > call_time:
+        end = datetime.combine(shoot_date, wrap_time)
+    else:
+        end = datetime.combine(shoot_date + timedelta(days=1), time.min)
+    return start, end
+
+
+def scene_window(scene):
+    """Scheduled window of a scene, or None if it has no call time."""
+    if not scene['shooting_date'] or not scene['call_time']:
+        return None
+    start = datetime.combine(scene['shooting_date'], scene['call_time'])
+    if scene['wrap_time'] and scene['wrap_time'] > scene['call_time']:
+        end = datetime.combine(scene['shooting_date'], scene['wrap_time'])
+    else:
+        end = start + timedelta(minutes=scene['estimated_duration'] or 60)
+    return start, end
+
+
+def cast_conflicts(production_id):
+    """Cast members booked on overlapping call windows."""
+    from apps.call_sheets.models import CallSheetCast
+
+    bookings = CallSheetCast.objects.filter(
+        call_sheet__production_id=production_id
+    ).exclude(
+        status='cancelled'
+    ).exclude(
+        call_sheet__status='cancelled'
+    ).values(
+        'id', 'cast_member_id', 'cast_member__name', 'call_time',
+        'call_sheet_id', 'call_sheet__shoot_date', 'call_sheet__wrap_time_estimate',
+    )
+
+    rows = {}
+    intervals = []
+    for row in bookings:
+        rows[row['id']] = row
+        start, end = cast_window(row['call_sheet__shoot_date'], row['call_time'], row['call_sheet__wrap_time_estimate'])
+        intervals.append((row['cast_member_id'], start, end, row['id']))
+
+    conflicts = []
+    for cast_member_id, booking_id, overlapping in find_overlaps(intervals):
+        booking = rows[booking_id]
+        for other_id in overlapping:
+            other = rows[other_id]
+            conflicts.append({
+                'type': 'cast_double_booking',
+                'cast_member': cast_member_id,
+                'cast_name': booking['cast_member__name'],
+                'date': booking['call_sheet__shoot_date'],
+                'call_sheets': sorted({other['call_sheet_id'], booking['call_sheet_id']}),
+                'bookings': [other_id, booking_id],
+                'message': (
+                    f"{booking['cast_member__name']} is booked at {other['call_time']:%H:%M} "
+                    f"and {booking['call_time']:%H:%M} on {booking['call_sheet__shoot_date']}"
+                ),
+            })
+    return conflicts
+
+
+def equipment_conflicts(production_id):
+    """Equipment checked out more times than its quantity at once."""
+    from apps.equipment.models import EquipmentCheckout
+
+    checkouts = EquipmentCheckout.objects.filter(
+        equipment__production_id=production_id
+    ).values(
+        'id', 'equipment_id', 'equipment__name', 'equipment__quantity',
+        'checked_out_at', 'due_back_at', 'returned_at',
+    )
+
+    now = timezone.now()
+    rows = {}
+    capacity = {}
+    intervals = []
+    for row in checkouts:
+        rows[row['id']] = row
+        capacity[row['equipment_id']] = max(row['equipment__quantity'], 1)
+        end = checkout_end(row['returned_at'], row['due_back_at'], now)
+        intervals.append((row['equipment_id'], row['checked_out_at'], end, row['id']))
+
+    conflicts = []
+    for equipment_id, checkout_id, overlapping in find_overlaps(intervals, capacity=capacity):
+        checkout = rows[checkout_id]
+        conflicts.append({
+            'type': 'equipment_overbooked',
+            'equipment': equipment_id,
+            'equipment_name': checkout['equipment__name'],
+            'quantity': capacity[equipment_id],
+            'checkouts': overlapping + [checkout_id],
+            'message': (
+                f"{checkout['equipment__name']} has {len(overlapping) + 1} overlapping checkouts "
+                f"from {checkout['checked_out_at']:%Y-%m-%d %H:%M} but quantity is {capacity[equipment_id]}"
+            ),
+        })
+    return conflicts
+
+
+def location_conflicts(production_id):
+    """Scenes scheduled at different locations at the same time."""
+    from apps.scenes.models import Scene
+
+    scenes = Scene.objects.filter(
+        production_id=production_id,
+        shooting_date__isnull=False,
+        call_time__isnull=False,
+    ).exclude(
+        status='cancelled'
+    ).values(
+        'id', 'scene_number', 'location_text', 'shooting_date',
+        'call_time', 'wrap_time', 'estimated_duration',
+    )
+
+    rows = {}
+    intervals = []
+    for row in scenes:
+        rows[row['id']] = row
+        start, end = scene_window(row)
+        intervals.append((row['shooting_date'], start, end, row['id']))
+
+    conflicts = []
+    # A unit can shoot several scenes at once only if they share a location,
+    # so collect every overlap and keep the ones that need a company move.
+    for shooting_date, scene_id, overlapping in find_overlaps(intervals):
+        scene = rows[scene_id]
+        for other_id in overlapping:
+            other = rows[other_id]
+            if other['location_text'].strip().lower() == scene['location_text'].strip().lower():
+                continue
+            conflicts.append({
+                'type': 'location_clash',
+                'date': shooting_date,
+                'scenes': [other_id, scene_id],
+                'message': (
+                    f"Scene {other['scene_number']} ({other['location_text'] or 'no location'}) and "
+                    f"scene {scene['scene_number']} ({scene['location_text'] or 'no location'}) "
+                    f"overlap on {shooting_date}"
+                ),
+            })
+    return conflicts
+
+
+def production_conflicts(production_id):
+    """All scheduling conflicts of a production, grouped by kind."""
+    return {
+        'cast': cast_conflicts(production_id),
+        'equipment': equipment_conflicts(production_id),
+        'locations': location_conflicts(production_id),
+    }
+
+
+def validate_cast_booking(call_sheet, cast_member_id, call_time, exclude_id=None):
+    """
+    Raise ValidationError if a cast member would be double-booked.
+
+    Only the cast member's bookings on the same shoot date are loaded.
+    """
+    from apps.call_sheets.models import CallSheetCast
+
+    start, end = cast_window(call_sheet.shoot_date, call_time, call_sheet.wrap_time_estimate)
+    others = CallSheetCast.objects.filter(
+        cast_member_id=cast_member_id,
+        call_sheet__shoot_date=call_sheet.shoot_date,
+    ).exclude(
+        status='cancelled'
+    ).exclude(
+        call_sheet__status='cancelled'
+    ).select_related('call_sheet')
+    if exclude_id:
+        others = others.exclude(id=exclude_id)
+
+    for other in others:
+        other_start, other_end = cast_window(
+            other.call_sheet.shoot_date, other.call_time, other.call_sheet.wrap_time_estimate
+        )
+        if other_start < end and start < other_end:
+            raise ValidationError(
+                f"Cast member is already booked at {other.call_time:%H:%M} "
+                f"on call sheet {other.call_sheet_id} for {call_sheet.shoot_date}."
+            )
+
+
+def overlapping_checkouts(checkouts, start, end=None, now=None):
+    """
+    Narrow a checkout queryset to those occupying any part of [start, end).
+
+    Mirrors checkout_end() in SQL, so it can use the (equipment,
+    checked_out_at, returned_at) index instead of loading every checkout.
+    """
+    now = now or timezone.now()
+    if end:
+        checkouts = checkouts.filter(checked_out_at__lt=end)
+    checkouts = checkouts.exclude(returned_at__lte=start)
+    if start >= now:
+        # Unreturned items due back by `start` (or overdue, so out until
+        # now) are free again by then.
+        checkouts = checkouts.exclude(returned_at__isnull=True, due_back_at__lte=start)
+    return checkouts
+
+
+def peak_usage(windows, start, end=None):
+    """
+    Most windows in use at the same moment within [start, end).
+
+    `windows` are (start, end) pairs; an end of None is open-ended.
+    """
+    events = []
+    for window_start, window_end in windows:
+        if window_end is not None and window_end <= start:
+            continue
+        if end is not None and window_start >= end:
+            continue
+        events.append((max(window_start, start), 1))
+        if window_end is not None and (end is None or window_end < end):
+            events.append((window_end, -1))
+    # Ends sort before starts at the same instant: windows are half-open.
+    events.sort()
+
+    peak = in_use = 0
+    for _, change in events:
+        in_use += change
+        peak = max(peak, in_use)
+    return peak
+
+
+def validate_equipment_checkout(equipment, start, end, exclude_id=None):
+    """
+    Raise ValidationError if a checkout would exceed the equipment quantity.
+
+    Only checkouts overlapping the window are loaded, and the peak number
+    out at once is compared with the quantity, so back-to-back checkouts
+    do not count against each other.
+    """
+    from apps.equipment.models import EquipmentCheckout
+
+    now = timezone.now()
+    start = start or now
+    overlapping = overlapping_checkouts(
+        EquipmentCheckout.objects.filter(equipment=equipment), start, end, now
+    )
+    if exclude_id:
+        overlapping = overlapping.exclude(id=exclude_id)
+
+    windows = [
+        (checked_out_at, checkout_end(returned_at, due_back_at, now))
+        for checked_out_at, due_back_at, returned_at in overlapping.values_list(
+            'checked_out_at', 'due_back_at', 'returned_at'
+        )
+    ]
+    if peak_usage(windows, start, end) >= max(equipment.quantity, 1):
+        raise ValidationError(
+            f"{equipment.name} is fully checked out for that period "
+            f"(quantity {equipment.quantity})."
+        )
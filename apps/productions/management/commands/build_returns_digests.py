@@ -0,0 +1,35 @@
+"""
+Build today's rental returns digest for every active production.
+
+Run once a day, e.g. from cron shortly after midnight:
+    python manage.py build_returns_digests
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.productions.models import Production
+from apps.productions.returns import build_digest
+
+
+class Command(BaseCommand):
+    help = 'Materialize the daily due/overdue rentals digest per production.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--production', type=int, default=None, help='Only this production')
+
+    def handle(self, *args, **options):
+        productions = Production.objects.exclude(status='completed')
+        if options['production'] is not None:
+            productions = Production.objects.filter(id=options['production'])
+
+        built = 0
+        for production_id, version in productions.values_list('id', 'data_version'):
+            digest = build_digest(production_id, version)
+            totals = digest.data['totals']
+            if totals['overdue']:
+                self.stdout.write(
+                    f"Production {production_id}: {totals['overdue']} overdue, "
+                    f"{totals['due_soon']} due soon, est. late fees {totals['estimated_late_fees']}"
+                )
+            built += 1
+        self.stdout.write(self.style.SUCCESS(f"Built {built} returns digests"))
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("productions", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="production",
+            name="data_version",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Incremented whenever this production or anything in it changes",
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:25
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("productions", "0003_production_data_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BudgetRollup",
+            fields=[
+                (
+                    "production",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="budget_rollup",
+                        serialize=False,
+                        to="productions.production",
+                    ),
+                ),
+                (
+                    "props",
+                    models.JSONField(
+                        default=dict,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                    ),
+                ),
+                (
+                    "equipment",
+                    models.JSONField(
+                        default=dict,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                    ),
+                ),
+                ("props_stale", models.BooleanField(default=True)),
+                ("equipment_stale", models.BooleanField(default=True)),
+                ("equipment_computed_on", models.DateField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "production_budget_rollups",
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:29
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("productions", "0004_budget_rollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReturnsDigest",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("data_version", models.PositiveIntegerField()),
+                (
+                    "data",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "production",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="returns_digests",
+                        to="productions.production",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "production_returns_digests",
+                "ordering": ["-date"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="returnsdigest",
+            constraint=models.UniqueConstraint(
+                fields=("production", "date"), name="unique_returns_digest_per_day"
+            ),
+        ),
+    ]
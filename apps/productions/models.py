@@ -5,11 +5,13 @@ Manages film production projects and team members.
 
 from django.db import models
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinValueValidator
 from decimal import Decimal
+from apps.core.mixins import TrackChangesMixin
 
 
-class Production(models.Model):
+class Production(TrackChangesMixin, models.Model):
     """
     Main production/project model.
     Represents a film, TV show, commercial, or any video production project.
@@ -92,6 +94,11 @@ class Production(models.Model):
         related_name='created_productions',
         help_text="User who created this production"
     )
+    data_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Incremented whenever this production or anything in it changes"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -110,6 +117,21 @@ class Production(models.Model):
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # data_version only ever moves by F('data_version') + 1 (see
+        # signals); writing back the value this instance was loaded with
+        # would undo bumps made since.
+        if not self._state.adding:
+            update_fields = kwargs.get('update_fields')
+            if update_fields is None:
+                deferred = self.get_deferred_fields()
+                update_fields = [
+                    field.name for field in self._meta.concrete_fields
+                    if not field.primary_key and field.attname not in deferred
+                ]
+            kwargs['update_fields'] = [name for name in update_fields if name != 'data_version']
+        super().save(*args, **kwargs)
+
     @property
     def total_scenes(self):
         """Get total number of scenes."""
@@ -216,4 +238,61 @@ class ProductionTeam(models.Model):
     def revoke_permission(self, permission_type):
         """Revoke a specific permission from team member."""
         self.permissions[permission_type] = False
-        self.save()
\ No newline at end of file
+        self.save()
+
+
+class BudgetRollup(models.Model):
+    """
+    Materialized spend totals for a production's budget report.
+
+    Each section is recomputed only when something it depends on has
+    changed since (see apps.productions.budget).
+    """
+
+    production = models.OneToOneField(
+        Production,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='budget_rollup',
+    )
+    props = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    equipment = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    props_stale = models.BooleanField(default=True)
+    equipment_stale = models.BooleanField(default=True)
+    equipment_computed_on = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'production_budget_rollups'
+
+    def __str__(self):
+        return f"Budget rollup for production {self.production_id}"
+
+
+class ReturnsDigest(models.Model):
+    """
+    Daily snapshot of a production's due and overdue rentals.
+
+    Valid for its date while the production's data_version is unchanged
+    (see apps.productions.returns).
+    """
+
+    production = models.ForeignKey(
+        Production,
+        on_delete=models.CASCADE,
+        related_name='returns_digests',
+    )
+    date = models.DateField()
+    data_version = models.PositiveIntegerField()
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'production_returns_digests'
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['production', 'date'], name='unique_returns_digest_per_day'),
+        ]
+
+    def __str__(self):
+        return f"Returns digest for production {self.production_id} on {self.date}"
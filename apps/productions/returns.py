@@ -0,0 +1,155 @@
+"""
+Rental returns: props and equipment that are due soon or overdue.
+
+Both lists come from partial indexes that only cover rentals still out,
+so they don't scan returned items. Equipment late fees are estimated as
+daily_rate for each started day overdue. Props have no daily rate, so
+their fee is left empty.
+
+Reports are materialized once per production and day in ReturnsDigest.
+`python manage.py build_returns_digests` builds them each morning. A
+page view reuses the stored digest until the production's data_version
+changes, e.g. when something is returned.
+"""
+
+import json
+import math
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import ReturnsDigest
+from .signals import get_data_version
+
+
+def _money(value):
+    return f"{value:.2f}" if value is not None else None
+
+
+def _prop_rentals(production_id, today, horizon):
+    from apps.props.models import Prop
+
+    due_soon, overdue = [], []
+    rentals = Prop.objects.filter(
+        production_id=production_id,
+        is_rented=True,
+        rental_return_date__lte=horizon,
+    ).exclude(
+        status='returned'
+    ).order_by('rental_return_date', 'id').values(
+        'id', 'name', 'category', 'status', 'scene_id', 'rental_return_date', 'cost'
+    )
+    for prop in rentals:
+        days = (today - prop['rental_return_date']).days
+        entry = {
+            'type': 'prop',
+            'id': prop['id'],
+            'name': prop['name'],
+            'category': prop['category'],
+            'status': prop['status'],
+            'scene': prop['scene_id'],
+            'due': prop['rental_return_date'],
+            'cost': _money(prop['cost']),
+            'late_fee': None,
+        }
+        if days > 0:
+            overdue.append({**entry, 'days_overdue': days})
+        else:
+            due_soon.append({**entry, 'days_until_due': -days})
+    return due_soon, overdue
+
+
+def _equipment_rentals(production_id, now, horizon):
+    from apps.equipment.models import EquipmentCheckout
+
+    due_soon, overdue = [], []
+    checkouts = EquipmentCheckout.objects.filter(
+        equipment__production_id=production_id,
+        returned_at__isnull=True,
+        due_back_at__lt=horizon,
+    ).order_by('due_back_at', 'id').values(
+        'id', 'equipment_id', 'equipment__name', 'equipment__serial_number',
+        'equipment__category', 'equipment__daily_rate', 'checked_out_by__username', 'due_back_at',
+    )
+    for checkout in checkouts:
+        entry = {
+            'type': 'equipment',
+            'checkout': checkout['id'],
+            'id': checkout['equipment_id'],
+            'name': checkout['equipment__name'],
+            'serial_number': checkout['equipment__serial_number'],
+            'category': checkout['equipment__category'],
+            'checked_out_by': checkout['checked_out_by__username'],
+            'due': checkout['due_back_at'],
+            'daily_rate': _money(checkout['equipment__daily_rate']),
+        }
+        late = now - checkout['due_back_at']
+        if late > timedelta(0):
+            days = math.ceil(late / timedelta(days=1))
+            rate = checkout['equipment__daily_rate']
+            overdue.append({
+                **entry,
+                'days_overdue': days,
+                'late_fee': _money(rate * days) if rate is not None else None,
+            })
+        else:
+            due_soon.append({**entry, 'days_until_due': (-late).days, 'late_fee': None})
+    return due_soon, overdue
+
+
+def build_returns_report(production_id, days=None):
+    """Props and equipment due within `days`, and everything overdue."""
+    days = settings.RETURNS_DUE_SOON_DAYS if days is None else days
+    now = timezone.now()
+    today = timezone.localdate(now)
+
+    props_due, props_overdue = _prop_rentals(production_id, today, today + timedelta(days=days))
+    equipment_due, equipment_overdue = _equipment_rentals(production_id, now, now + timedelta(days=days))
+    late_fees = sum((Decimal(item['late_fee'] or '0') for item in equipment_overdue), Decimal('0'))
+
+    return {
+        'production_id': production_id,
+        'as_of': now,
+        'due_soon_days': days,
+        'due_soon': {'props': props_due, 'equipment': equipment_due},
+        'overdue': {'props': props_overdue, 'equipment': equipment_overdue},
+        'totals': {
+            'due_soon': len(props_due) + len(equipment_due),
+            'overdue': len(props_overdue) + len(equipment_overdue),
+            'estimated_late_fees': f"{late_fees:.2f}",
+        },
+    }
+
+
+def build_digest(production_id, version=None):
+    """Compute today's digest and store it, replacing any older one for today."""
+    version = get_data_version(production_id) if version is None else version
+    # Round-trip through JSON so a fresh digest looks exactly like a stored one.
+    data = json.loads(json.dumps(build_returns_report(production_id), cls=DjangoJSONEncoder))
+    digest, _ = ReturnsDigest.objects.update_or_create(
+        production_id=production_id,
+        date=timezone.localdate(),
+        defaults={'data_version': version, 'data': data},
+    )
+    return digest
+
+
+def get_returns_digest(production_id):
+    """Today's digest, rebuilt only if the production changed since it was made."""
+    version = get_data_version(production_id)
+    digest = ReturnsDigest.objects.filter(
+        production_id=production_id, date=timezone.localdate()
+    ).first()
+    if digest is not None and digest.data_version == version:
+        return digest.data
+
+    try:
+        with transaction.atomic():
+            return build_digest(production_id, version).data
+    except IntegrityError:
+        # Another request built it at the same moment.
+        return ReturnsDigest.objects.get(production_id=production_id, date=timezone.localdate()).data
@@ -17,6 +17,7 @@ class ProductionSerializer(serializers.ModelSerializer):
     class Meta:
         model  = Production
         fields = '__all__'
+        read_only_fields = ['data_version']
 
     def _get_scenes(self, obj):
         """
@@ -0,0 +1,89 @@
+"""
+Keep Production.data_version current.
+
+Every save or delete of a production-scoped object bumps the version of
+its production with a single UPDATE, so caches keyed on the version
+(calendar feeds, exports) know when to regenerate.
+Queryset.update() and bulk_create() bypass signals and do not bump it.
+Production.save() never writes data_version itself, so saving a stale
+instance cannot roll the version back.
+"""
+
+from django.db.models import F, Model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import BudgetRollup, Production
+
+
+# Model label -> (lookup from Production, attribute holding its value)
+VERSIONED_MODELS = {
+    'productions.Production': ('id', 'id'),
+    'productions.ProductionTeam': ('id', 'production_id'),
+    'scenes.Scene': ('id', 'production_id'),
+    'shots.Shot': ('scenes__id', 'scene_id'),
+    'shots.Take': ('scenes__shots__id', 'shot_id'),
+    'call_sheets.CallSheet': ('id', 'production_id'),
+    'call_sheets.CallSheetScene': ('call_sheets__id', 'call_sheet_id'),
+    'call_sheets.CallSheetCast': ('call_sheets__id', 'call_sheet_id'),
+    'call_sheets.CastMember': ('id', 'production_id'),
+    'continuity.ContinuityNote': ('scenes__id', 'scene_id'),
+    'continuity.ContinuityPhoto': ('scenes__continuity_notes__id', 'note_id'),
+    'props.Prop': ('id', 'production_id'),
+    'equipment.Equipment': ('id', 'production_id'),
+    'equipment.EquipmentCheckout': ('equipment__id', 'equipment_id'),
+}
+
+
+def bump_data_version(production_id):
+    """Mark a production's data as changed."""
+    Production.objects.filter(id=production_id).update(data_version=F('data_version') + 1)
+
+
+def get_data_version(production_id):
+    """Current data version of a production, or None if it does not exist."""
+    return Production.objects.filter(id=production_id).values_list('data_version', flat=True).first()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_on_change(sender, instance, **kwargs):
+    lookup = VERSIONED_MODELS.get(sender._meta.label)
+    if lookup is None:
+        return
+    if sender is Production and kwargs['signal'] is post_delete:
+        return
+
+    # In a cascade, the object delete() was called on bumps the version.
+    origin = kwargs.get('origin')
+    if isinstance(origin, Model) and origin is not instance:
+        return
+
+    path, attr = lookup
+    value = getattr(instance, attr)
+    if value is None:
+        return
+
+    Production.objects.filter(**{path: value}).update(data_version=F('data_version') + 1)
+
+
+# Model label -> (BudgetRollup section flag, lookup from BudgetRollup, attribute)
+BUDGET_SOURCES = {
+    'props.Prop': ('props_stale', 'production_id', 'production_id'),
+    'scenes.Scene': ('props_stale', 'production_id', 'production_id'),
+    'equipment.Equipment': ('equipment_stale', 'production_id', 'production_id'),
+    'equipment.EquipmentCheckout': ('equipment_stale', 'production__equipment__id', 'equipment_id'),
+    'call_sheets.CallSheet': ('equipment_stale', 'production_id', 'production_id'),
+}
+
+
+def mark_budget_stale(sender, instance, **kwargs):
+    flag, path, attr = BUDGET_SOURCES[sender._meta.label]
+    value = getattr(instance, attr)
+    if value is not None:
+        BudgetRollup.objects.filter(**{path: value}).update(**{flag: True})
+
+
+for label in BUDGET_SOURCES:
+    post_save.connect(mark_budget_stale, sender=label, dispatch_uid=f'budget-{label}')
+    post_delete.connect(mark_budget_stale, sender=label, dispatch_uid=f'budget-{label}')
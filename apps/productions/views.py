@@ -70,6 +70,107 @@ class ProductionViewSet(viewsets.ModelViewSet):
             'completion_percentage': completion_pct,
         })
 
+    @action(detail=True, methods=['get'])
+    def conflicts(self, request, pk=None):
+        """
+        GET /api/productions/{id}/conflicts/
+        Cast double-bookings, overbooked equipment and location clashes.
+        """
+        from .conflicts import production_conflicts
+
+        production = self.get_object()
+        conflicts = production_conflicts(production.id)
+
+        return Response({
+            'production_id':   production.id,
+            'total_conflicts': sum(len(items) for items in conflicts.values()),
+            **conflicts,
+        })
+
+    @action(detail=True, methods=['get'])
+    def budget(self, request, pk=None):
+        """
+        GET /api/productions/{id}/budget/
+        Prop and equipment spend against the budget, with daily burn.
+        """
+        from .budget import budget_report
+
+        return Response(budget_report(self.get_object()))
+
+    @action(detail=True, methods=['get'])
+    def burndown(self, request, pk=None):
+        """
+        GET /api/productions/{id}/burndown/[?metric=scenes|shots|pages]
+        Daily completions with burn-up (cumulative) and burndown (remaining)
+        series, read from the precomputed DailyProgress rows.
+        """
+        from apps.analytics.progress import METRICS, burndown
+
+        metric = request.query_params.get('metric', 'scenes')
+        if metric not in METRICS:
+            return Response(
+                {'error': f"metric must be one of {', '.join(METRICS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(burndown(self.get_object(), metric))
+
+    @action(detail=True, methods=['get'])
+    def forecast(self, request, pk=None):
+        """
+        GET /api/productions/{id}/forecast/
+        Projected wrap date (P10/P50/P90) from recent pages and shots per
+        shooting day, served from the forecast stored by the nightly run.
+        """
+        from apps.analytics.forecast import get_wrap_forecast
+
+        return Response(get_wrap_forecast(self.get_object()))
+
+    @action(detail=True, methods=['get'])
+    def returns(self, request, pk=None):
+        """
+        GET /api/productions/{id}/returns/[?days=N]
+        Rented props and equipment due soon or overdue, with late fees.
+        Served from today's digest unless a custom window is asked for.
+        """
+        from .returns import build_returns_report, get_returns_digest
+
+        production = self.get_object()
+        days = request.query_params.get('days')
+        if days is None:
+            return Response(get_returns_digest(production.id))
+
+        try:
+            days = int(days)
+        except ValueError:
+            return Response(
+                {'error': 'days must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(build_returns_report(production.id, max(days, 0)))
+
+    @action(detail=True, methods=['get'])
+    def calendar_links(self, request, pk=None):
+        """
+        GET /api/productions/{id}/calendar_links/
+        Subscription URLs for the production and per-cast-member .ics feeds.
+        """
+        from django.urls import reverse
+        from apps.call_sheets.ical import feed_token
+
+        production = self.get_object()
+
+        def feed_url(kind, object_id):
+            path = reverse('calendar-feed', kwargs={'token': feed_token(kind, object_id)})
+            return request.build_absolute_uri(path)
+
+        return Response({
+            'production': feed_url('production', production.id),
+            'cast': [
+                {'id': member.id, 'name': member.name, 'url': feed_url('cast', member.id)}
+                for member in production.cast_members.all()
+            ],
+        })
+
     @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
         """
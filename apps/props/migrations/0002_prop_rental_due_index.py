@@ -0,0 +1,27 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("productions", "0005_returns_digest"),
+        ("props", "0001_initial"),
+        ("scenes", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="prop",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_rented", True), models.Q(("status", "returned"), _negated=True)
+                ),
+                fields=["production", "rental_return_date"],
+                name="props_rental_due_idx",
+            ),
+        ),
+    ]
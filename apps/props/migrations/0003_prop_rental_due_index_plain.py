@@ -0,0 +1,24 @@
+# Generated by Django 5.0.1 on 2026-10-19 05:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("props", "0002_prop_rental_due_index"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="prop",
+            name="props_rental_due_idx",
+        ),
+        migrations.AddIndex(
+            model_name="prop",
+            index=models.Index(
+                fields=["production", "is_rented", "rental_return_date"],
+                name="props_rental_due_idx",
+            ),
+        ),
+    ]
@@ -7,9 +7,10 @@ from django.db import models
 from django.conf import settings
 from apps.productions.models import Production
 from apps.scenes.models import Scene
+from apps.core.mixins import TrackChangesMixin
 
 
-class Prop(models.Model):
+class Prop(TrackChangesMixin, models.Model):
     """Props and set dressing items."""
 
     CATEGORY_CHOICES = [
@@ -82,6 +83,14 @@ class Prop(models.Model):
     class Meta:
         db_table = 'props'
         ordering = ['category', 'name']
+        indexes = [
+            # Rentals by return date (see productions.returns). A plain
+            # index rather than a partial one, which MySQL cannot create.
+            models.Index(
+                fields=['production', 'is_rented', 'rental_return_date'],
+                name='props_rental_due_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_category_display()})"
\ No newline at end of file
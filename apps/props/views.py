@@ -2,12 +2,17 @@
 Props API views.
 """
 
+from decimal import Decimal
+
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db import models
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum, Window
+from django.db.models.functions import RowNumber
+from apps.productions.models import Production
 from .models import Prop
 from .serializers import PropSerializer, PropListSerializer
 
@@ -29,15 +34,13 @@ class PropViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Filter props by user's productions."""
-        queryset = super().get_queryset()
         user = self.request.user
+        productions = Production.objects.filter(
+            models.Q(created_by=user) |
+            models.Q(team_members__user=user)
+        ).values('id')
 
-        queryset = queryset.filter(
-            models.Q(production__created_by=user) |
-            models.Q(production__team_members__user=user)
-        ).distinct()
-
-        return queryset
+        return super().get_queryset().filter(production__in=productions)
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -62,14 +65,82 @@ class PropViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def by_category(self, request):
-        """Get props grouped by category."""
-        queryset = self.filter_queryset(self.get_queryset())
+        """
+        GET /api/props/by_category/?production=ID[&page=N&page_size=M]
+
+        Per-category totals and status counts for all matching props, plus
+        one page of items from each category. Runs two queries however
+        many props there are.
+        """
+        try:
+            page = max(int(request.query_params.get('page', 1)), 1)
+            page_size = min(max(int(request.query_params.get('page_size', 20)), 1), 100)
+        except ValueError:
+            return Response(
+                {'error': 'page and page_size must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        categories = {}
-        for prop in queryset:
-            cat = prop.get_category_display()
-            if cat not in categories:
-                categories[cat] = []
-            categories[cat].append(PropListSerializer(prop).data)
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        line_cost = ExpressionWrapper(
+            F('cost') * F('quantity'),
+            output_field=DecimalField(max_digits=14, decimal_places=2)
+        )
+
+        # Totals per (category, status); categories are rolled up from these.
+        groups = queryset.values('category', 'status').annotate(
+            count=Count('id'),
+            total_quantity=Sum('quantity'),
+            total_cost=Sum(line_cost),
+        ).order_by('category', 'status')
 
-        return Response(categories)
\ No newline at end of file
+        labels = dict(Prop.CATEGORY_CHOICES)
+        categories = {}
+        for group in groups:
+            category = categories.setdefault(group['category'], {
+                'category': group['category'],
+                'category_display': labels.get(group['category'], group['category']),
+                'count': 0,
+                'total_quantity': 0,
+                'total_cost': Decimal('0.00'),
+                'status_counts': {},
+                'items': [],
+                'has_more': False,
+            })
+            category['count'] += group['count']
+            category['total_quantity'] += group['total_quantity'] or 0
+            category['total_cost'] += group['total_cost'] or 0
+            category['status_counts'][group['status']] = group['count']
+
+        # One page of each category, numbered per category in the database.
+        offset = (page - 1) * page_size
+        items = queryset.only(
+            'id', 'name', 'category', 'quantity', 'status', 'hero_prop', 'cost'
+        ).annotate(
+            row=Window(
+                RowNumber(),
+                partition_by=F('category'),
+                order_by=[F('name').asc(), F('id').asc()],
+            )
+        ).filter(
+            row__gt=offset,
+            row__lte=offset + page_size,
+        ).order_by('category', 'row')
+
+        for prop in items:
+            categories[prop.category]['items'].append(PropListSerializer(prop).data)
+        total_cost = Decimal('0.00')
+        for category in categories.values():
+            category['has_more'] = category['count'] > offset + page_size
+            total_cost += category['total_cost']
+            # Same format as the serializers' DecimalField output.
+            category['total_cost'] = f"{category['total_cost']:.2f}"
+
+        return Response({
+            'count': sum(c['count'] for c in categories.values()),
+            'total_quantity': sum(c['total_quantity'] for c in categories.values()),
+            'total_cost': f"{total_cost:.2f}",
+            'page': page,
+            'page_size': page_size,
+            'categories': list(categories.values()),
+        })
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-19 02:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scenes", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scene",
+            name="completed_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="When the status last changed to completed (set automatically)",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-19 03:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scenes", "0002_scene_completed_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scene",
+            name="suggested_duration",
+            field=models.IntegerField(
+                blank=True,
+                editable=False,
+                help_text="Duration in minutes predicted from completed scenes (set automatically)",
+                null=True,
+            ),
+        ),
+    ]
@@ -7,9 +7,10 @@ from django.db import models
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 from apps.productions.models import Production
+from apps.core.mixins import TrackChangesMixin
 
 
-class Scene(models.Model):
+class Scene(TrackChangesMixin, models.Model):
     """
     Scene model representing a scene from the script.
     """
@@ -96,6 +97,12 @@ class Scene(models.Model):
         validators=[MinValueValidator(1)],
         help_text="Actual duration filmed in minutes"
     )
+    suggested_duration = models.IntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Duration in minutes predicted from completed scenes (set automatically)"
+    )
 
     status = models.CharField(
         max_length=20,
@@ -172,6 +179,13 @@ class Scene(models.Model):
         help_text="Script day (e.g., 'Day 1', 'Night 2')"
     )
 
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="When the status last changed to completed (set automatically)"
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -26,6 +26,7 @@ class SceneSerializer(serializers.ModelSerializer):
             'script_pages',
             'estimated_duration',
             'actual_duration',
+            'suggested_duration',
             'status',
             'shooting_date',
             'call_time',
@@ -46,7 +47,7 @@ class SceneSerializer(serializers.ModelSerializer):
             'shot_count',
             'slug_line',
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'suggested_duration', 'created_at', 'updated_at']
 
     def get_shot_count(self, obj):
         return obj.shots.count()
@@ -6,9 +6,10 @@ Manages individual camera shots within scenes.
 from django.db import models
 from django.core.validators import MinValueValidator
 from apps.scenes.models import Scene
+from apps.core.mixins import TrackChangesMixin
 
 
-class Shot(models.Model):
+class Shot(TrackChangesMixin, models.Model):
     """Individual camera shot within a scene."""
 
     SHOT_TYPE_CHOICES = [
@@ -95,6 +96,13 @@ class Shot(models.Model):
     notes = models.TextField(blank=True)
     sequence_order = models.IntegerField(default=0, db_index=True)
 
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="When the status last changed to completed or approved (set automatically)"
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -111,7 +119,7 @@ class Shot(models.Model):
         return self.status == 'completed'
 
 
-class Take(models.Model):
+class Take(TrackChangesMixin, models.Model):
     """Individual take of a shot."""
 
     QUALITY_CHOICES = [
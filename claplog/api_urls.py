@@ -44,5 +44,9 @@ urlpatterns = [
     path('', include('apps.call_sheets.urls')),
     path('', include('apps.continuity.urls')),
     path('', include('apps.props.urls')),
+    path('', include('apps.equipment.urls')),
+    path('', include('apps.activity.urls')),
+    path('', include('apps.analytics.urls')),
+    path('', include('apps.exports.urls')),
 
 ]
\ No newline at end of file
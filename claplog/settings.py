@@ -53,6 +53,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.activity.middleware.ActivityCaptureMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -141,6 +142,26 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Generated export files (call sheet PDFs, CSVs, workbooks)
+EXPORT_ROOT = MEDIA_ROOT / 'exports'
+
+# Export job workers (see run_export_worker)
+EXPORT_WORKERS = 2
+EXPORT_POLL_INTERVAL = 2  # seconds
+EXPORT_JOB_LEASE = 60 * 60  # seconds a job may run before it counts as abandoned
+EXPORT_JOB_MAX_ATTEMPTS = 3
+EXPORT_CHUNK_SIZE = 2000  # rows fetched from the database, and written, at a time
+EXPORT_CACHE_MAX_BYTES = 5 * 1024 ** 3  # export files kept for reuse; least recently used go first
+
+# Continuity reference photos, stored by content hash
+CONTINUITY_PHOTO_ROOT = MEDIA_ROOT / 'continuity'
+CONTINUITY_PHOTO_MAX_SIZE = 25 * 1024 * 1024  # bytes
+CONTINUITY_THUMBNAIL_SIZES = [160, 480, 1280]  # longest edge, pixels
+CONTINUITY_THUMBNAIL_WORKERS = 2
+
+# Estimated text similarity above which continuity notes are flagged as duplicates
+CONTINUITY_DUPLICATE_THRESHOLD = 0.5
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -219,6 +240,39 @@ EMAIL_HOST_PASSWORD = 'hobfjopgloowqxuq'
 DEFAULT_FROM_EMAIL = 'ClapLog <ashen.moonscour721@gmail.com>'
 EMAIL_TIMEOUT = 300
 
+# Equipment scan check-in/check-out (see EquipmentViewSet.scan)
+EQUIPMENT_SCAN_MAX_BATCH = 1000
+EQUIPMENT_SCAN_STREAM_BATCH = 50  # scans applied per transaction when streaming
+
+# Rentals due within this many days are listed as due soon
+RETURNS_DUE_SOON_DAYS = 3
+
+# Buffered activity log writer (see apps/activity/writer.py)
+ACTIVITY_LOG_BUFFERED = True
+ACTIVITY_LOG_BATCH_SIZE = 200
+ACTIVITY_LOG_FLUSH_INTERVAL = 2  # seconds
+ACTIVITY_LOG_MAX_QUEUE = 5000  # beyond this, entries are written synchronously
+ACTIVITY_BULK_THRESHOLD = 20  # more changes of one kind per request are summarized
+
+# Activity log archival (see archive_activity)
+ACTIVITY_ARCHIVE_ROOT = BASE_DIR / 'archive' / 'activity'
+ACTIVITY_ARCHIVE_AFTER_DAYS = 90
+ACTIVITY_ARCHIVE_SEGMENT_SIZE = 10000  # entries per gzip JSONL segment
+
+# Call sheet notification outbox (see send_call_sheet_notifications)
+CALL_SHEET_NOTIFICATION_BATCH_SIZE = 50
+CALL_SHEET_NOTIFICATION_MAX_ATTEMPTS = 5
+CALL_SHEET_NOTIFICATION_RETRY_DELAY = 60  # seconds, doubled after each failure
+CALL_SHEET_NOTIFICATION_TIMEOUT = 30
+
+# Wrap-date forecasts (see forecast_wrap_dates)
+FORECAST_HISTORY_DAYS = 30  # most recent shooting days resampled
+FORECAST_SIMULATIONS = 2000
+FORECAST_MAX_DAYS = 5 * 260  # simulations still unfinished by then count as not wrapping
+
+# Suggested scene durations (see suggest_scene_durations)
+SCENE_ESTIMATE_MIN_SCENES = 20  # fewer completed scenes: use the model fitted on all productions
+
 # Static files for production
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
@@ -300,6 +300,51 @@ class APIClient:
             st.error(f"Connection error: {str(e)}")
             return None
 
+    def upload_continuity_photo(self, note_id: int, file) -> Optional[Dict]:
+        """Attach a reference photo to a continuity note."""
+        url = f"{self.base_url}/continuity/{note_id}/photos/"
+
+        try:
+            response = requests.post(
+                url,
+                files={"image": (file.name, file, file.type)},
+                headers={"Authorization": f"Bearer {self.token}"}
+            )
+            if response.status_code in (200, 201):
+                return response.json()
+            else:
+                st.error(f"Error: {response.text}")
+                return None
+        except Exception as e:
+            st.error(f"Connection error: {str(e)}")
+            return None
+
+    def get_continuity_photo(self, photo_id: int, size: Optional[int] = None) -> Optional[bytes]:
+        """Download a continuity photo, or its thumbnail closest to size."""
+        url = f"{self.base_url}/continuity-photos/{photo_id}/image/"
+        params = {"size": size} if size else None
+
+        try:
+            response = requests.get(
+                url,
+                params=params,
+                headers={"Authorization": f"Bearer {self.token}"}
+            )
+            if response.status_code == 200:
+                return response.content
+            return None
+        except Exception:
+            return None
+
+    def delete_continuity_photo(self, photo_id: int) -> bool:
+        """Remove a photo from its continuity note."""
+        url = f"{self.base_url}/continuity-photos/{photo_id}/"
+        try:
+            response = requests.delete(url, headers=self._get_headers())
+            return response.status_code == 204
+        except:
+            return False
+
     def update_production(self, production_id: int, data: Dict) -> Optional[Dict]:
         """
         PATCH /api/productions/{id}/
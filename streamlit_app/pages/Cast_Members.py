@@ -116,6 +116,9 @@ with tab1:
                                 <p style="color: #888; text-align: center; font-size: 0.9rem; margin: 0.5rem 0;">
                                     {cast.get('role_type', '').replace('_', ' ').title()}
                                 </p>
+                                <p style="color: #888; text-align: center; font-size: 0.85rem; margin: 0.25rem 0;">
+                                    🎬 {cast.get('total_scenes', 0)} scenes · 📋 {cast.get('total_call_sheets', 0)} call sheets · 📅 {cast.get('total_work_days', 0)} days
+                                </p>
                             </div>
                             """, unsafe_allow_html=True)
 
@@ -124,6 +127,8 @@ with tab1:
                                     st.write(f"**Phone:** {cast['contact_phone']}")
                                 if cast.get('contact_email'):
                                     st.write(f"**Email:** {cast['contact_email']}")
+                                if cast.get('first_work_day'):
+                                    st.write(f"**Work Days:** {cast['first_work_day']} → {cast['last_work_day']}")
                                 if cast.get('notes'):
                                     st.write(f"**Notes:** {cast['notes']}")
 
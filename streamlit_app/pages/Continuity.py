@@ -38,6 +38,14 @@ apply_dark_theme()
 api = APIClient()
 api.token = st.session_state.get('token')
 
+THUMBNAIL_SIZE = 160
+
+
+@st.cache_data(show_spinner=False, max_entries=500)
+def load_thumbnail(photo_id, content_hash, thumbnail_status, _api):
+    """Small thumbnail bytes; cached until the photo's thumbnails change."""
+    return _api.get_continuity_photo(photo_id, THUMBNAIL_SIZE)
+
 
 if not st.session_state.get('authenticated', False):
     st.warning("⚠️ Please login first")
@@ -145,6 +153,33 @@ with tab1:
                 if note.get('warnings'):
                     st.warning(f"⚠️ **Warning:** {note['warnings']}")
 
+                photos = note.get('photos', [])
+                if photos:
+                    st.write("**Reference Photos:**")
+                    photo_cols = st.columns(4)
+                    for i, photo in enumerate(photos):
+                        with photo_cols[i % 4]:
+                            image = load_thumbnail(
+                                photo['id'], photo['content_hash'], photo['thumbnail_status'], api
+                            )
+                            if image:
+                                st.image(image, caption=photo.get('original_name') or None)
+                            if st.button("🗑️ Remove", key=f"delete_photo_{photo['id']}"):
+                                if api.delete_continuity_photo(photo['id']):
+                                    st.rerun()
+
+                uploaded = st.file_uploader(
+                    "📷 Attach reference photo",
+                    type=["jpg", "jpeg", "png", "webp", "gif"],
+                    key=f"photo_upload_{note['id']}"
+                )
+                if uploaded and st.button("⬆️ Upload Photo", key=f"upload_{note['id']}"):
+                    with st.spinner("Uploading photo..."):
+                        result = api.upload_continuity_photo(note['id'], uploaded)
+                    if result:
+                        show_success_clapper("Photo Attached!")
+                        st.rerun()
+
                 col_a, col_b, col_c = st.columns(3)
 
                 with col_a:
@@ -252,7 +287,16 @@ with tab2:
                 with st.spinner("Adding continuity note..."):
                     result = api.create_continuity_note(note_data)
 
-                if result:
+                if result and result.get('possible_duplicates'):
+                    st.success("✅ Continuity note added successfully!")
+                    st.warning("🔁 This looks like notes that were already logged:")
+                    for dup in result['possible_duplicates']:
+                        st.write(
+                            f"- Scene {dup.get('scene_number', 'N/A')} "
+                            f"({round(dup['similarity'] * 100)}% similar, {dup.get('status', '')}): "
+                            f"{dup.get('description', '')[:120]}"
+                        )
+                elif result:
                     show_success_clapper("Continuity Note Added!")
                     st.success("✅ Continuity note added successfully!")
                     st.balloons()